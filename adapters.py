@@ -19,6 +19,12 @@ except Exception:
 
 import importlib
 
+from financial_metrics import DERIVED_TEMPLATES, apply_derived_metrics
+from media_registry import dedupe_media, media_registry
+from plan_refs import RefError, resolve_slide_data, resolver_for
+from layout_engine import layout_catalog
+from render_profile import RenderProfiler
+
 # Import your renderers module (must be importable on PYTHONPATH)
 slide_templates = importlib.import_module("slide_templates")
 
@@ -186,6 +192,14 @@ def _coerce_plan(plan: Optional[Dict]=None, content: Optional[Any]=None, content
             return {"slides": src[key]}
     raise ValueError("Unrecognized plan/content shape. Expect dict with 'slides' or a list of slide dicts.")
 
+# Name of the diagnostic text box _safe_call draws when a renderer fails
+RENDER_ERROR_SHAPE = "Renderer error"
+
+def error_slides(prs) -> List[int]:
+    """1-based numbers of the slides that hold a renderer-error placeholder."""
+    return [i for i, slide in enumerate(prs.slides, start=1)
+            if any(shape.name == RENDER_ERROR_SHAPE for shape in slide.shapes)]
+
 def _safe_call(renderer, data: Dict, prs, company_name: str, content: Dict = None, brand_config: Optional[Dict] = None):
     """
     Call renderer with the correct parameter signature for your slide templates.
@@ -235,6 +249,7 @@ def _safe_call(renderer, data: Dict, prs, company_name: str, content: Dict = Non
                 from pptx.enum.text import PP_ALIGN
                 slide = prs.slides.add_slide(prs.slide_layouts[6])
                 tb = slide.shapes.add_textbox(Inches(0.7), Inches(0.8), Inches(11.5), Inches(1.5))
+                tb.name = RENDER_ERROR_SHAPE
                 tf = tb.text_frame
                 p = tf.paragraphs[0]
                 p.text = f"Renderer error for {renderer.__name__ if hasattr(renderer, '__name__') else 'unknown'}: {e}"
@@ -249,6 +264,7 @@ def _safe_call(renderer, data: Dict, prs, company_name: str, content: Dict = Non
         from pptx.enum.text import PP_ALIGN
         slide = prs.slides.add_slide(prs.slide_layouts[6])
         tb = slide.shapes.add_textbox(Inches(0.7), Inches(0.8), Inches(11.5), Inches(1.5))
+        tb.name = RENDER_ERROR_SHAPE
         tf = tb.text_frame
         p = tf.paragraphs[0]
         p.text = f"Renderer error: {e}"
@@ -270,6 +286,8 @@ def render_plan_to_pptx(
     prs=None,
     company_name: str = "Moelis",
     brand_config: Optional[Dict] = None,  # NEW: Brand configuration
+    profiler: Optional[RenderProfiler] = None,
+    templates_path: Optional[str] = None,
     **_ignore_kwargs,
 ):
     """
@@ -277,6 +295,8 @@ def render_plan_to_pptx(
     Returns the Presentation.
     Extra kwargs are ignored for forward compatibility.
     Now supports brand configuration for consistent styling.
+    A RenderProfiler, when given, records every renderer call.
+    templates_path selects the catalog whose layout_specs drive slide geometry.
     """
     prs = _ensure_prs(prs)
     plan_obj = _coerce_plan(plan=plan, content=content, content_ir=content_ir)
@@ -292,41 +312,65 @@ def render_plan_to_pptx(
     elif isinstance(content_ir, dict):
         content_dict = content_ir
 
+    # One resolver per content IR, so repeated references hit its pointer cache
+    resolver = resolver_for(content_dict) if content_dict else None
+
     print(f"[DEBUG] Processing {len(slides)} slides")
     if brand_config:
         print(f"[DEBUG] Using custom brand configuration")
     
-    for idx, item in enumerate(slides, start=1):
-        if not isinstance(item, dict):
-            print(f"[DEBUG] Slide {idx}: Not a dict, skipping")
-            continue
+    # One media registry per render job: repeated logos/pictures share one part in ppt/media
+    with media_registry() as media, layout_catalog(templates_path):
+        for idx, item in enumerate(slides, start=1):
+            if not isinstance(item, dict):
+                print(f"[DEBUG] Slide {idx}: Not a dict, skipping")
+                continue
             
-        template = item.get("template")
-        data = item.get("data", {})
+            template = item.get("template")
+            data = item.get("data", {})
         
-        print(f"[DEBUG] Slide {idx}: template='{template}', data keys={list(data.keys()) if isinstance(data, dict) else 'not dict'}")
+            print(f"[DEBUG] Slide {idx}: template='{template}', data keys={list(data.keys()) if isinstance(data, dict) else 'not dict'}")
         
-        # If slide references content by ID, resolve it
-        content_id = item.get("content_id")
-        if content_id and content_dict:
-            content_data = content_dict.get(content_id, {})
-            if content_data:
-                # Merge content data with any existing data (existing data takes precedence)
-                merged_data = {**content_data, **data}
-                data = merged_data
-                print(f"[DEBUG] Slide {idx}: Merged content for ID '{content_id}', new data keys={list(data.keys())}")
+            # If slide references content by ID, resolve it
+            content_id = item.get("content_id")
+            if content_id and content_dict:
+                content_data = content_dict.get(content_id, {})
+                if content_data:
+                    # Merge content data with any existing data (existing data takes precedence)
+                    merged_data = {**content_data, **data}
+                    data = merged_data
+                    print(f"[DEBUG] Slide {idx}: Merged content for ID '{content_id}', new data keys={list(data.keys())}")
         
-        if template is None:
-            print(f"[DEBUG] Slide {idx}: No template, skipping")
-            continue
+            if template is None:
+                print(f"[DEBUG] Slide {idx}: No template, skipping")
+                continue
 
-        renderer = RENDERER_MAP.get(template)
-        if renderer is None:
-            print(f"[DEBUG] Slide {idx}: No renderer found for template '{template}'")
-        else:
-            print(f"[DEBUG] Slide {idx}: Found renderer for '{template}': {renderer.__name__ if hasattr(renderer, '__name__') else str(renderer)}")
+            # Resolve {"$ref": "#/..."} values and content_ir_key against the content IR
+            try:
+                data = resolve_slide_data(item, data, resolver)
+            except RefError as e:
+                print(f"[DEBUG] Slide {idx}: {e.args[0]}")
+
+            # Financial slides fall back to series derived from content_ir facts
+            if template in DERIVED_TEMPLATES and content_dict.get("facts"):
+                data = apply_derived_metrics(template, data, content_dict["facts"])
+
+            renderer = RENDERER_MAP.get(template)
+            if renderer is None:
+                print(f"[DEBUG] Slide {idx}: No renderer found for template '{template}'")
+            else:
+                print(f"[DEBUG] Slide {idx}: Found renderer for '{template}': {renderer.__name__ if hasattr(renderer, '__name__') else str(renderer)}")
             
-        prs = _safe_call(renderer, data, prs, company_name, content_dict, brand_config)
+            if profiler is None:
+                prs = _safe_call(renderer, data, prs, company_name, content_dict, brand_config)
+            else:
+                with profiler.renderer_call(idx, template, prs):
+                    prs = _safe_call(renderer, data, prs, company_name, content_dict, brand_config)
+        if media.stats.placements:
+            print(f"[DEBUG] Media: {media.stats.as_dict()}")
+    merged = dedupe_media(prs)
+    if merged:
+        print(f"[DEBUG] Media: merged {merged} duplicate image parts")
 
     print(f"[DEBUG] Finished processing. Total slides in presentation: {len(prs.slides)}")
     return prs
\ No newline at end of file
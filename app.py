@@ -1,17 +1,36 @@
 import json
 import io
+import os
+import shutil
+import time
+import uuid
 from pathlib import Path
 import requests
 import streamlit as st
 import pandas as pd
+import numpy as np
 import zipfile
 from datetime import datetime
 import re
 
 # Local libs
 from executor import execute_plan
-from catalog_loader import TemplateCatalog
+from catalog_loader import load_catalog
 from brand_extractor import BrandExtractor
+from pagination import paginate_plan
+from plan_refs import resolver_for
+from plan_validation import normalize_plan, validate_individual_slides
+from json_scanner import scan_json_objects
+from json_continuation import complete_truncated_response, is_llm_error
+from slide_repair import collect_repair_tasks, merge_repairs, repair_slides
+from layout_engine import layout_catalog
+from slide_preview import deck_previews
+from render_profile import RenderProfiler, RenderReport
+from package_optimizer import save_optimized
+from session_store import DEFAULT_STORE_URL, MessageLog, open_session_store
+from llm_cache import llm_post
+from bundle_writer import BundleMember, deck_bundle_members, json_chunks, text_chunks, write_bundle
+from render_service import CANCELLED, DONE, QUEUED, QueueFull, RenderService, RenderServiceClient, ServiceBusy
 
 # ADD THESE IMPORTS FOR BRAND FUNCTIONALITY
 try:
@@ -34,889 +53,55 @@ except Exception:
 st.set_page_config(page_title="AI Deck Builder", page_icon="🤖", layout="wide")
 st.title("🤖 AI Deck Builder – LLM-Powered Pitch Deck Generator")
 
-# JSON CLEANING FUNCTIONS - ALL SAFE STRING OPERATIONS
+# JSON CLEANING FUNCTIONS - SINGLE-PASS TOLERANT SCANNER (json_scanner.py)
+CONTENT_IR_MARKERS = ["content ir json:", "content ir:", "content_ir"]
+RENDER_PLAN_MARKERS = ["render plan json:", "render plan:", "render_plan"]
+
 def clean_json_string(json_str):
-    """Clean and fix common JSON formatting issues using safe string operations"""
+    """Clean and fix common JSON formatting issues (fences, quotes, trailing commas) in one pass"""
     if not json_str:
         return "{}"
     
-    # Remove common prefixes and suffixes that break JSON
-    json_str = json_str.strip()
-    
-    # Remove markdown code block indicators using safe string operations
-    if json_str.startswith('```json'):
-        json_str = json_str[7:].strip()  # Remove ```json
-    elif json_str.startswith('```'):
-        json_str = json_str[3:].strip()   # Remove ```
-    
-    if json_str.endswith('```'):
-        json_str = json_str[:-3].strip()  # Remove trailing ```
-    
-    # Remove any leading/trailing non-JSON content
-    # Find the first '{' and last '}'
-    start_idx = json_str.find('{')
-    end_idx = json_str.rfind('}')
-    
-    if start_idx == -1 or end_idx == -1 or start_idx >= end_idx:
+    found = scan_json_objects(json_str)
+    if not found:
         return "{}"
     
-    json_str = json_str[start_idx:end_idx+1]
-    
-    # Fix common JSON issues using safe replacements
-    # Remove trailing commas before }
-    lines = json_str.split('\n')
-    cleaned_lines = []
-    
-    for line in lines:
-        # Remove trailing comma before } or ]
-        line = line.rstrip()
-        if line.endswith(',}'):
-            line = line[:-2] + '}'
-        elif line.endswith(',]'):
-            line = line[:-2] + ']'
-        cleaned_lines.append(line)
-    
-    json_str = '\n'.join(cleaned_lines)
-    
-    return json_str
+    return found[0].text
 
 def extract_jsons_from_response(response_text):
-    """Extract both Content IR and Render Plan JSONs from AI response using safe string operations"""
+    """Extract both Content IR and Render Plan JSONs from AI response in a single scan"""
     content_ir = None
     render_plan = None
     
-    # Method 1: Look for JSON code blocks using safe string operations
-    json_blocks = []
-    
-    # Find all ```json blocks
-    start_pos = 0
-    while True:
-        start_marker = '```json'
-        end_marker = '```'
-        
-        start_idx = response_text.find(start_marker, start_pos)
-        if start_idx == -1:
-            break
-        
-        content_start = start_idx + len(start_marker)
-        end_idx = response_text.find(end_marker, content_start)
-        if end_idx == -1:
-            break
-        
-        json_content = response_text[content_start:end_idx].strip()
-        if json_content:
-            json_blocks.append(json_content)
-        
-        start_pos = end_idx + len(end_marker)
-    
-    # Method 2: Look for any code blocks if no ```json blocks found
-    if not json_blocks:
-        start_pos = 0
-        while True:
-            start_marker = '```'
-            end_marker = '```'
-            
-            start_idx = response_text.find(start_marker, start_pos)
-            if start_idx == -1:
-                break
-            
-            # Skip if this is part of ```json (already handled)
-            if start_pos == 0 or response_text[start_idx:start_idx+7] != '```json':
-                content_start = start_idx + len(start_marker)
-                # Skip to next line to avoid immediate end marker
-                newline_pos = response_text.find('\n', content_start)
-                if newline_pos != -1:
-                    content_start = newline_pos + 1
-                
-                end_idx = response_text.find(end_marker, content_start)
-                if end_idx == -1:
-                    break
-                
-                json_content = response_text[content_start:end_idx].strip()
-                if json_content and (json_content.startswith('{') or json_content.startswith('[')):
-                    json_blocks.append(json_content)
-            
-            start_pos = start_idx + len(start_marker)
-    
-    # Try to parse each potential JSON block
-    for i, block in enumerate(json_blocks):
-        try:
-            cleaned_block = clean_json_string(block)
-            
-            if not cleaned_block or cleaned_block == "{}":
-                continue
-                
-            parsed = json.loads(cleaned_block)
-            
-            if not isinstance(parsed, dict):
-                continue
-            
-            # Identify which JSON is which based on structure
-            if ("entities" in parsed or "management_team" in parsed or 
-                "historical_financials" in parsed or "strategic_buyers" in parsed):
-                content_ir = parsed
-                print(f"✅ Successfully extracted Content IR from block {i+1}")
-                
-            elif "slides" in parsed and isinstance(parsed.get("slides"), list):
-                render_plan = parsed
-                print(f"✅ Successfully extracted Render Plan from block {i+1}")
-                
-        except json.JSONDecodeError as e:
-            print(f"❌ Failed to parse JSON block {i+1}: {e}")
+    for i, found in enumerate(scan_json_objects(response_text or "")):
+        if found.error:
+            print(f"❌ Failed to parse JSON block {i+1}: {found.error}")
             continue
-        except Exception as e:
-            print(f"❌ Unexpected error parsing block {i+1}: {e}")
-            continue
-    
-    # Method 3: Aggressive line-by-line extraction if needed
-    if not content_ir or not render_plan:
-        print("🔍 Attempting line-by-line JSON extraction...")
         
-        content_ir_markers = ["CONTENT IR JSON:", "Content IR:", "content_ir"]
-        render_plan_markers = ["RENDER PLAN JSON:", "Render Plan:", "render_plan"]
-        
-        lines = response_text.split('\n')
-        current_json = []
-        json_mode = None
-        brace_count = 0
+        parsed = found.value
+        if not isinstance(parsed, dict):
+            continue
         
-        for line in lines:
-            line_lower = line.lower()
+        # Identify which JSON is which based on structure, then on the label before it
+        label = found.label.lower()
+        if ("entities" in parsed or "management_team" in parsed or 
+            "historical_financials" in parsed or "strategic_buyers" in parsed):
+            content_ir = parsed
+            print(f"✅ Successfully extracted Content IR from block {i+1}")
             
-            # Check if we're starting a new JSON section
-            if any(marker.lower() in line_lower for marker in content_ir_markers):
-                json_mode = "content_ir"
-                current_json = []
-                brace_count = 0
-                continue
-            elif any(marker.lower() in line_lower for marker in render_plan_markers):
-                json_mode = "render_plan"
-                current_json = []
-                brace_count = 0
-                continue
+        elif "slides" in parsed and isinstance(parsed.get("slides"), list):
+            render_plan = parsed
+            print(f"✅ Successfully extracted Render Plan from block {i+1}")
             
-            # If we're in JSON mode, collect lines
-            if json_mode and line.strip():
-                current_json.append(line)
-                brace_count += line.count('{') - line.count('}')
-                
-                # If braces are balanced and we have content, try to parse
-                if brace_count == 0 and len(current_json) > 1:
-                    try:
-                        json_str = '\n'.join(current_json)
-                        cleaned_json = clean_json_string(json_str)
-                        parsed = json.loads(cleaned_json)
-                        
-                        if json_mode == "content_ir" and not content_ir:
-                            content_ir = parsed
-                            print(f"✅ Extracted Content IR via line-by-line method")
-                        elif json_mode == "render_plan" and not render_plan:
-                            render_plan = parsed
-                            print(f"✅ Extracted Render Plan via line-by-line method")
-                            
-                    except:
-                        pass
-                    
-                    json_mode = None
-                    current_json = []
-    
-    return content_ir, render_plan
-
-# COMPREHENSIVE SLIDE VALIDATION SYSTEM
-def validate_individual_slides(content_ir, render_plan):
-    """Validate each slide individually to ensure no empty boxes or missing content"""
-    
-    validation_results = {
-        'overall_valid': True,
-        'slide_validations': [],
-        'critical_issues': [],
-        'warnings': [],
-        'summary': {
-            'total_slides': 0,
-            'valid_slides': 0,
-            'invalid_slides': 0,
-            'slides_with_warnings': 0
-        }
-    }
-    
-    if not render_plan or 'slides' not in render_plan:
-        validation_results['critical_issues'].append("No render plan or slides found")
-        validation_results['overall_valid'] = False
-        return validation_results
-    
-    slides = render_plan['slides']
-    validation_results['summary']['total_slides'] = len(slides)
-    
-    # Define validation rules for each template
-    template_validators = {
-        'business_overview': validate_business_overview_slide,
-        'investor_considerations': validate_investor_considerations_slide,
-        'product_service_footprint': validate_product_service_footprint_slide,
-        'product_service_overview': validate_product_service_overview_slide,
-        'buyer_profiles': validate_buyer_profiles_slide,
-        'historical_financial_performance': validate_historical_financial_performance_slide,
-        'management_team': validate_management_team_slide,
-        'growth_strategy_projections': validate_growth_strategy_slide,
-        'competitive_positioning': validate_competitive_positioning_slide,
-        'valuation_overview': validate_valuation_overview_slide,
-        'trading_comparables': validate_trading_comparables_slide,
-        'precedent_transactions': validate_precedent_transactions_slide,
-        'margin_cost_resilience': validate_margin_cost_resilience_slide,
-        'financial_summary': validate_financial_summary_slide,
-        'transaction_overview': validate_transaction_overview_slide,
-        'appendix': validate_appendix_slide,
-        'sea_conglomerates': validate_sea_conglomerates_slide
-    }
-    
-    # Validate each slide
-    for i, slide in enumerate(slides):
-        slide_num = i + 1
-        template = slide.get('template', 'unknown')
-        
-        slide_validation = {
-            'slide_number': slide_num,
-            'template': template,
-            'valid': True,
-            'issues': [],
-            'warnings': [],
-            'missing_fields': [],
-            'empty_fields': []
-        }
-        
-        # Basic slide structure validation
-        if not slide.get('data'):
-            slide_validation['issues'].append("Missing 'data' section")
-            slide_validation['valid'] = False
-        
-        # Template-specific validation
-        if template in template_validators:
-            template_validator = template_validators[template]
-            template_validation = template_validator(slide, content_ir)
-            
-            slide_validation['issues'].extend(template_validation.get('issues', []))
-            slide_validation['warnings'].extend(template_validation.get('warnings', []))
-            slide_validation['missing_fields'].extend(template_validation.get('missing_fields', []))
-            slide_validation['empty_fields'].extend(template_validation.get('empty_fields', []))
+        elif not content_ir and any(marker in label for marker in CONTENT_IR_MARKERS):
+            content_ir = parsed
+            print(f"✅ Extracted Content IR from labelled block {i+1}")
             
-            if template_validation.get('issues') or template_validation.get('missing_fields') or template_validation.get('empty_fields'):
-                slide_validation['valid'] = False
-        else:
-            slide_validation['warnings'].append(f"Unknown template type: {template}")
-        
-        # Update summary counts
-        if slide_validation['valid']:
-            validation_results['summary']['valid_slides'] += 1
-        else:
-            validation_results['summary']['invalid_slides'] += 1
-            validation_results['overall_valid'] = False
-        
-        if slide_validation['warnings']:
-            validation_results['summary']['slides_with_warnings'] += 1
-        
-        validation_results['slide_validations'].append(slide_validation)
+        elif not render_plan and any(marker in label for marker in RENDER_PLAN_MARKERS):
+            render_plan = parsed
+            print(f"✅ Extracted Render Plan from labelled block {i+1}")
     
-    return validation_results
-
-# FIXED SLIDE-SPECIFIC VALIDATORS
-def validate_business_overview_slide(slide, content_ir):
-    """Validate business overview slide for completeness"""
-    validation = {'issues': [], 'warnings': [], 'missing_fields': [], 'empty_fields': []}
-    
-    data = slide.get('data', {})
-    
-    # Required fields for business overview
-    required_fields = {
-        'title': 'Slide title',
-        'description': 'Business description',
-        'highlights': 'Key highlights',
-        'services': 'Services/products list',
-        'positioning_desc': 'Market positioning description'
-    }
-    
-    for field, description in required_fields.items():
-        if field not in data:
-            validation['missing_fields'].append(f"Missing {description} ({field})")
-        elif not data[field] or (isinstance(data[field], list) and len(data[field]) == 0):
-            validation['empty_fields'].append(f"Empty {description} ({field})")
-        elif isinstance(data[field], str) and (data[field].strip() == '' or '[' in data[field]):
-            validation['empty_fields'].append(f"Placeholder or empty {description} ({field})")
-    
-    # Validate highlights array
-    if 'highlights' in data and isinstance(data['highlights'], list):
-        if len(data['highlights']) < 3:
-            validation['warnings'].append("Less than 3 highlights provided - consider adding more")
-        for i, highlight in enumerate(data['highlights']):
-            if not highlight or highlight.strip() == '' or '[' in highlight:
-                validation['empty_fields'].append(f"Empty highlight #{i+1}")
-    
-    # Validate services array
-    if 'services' in data and isinstance(data['services'], list):
-        if len(data['services']) < 2:
-            validation['warnings'].append("Less than 2 services listed - consider adding more")
-        for i, service in enumerate(data['services']):
-            if not service or service.strip() == '' or '[' in service:
-                validation['empty_fields'].append(f"Empty service #{i+1}")
-    
-    return validation
-
-def validate_product_service_footprint_slide(slide, content_ir):
-    """Validate product service footprint slide - the one with empty boxes"""
-    validation = {'issues': [], 'warnings': [], 'missing_fields': [], 'empty_fields': []}
-    
-    data = slide.get('data', {})
-    
-    # Required fields
-    if 'title' not in data or not data['title']:
-        validation['missing_fields'].append("Missing slide title")
-    
-    if 'services' not in data:
-        validation['missing_fields'].append("Missing services array")
-    elif not isinstance(data['services'], list) or len(data['services']) == 0:
-        validation['empty_fields'].append("Empty services array")
-    else:
-        # Validate each service entry
-        for i, service in enumerate(data['services']):
-            service_num = i + 1
-            if not isinstance(service, dict):
-                validation['issues'].append(f"Service #{service_num} is not a proper object")
-                continue
-                
-            if 'title' not in service or not service['title'] or service['title'].strip() == '':
-                validation['empty_fields'].append(f"Service #{service_num} missing title")
-            elif '[' in service['title']:
-                validation['empty_fields'].append(f"Service #{service_num} has placeholder title")
-                
-            if 'desc' not in service or not service['desc'] or service['desc'].strip() == '':
-                validation['empty_fields'].append(f"Service #{service_num} missing description")
-            elif '[' in service['desc']:
-                validation['empty_fields'].append(f"Service #{service_num} has placeholder description")
-    
-    # Check for market coverage data (right side of slide)
-    if 'coverage_table' in data:
-        coverage_data = data['coverage_table']
-        if not coverage_data or (isinstance(coverage_data, list) and len(coverage_data) == 0):
-            validation['empty_fields'].append("Empty coverage table section")
-    else:
-        validation['warnings'].append("No coverage table data - right side may appear empty")
-    
-    if 'metrics' in data:
-        metrics = data['metrics']
-        if not metrics or (isinstance(metrics, dict) and len(metrics) == 0):
-            validation['empty_fields'].append("Empty metrics section")
-    else:
-        validation['warnings'].append("No operational metrics - may result in empty boxes")
-    
-    return validation
-
-def validate_buyer_profiles_slide(slide, content_ir):
-    """Validate buyer profiles slide - FIXED to handle both approaches correctly"""
-    validation = {'issues': [], 'warnings': [], 'missing_fields': [], 'empty_fields': []}
-    
-    data = slide.get('data', {})
-    
-    # Check for content_ir_key (preferred) or table_rows (fallback)
-    has_content_ir_key = 'content_ir_key' in slide
-    has_table_rows = 'table_rows' in data
-    
-    if not has_content_ir_key and not has_table_rows:
-        validation['issues'].append("Missing content_ir_key - table will be empty")
-    elif has_content_ir_key:
-        content_key = slide['content_ir_key']
-        
-        # Verify the key exists in content_ir and has data
-        if content_key not in content_ir:
-            validation['issues'].append(f"content_ir_key '{content_key}' not found in Content IR")
-        elif not content_ir[content_key] or len(content_ir[content_key]) == 0:
-            validation['empty_fields'].append(f"Empty {content_key} array in Content IR")
-        else:
-            # Validate buyer data completeness
-            buyers = content_ir[content_key]
-            if not isinstance(buyers, list):
-                validation['issues'].append(f"content_ir_key '{content_key}' should be an array")
-            else:
-                for i, buyer in enumerate(buyers):
-                    buyer_num = i + 1
-                    if not isinstance(buyer, dict):
-                        validation['issues'].append(f"Buyer #{buyer_num} should be an object")
-                        continue
-                    
-                    # Check for required buyer fields - FIXED for your data structure
-                    required_buyer_fields = ['buyer_name', 'strategic_rationale', 'fit']
-                    for field in required_buyer_fields:
-                        if field not in buyer:
-                            validation['empty_fields'].append(f"Buyer #{buyer_num} missing {field}")
-                        elif not buyer[field] or str(buyer[field]).strip() == '':
-                            validation['empty_fields'].append(f"Buyer #{buyer_num} has empty {field}")
-                        elif '[' in str(buyer[field]):
-                            validation['empty_fields'].append(f"Buyer #{buyer_num} has placeholder {field}")
-    
-    elif has_table_rows and not has_content_ir_key:
-        # Validate table_rows content - FIXED to handle your data structure
-        validation['warnings'].append("Using hardcoded table_rows - content_ir_key preferred for dynamic data")
-        
-        table_rows = data.get('table_rows', [])
-        if not table_rows or len(table_rows) == 0:
-            validation['empty_fields'].append("Empty table_rows array")
-        else:
-            for i, row in enumerate(table_rows):
-                row_num = i + 1
-                # Your table_rows contain dictionaries, not lists
-                if isinstance(row, dict):
-                    # Check if it has required fields
-                    required_fields = ['buyer_name', 'strategic_rationale']
-                    for field in required_fields:
-                        if field not in row or not row[field] or str(row[field]).strip() == '':
-                            validation['empty_fields'].append(f"Table row #{row_num} missing or empty {field}")
-                elif isinstance(row, list):
-                    if len(row) == 0:
-                        validation['empty_fields'].append(f"Table row #{row_num} is empty")
-                    else:
-                        for j, cell in enumerate(row):
-                            cell_num = j + 1
-                            if not cell or str(cell).strip() == '' or '[' in str(cell):
-                                validation['empty_fields'].append(f"Table row #{row_num}, cell #{cell_num} is empty or placeholder")
-                else:
-                    validation['empty_fields'].append(f"Table row #{row_num} has invalid structure")
-    
-    # Validate required fields
-    required_fields = ['title', 'table_headers']
-    for field in required_fields:
-        if field not in data:
-            validation['missing_fields'].append(f"Missing {field}")
-        elif not data[field]:
-            validation['empty_fields'].append(f"Empty {field}")
-        elif field == 'table_headers' and isinstance(data[field], list):
-            if len(data[field]) < 2:
-                validation['warnings'].append("Less than 2 table headers - table may look incomplete")
-            for i, header in enumerate(data[field]):
-                if not header or str(header).strip() == '':
-                    validation['empty_fields'].append(f"Table header #{i+1} is empty")
-    
-    return validation
-
-def validate_management_team_slide(slide, content_ir):
-    """Validate management team slide - FIXED for correct field names"""
-    validation = {'issues': [], 'warnings': [], 'missing_fields': [], 'empty_fields': []}
-    
-    # Check if using content_ir_key approach
-    if 'content_ir_key' in slide:
-        content_key = slide['content_ir_key']
-        if content_key not in content_ir:
-            validation['issues'].append(f"content_ir_key '{content_key}' not found in Content IR")
-            return validation
-        mgmt_data = content_ir[content_key]
-    else:
-        # Check data section
-        data = slide.get('data', {})
-        if 'management_team' not in content_ir:
-            validation['issues'].append("No management_team data in Content IR")
-            return validation
-        mgmt_data = content_ir['management_team']
-    
-    # Check for required profile arrays
-    for column in ['left_column_profiles', 'right_column_profiles']:
-        if column not in mgmt_data:
-            validation['missing_fields'].append(f"Missing {column}")
-        elif not isinstance(mgmt_data[column], list) or len(mgmt_data[column]) == 0:
-            validation['empty_fields'].append(f"Empty {column}")
-        else:
-            # Validate individual profiles - FIXED FIELD NAMES
-            for i, profile in enumerate(mgmt_data[column]):
-                profile_num = i + 1
-                # Check for the CORRECT field names used in your data
-                required_profile_fields = ['role_title', 'experience_bullets']
-                for field in required_profile_fields:
-                    if field not in profile or not profile[field]:
-                        validation['empty_fields'].append(f"{column} profile #{profile_num} missing/placeholder {field}")
-                    elif field == 'role_title' and '[' in str(profile[field]):
-                        validation['empty_fields'].append(f"{column} profile #{profile_num} missing/placeholder {field}")
-                    elif field == 'experience_bullets' and (not isinstance(profile[field], list) or len(profile[field]) == 0):
-                        validation['empty_fields'].append(f"{column} profile #{profile_num} missing/placeholder {field}")
-    
-    return validation
-
-def validate_historical_financial_performance_slide(slide, content_ir):
-    """Validate historical financial performance slide"""
-    validation = {'issues': [], 'warnings': [], 'missing_fields': [], 'empty_fields': []}
-    
-    data = slide.get('data', {})
-    
-    # Required fields for historical financial performance
-    required_fields = {
-        'title': 'Slide title',
-        'chart': 'Financial performance chart data',
-        'key_metrics': 'Key financial metrics'
-    }
-    
-    for field, description in required_fields.items():
-        if field not in data:
-            validation['missing_fields'].append(f"Missing {description}")
-        elif not data[field]:
-            validation['empty_fields'].append(f"Empty {description}")
-    
-    # Validate chart data
-    if 'chart' in data and isinstance(data['chart'], dict):
-        chart = data['chart']
-        chart_required = ['categories', 'revenue', 'ebitda']
-        for field in chart_required:
-            if field not in chart or not chart[field]:
-                validation['empty_fields'].append(f"Missing chart {field} data")
-    
-    # Validate key metrics
-    if 'key_metrics' in data and isinstance(data['key_metrics'], dict):
-        metrics = data['key_metrics']
-        if 'metrics' in metrics and isinstance(metrics['metrics'], list):
-            if len(metrics['metrics']) < 3:
-                validation['warnings'].append("Less than 3 key metrics - consider adding more")
-        else:
-            validation['empty_fields'].append("Missing metrics array in key_metrics")
-    
-    return validation
-
-def validate_growth_strategy_slide(slide, content_ir):
-    """Validate growth strategy slide"""
-    validation = {'issues': [], 'warnings': [], 'missing_fields': [], 'empty_fields': []}
-    
-    data = slide.get('data', {})
-    
-    # Get actual data structure - check for slide_data wrapper
-    if 'slide_data' in data:
-        actual_data = data['slide_data']
-    else:
-        actual_data = data
-    
-    # Required fields for growth strategy
-    required_fields = {
-        'title': 'Slide title',
-        'growth_strategy': 'Growth strategy section',
-        'financial_projections': 'Financial projections'
-    }
-    
-    for field, description in required_fields.items():
-        if field not in actual_data:
-            validation['missing_fields'].append(f"Missing {description}")
-        elif not actual_data[field]:
-            validation['empty_fields'].append(f"Empty {description}")
-    
-    # Validate growth strategy
-    if 'growth_strategy' in actual_data and isinstance(actual_data['growth_strategy'], dict):
-        growth_strat = actual_data['growth_strategy']
-        if 'strategies' in growth_strat and isinstance(growth_strat['strategies'], list):
-            if len(growth_strat['strategies']) < 3:
-                validation['warnings'].append("Less than 3 growth strategies - consider adding more")
-        else:
-            validation['empty_fields'].append("Missing strategies array in growth_strategy")
-    
-    return validation
-
-def validate_competitive_positioning_slide(slide, content_ir):
-    """Validate competitive positioning slide - FIXED for correct field names"""
-    validation = {'issues': [], 'warnings': [], 'missing_fields': [], 'empty_fields': []}
-    
-    data = slide.get('data', {})
-    
-    # FIXED: Use the correct field names from your data structure
-    required_fields = {
-        'title': 'Slide title',
-        'competitors': 'Competitors list',
-        'advantages': 'Competitive advantages'  # FIXED from 'competitive_advantages'
-    }
-    
-    for field, description in required_fields.items():
-        if field not in data:
-            validation['missing_fields'].append(f"Missing {description}")
-        elif not data[field]:
-            validation['empty_fields'].append(f"Empty {description}")
-    
-    # Validate competitors array - FIXED for correct structure
-    if 'competitors' in data and isinstance(data['competitors'], list):
-        if len(data['competitors']) < 3:
-            validation['warnings'].append("Less than 3 competitors listed - consider adding more")
-        for i, competitor in enumerate(data['competitors']):
-            comp_num = i + 1
-            # Your data structure has 'name' and 'revenue' - not strengths/weaknesses
-            if isinstance(competitor, dict):
-                if 'name' not in competitor or not competitor['name']:
-                    validation['empty_fields'].append(f"Competitor #{comp_num} missing name")
-                if 'revenue' not in competitor or not competitor['revenue']:
-                    validation['empty_fields'].append(f"Competitor #{comp_num} missing revenue")
-            elif not competitor or '[' in str(competitor):
-                validation['empty_fields'].append(f"Competitor #{comp_num} is empty or placeholder")
-    
-    # Check assessment table
-    if 'assessment' in data:
-        assessment = data['assessment']
-        if not assessment or not isinstance(assessment, list) or len(assessment) == 0:
-            validation['empty_fields'].append("Empty competitive assessment table")
-    else:
-        validation['warnings'].append("No competitive assessment table")
-    
-    # Check for barriers and advantages
-    for section in ['barriers', 'advantages']:
-        if section in data and isinstance(data[section], list):
-            for i, item in enumerate(data[section]):
-                if isinstance(item, dict):
-                    if not item.get('title') or not item.get('desc'):
-                        validation['empty_fields'].append(f"{section.title()} #{i+1} missing title or description")
-    
-    return validation
-
-def validate_valuation_overview_slide(slide, content_ir):
-    """Validate valuation overview slide - FIXED for correct field names"""
-    validation = {'issues': [], 'warnings': [], 'missing_fields': [], 'empty_fields': []}
-    
-    data = slide.get('data', {})
-    
-    # FIXED: Use the correct field names from your data structure
-    required_fields = {
-        'title': 'Slide title',
-        'valuation_data': 'Valuation methodologies data'  # FIXED
-    }
-    
-    for field, description in required_fields.items():
-        if field not in data:
-            validation['missing_fields'].append(f"Missing {description}")
-        elif not data[field]:
-            validation['empty_fields'].append(f"Empty {description}")
-    
-    # Validate valuation_data array
-    if 'valuation_data' in data and isinstance(data['valuation_data'], list):
-        if len(data['valuation_data']) < 2:
-            validation['warnings'].append("Less than 2 valuation methodologies - consider adding more")
-        for i, method in enumerate(data['valuation_data']):
-            method_num = i + 1
-            if isinstance(method, dict):
-                required_method_fields = ['methodology', 'enterprise_value', 'commentary']
-                for field in required_method_fields:
-                    if field not in method or not method[field]:
-                        validation['empty_fields'].append(f"Methodology #{method_num} missing {field}")
-            elif not method or '[' in str(method):
-                validation['empty_fields'].append(f"Methodology #{method_num} is empty or placeholder")
-    
-    return validation
-
-def validate_trading_comparables_slide(slide, content_ir):
-    """Validate trading comparables slide"""
-    validation = {'issues': [], 'warnings': [], 'missing_fields': [], 'empty_fields': []}
-    
-    data = slide.get('data', {})
-    
-    # Required fields
-    required_fields = {
-        'title': 'Slide title',
-        'comparable_companies': 'Comparable companies list',
-        'metrics': 'Financial metrics comparison'
-    }
-    
-    for field, description in required_fields.items():
-        if field not in data:
-            validation['missing_fields'].append(f"Missing {description}")
-        elif not data[field]:
-            validation['empty_fields'].append(f"Empty {description}")
-    
-    # Validate comparable companies
-    if 'comparable_companies' in data and isinstance(data['comparable_companies'], list):
-        if len(data['comparable_companies']) < 4:
-            validation['warnings'].append("Less than 4 comparable companies - consider adding more")
-        for i, company in enumerate(data['comparable_companies']):
-            comp_num = i + 1
-            if isinstance(company, dict):
-                required_comp_fields = ['name', 'market_cap', 'revenue', 'ebitda_multiple']
-                for field in required_comp_fields:
-                    if field not in company or not company[field]:
-                        validation['empty_fields'].append(f"Comparable #{comp_num} missing {field}")
-                    elif '[' in str(company[field]):
-                        validation['empty_fields'].append(f"Comparable #{comp_num} has placeholder {field}")
-    
-    return validation
-
-def validate_precedent_transactions_slide(slide, content_ir):
-    """Validate precedent transactions slide"""
-    validation = {'issues': [], 'warnings': [], 'missing_fields': [], 'empty_fields': []}
-    
-    data = slide.get('data', {})
-    
-    # Required fields
-    required_fields = {
-        'title': 'Slide title',
-        'transactions': 'Precedent transactions list'
-    }
-    
-    for field, description in required_fields.items():
-        if field not in data:
-            validation['missing_fields'].append(f"Missing {description}")
-        elif not data[field]:
-            validation['empty_fields'].append(f"Empty {description}")
-    
-    # Validate transactions
-    if 'transactions' in data and isinstance(data['transactions'], list):
-        if len(data['transactions']) < 3:
-            validation['warnings'].append("Less than 3 precedent transactions - consider adding more")
-        for i, transaction in enumerate(data['transactions']):
-            trans_num = i + 1
-            if isinstance(transaction, dict):
-                required_trans_fields = ['target', 'acquirer', 'date', 'enterprise_value', 'revenue', 'ev_revenue_multiple']
-                for field in required_trans_fields:
-                    if field not in transaction or not transaction[field]:
-                        validation['empty_fields'].append(f"Transaction #{trans_num} missing {field}")
-                    elif '[' in str(transaction[field]):
-                        validation['empty_fields'].append(f"Transaction #{trans_num} has placeholder {field}")
-    
-    return validation
-
-def validate_margin_cost_resilience_slide(slide, content_ir):
-    """Validate margin/cost resilience slide - FIXED for correct field names"""
-    validation = {'issues': [], 'warnings': [], 'missing_fields': [], 'empty_fields': []}
-    
-    data = slide.get('data', {})
-    
-    # FIXED: Use the correct field names from your data structure
-    required_fields = {
-        'title': 'Slide title',
-        'cost_management': 'Cost management initiatives',  # FIXED
-        'risk_mitigation': 'Risk mitigation strategies'     # FIXED
-    }
-    
-    for field, description in required_fields.items():
-        if field not in data:
-            validation['missing_fields'].append(f"Missing {description}")
-        elif not data[field]:
-            validation['empty_fields'].append(f"Empty {description}")
-    
-    # Validate cost management items
-    if 'cost_management' in data:
-        cost_mgmt = data['cost_management']
-        if isinstance(cost_mgmt, dict) and 'items' in cost_mgmt:
-            items = cost_mgmt['items']
-            if not items or len(items) == 0:
-                validation['empty_fields'].append("Empty cost management items")
-            else:
-                for i, item in enumerate(items):
-                    if not isinstance(item, dict):
-                        validation['empty_fields'].append(f"Cost management item #{i+1} is not properly structured")
-                    elif not item.get('title') or not item.get('description'):
-                        validation['empty_fields'].append(f"Cost management item #{i+1} missing title or description")
-    
-    # Validate risk mitigation
-    if 'risk_mitigation' in data:
-        risk_mit = data['risk_mitigation']
-        if isinstance(risk_mit, dict):
-            if 'main_strategy' not in risk_mit:
-                validation['missing_fields'].append("Missing main strategy in risk mitigation")
-        
-    return validation
-
-def validate_investor_considerations_slide(slide, content_ir):
-    """Validate investor considerations slide"""
-    validation = {'issues': [], 'warnings': [], 'missing_fields': [], 'empty_fields': []}
-    
-    data = slide.get('data', {})
-    
-    required_fields = {
-        'title': 'Slide title',
-        'considerations': 'Investment considerations list',
-        'mitigants': 'Risk mitigants list'
-    }
-    
-    for field, description in required_fields.items():
-        if field not in data:
-            validation['missing_fields'].append(f"Missing {description}")
-        elif not data[field] or (isinstance(data[field], list) and len(data[field]) == 0):
-            validation['empty_fields'].append(f"Empty {description}")
-    
-    return validation
-
-def validate_financial_summary_slide(slide, content_ir):
-    """Validate financial summary slide"""
-    validation = {'issues': [], 'warnings': [], 'missing_fields': [], 'empty_fields': []}
-    
-    data = slide.get('data', {})
-    
-    required_fields = {
-        'title': 'Slide title',
-        'key_metrics': 'Key financial metrics',
-        'performance_highlights': 'Performance highlights'
-    }
-    
-    for field, description in required_fields.items():
-        if field not in data:
-            validation['missing_fields'].append(f"Missing {description}")
-        elif not data[field]:
-            validation['empty_fields'].append(f"Empty {description}")
-    
-    return validation
-
-def validate_transaction_overview_slide(slide, content_ir):
-    """Validate transaction overview slide"""
-    validation = {'issues': [], 'warnings': [], 'missing_fields': [], 'empty_fields': []}
-    
-    data = slide.get('data', {})
-    
-    required_fields = {
-        'title': 'Slide title',
-        'transaction_structure': 'Transaction structure',
-        'key_terms': 'Key transaction terms',
-        'timeline': 'Transaction timeline'
-    }
-    
-    for field, description in required_fields.items():
-        if field not in data:
-            validation['missing_fields'].append(f"Missing {description}")
-        elif not data[field]:
-            validation['empty_fields'].append(f"Empty {description}")
-    
-    return validation
-
-def validate_product_service_overview_slide(slide, content_ir):
-    """Validate product/service overview slide"""
-    validation = {'issues': [], 'warnings': [], 'missing_fields': [], 'empty_fields': []}
-    
-    data = slide.get('data', {})
-    
-    # Required fields
-    required_fields = {
-        'title': 'Slide title',
-        'products': 'Products list',
-        'market_position': 'Market positioning'
-    }
-    
-    for field, description in required_fields.items():
-        if field not in data:
-            validation['missing_fields'].append(f"Missing {description}")
-        elif not data[field]:
-            validation['empty_fields'].append(f"Empty {description}")
-    
-    return validation
-
-def validate_appendix_slide(slide, content_ir):
-    """Validate appendix slide"""
-    validation = {'issues': [], 'warnings': [], 'missing_fields': [], 'empty_fields': []}
-    
-    data = slide.get('data', {})
-    
-    if 'title' not in data or not data['title']:
-        validation['missing_fields'].append("Missing appendix title")
-    
-    return validation
-
-def validate_sea_conglomerates_slide(slide, content_ir):
-    """Validate SEA conglomerates slide"""
-    validation = {'issues': [], 'warnings': [], 'missing_fields': [], 'empty_fields': []}
-    
-    data = slide.get('data', [])
-    
-    if not data or len(data) == 0:
-        validation['empty_fields'].append("Empty conglomerates data")
-    else:
-        for i, conglomerate in enumerate(data):
-            cong_num = i + 1
-            if isinstance(conglomerate, dict):
-                required_fields = ['name', 'country', 'description']
-                for field in required_fields:
-                    if field not in conglomerate or not conglomerate[field]:
-                        validation['empty_fields'].append(f"Conglomerate #{cong_num} missing {field}")
-    
-    return validation
+    return content_ir, render_plan
 
 # VALIDATION DISPLAY FUNCTIONS
 def display_validation_results(validation_results):
@@ -1329,7 +514,7 @@ def validate_against_examples(content_ir, render_plan, examples):
             if 'content_ir_key' not in slide:
                 validation_results['structure_issues'].append(f"buyer_profiles slide missing content_ir_key")
                 validation_results['render_plan_structure_valid'] = False
-            elif slide['content_ir_key'] not in content_ir:
+            elif resolver_for(content_ir).unresolved({"$ref": slide['content_ir_key']}):
                 validation_results['structure_issues'].append(f"content_ir_key '{slide['content_ir_key']}' not found in Content IR")
                 validation_results['render_plan_structure_valid'] = False
     
@@ -1409,12 +594,14 @@ SPECIFIC SLIDE REQUIREMENTS FOR ALL TEMPLATES (UPDATED WITH CORRECT FIELD NAMES)
 5. **historical_financial_performance**:
    - Must have chart data with categories, revenue, ebitda arrays (min 3 years each)
    - Must include key_metrics with metrics array
+   - chart and key_metrics MAY be omitted: they are derived from content_ir facts (years, revenue_usd_m, ebitda_usd_m)
    - Chart structure: {{"categories": ["2020", "2021", ...], "revenue": [120, 145, ...], "ebitda": [18, 24, ...]}}
 
 6. **margin_cost_resilience**:
    - Must have: cost_management with items array, risk_mitigation with main_strategy
    - CORRECT FIELD NAMES: cost_management (not cost_structure), risk_mitigation (not resilience_factors)
    - Structure: {{"cost_management": {{"items": [...]}}, "risk_mitigation": {{"main_strategy": {{...}}}}}}
+   - chart_data (EBITDA margins) MAY be omitted: margins are computed from content_ir facts
 
 7. **competitive_positioning**:
    - Must have: competitors array, advantages array (not competitive_advantages), assessment table
@@ -1441,6 +628,12 @@ SPECIFIC SLIDE REQUIREMENTS FOR ALL TEMPLATES (UPDATED WITH CORRECT FIELD NAMES)
     - Must have: transactions array with target, acquirer, date, enterprise_value, revenue, ev_revenue_multiple
     - Each transaction needs complete data, no placeholders
 
+REFERENCES INSTEAD OF COPIES:
+- Do NOT copy Content IR blocks into the render plan. Any data value may be a reference:
+  {{"$ref": "#/precedent_transactions"}}, {{"$ref": "#/sea_conglomerates"}}, {{"$ref": "#/facts/years"}}
+- Extra keys next to "$ref" override fields of the referenced object
+- Example: {{"template": "precedent_transactions", "data": {{"title": "Precedent Transactions", "transactions": {{"$ref": "#/precedent_transactions"}}}}}}
+
 CONTENT IR STRUCTURE REQUIREMENTS:
 - entities: {{"company": {{"name": "Company Name"}}}}
 - management_team: {{"left_column_profiles": [...], "right_column_profiles": [...]}}
@@ -1745,214 +938,6 @@ def check_interview_completion(messages):
 
 
 
-# --- BEGIN: Auto-convert buyer_profiles with financials → sea_conglomerates ---
-import os, re as _re
-
-AUTO_USE_SEA_CONGLOMERATES = os.getenv("AUTO_USE_SEA_CONGLOMERATES", "1") not in ("0","false","False","no","No")
-
-_FINANCE_HINTS = {"revenue","ebitda","market_cap","net_income","profit","earnings","margin","ticker","ownership","assets","liabilities","enterprise_value","ev","valuation"}
-
-def _extract_country_from_name(name: str) -> str:
-    # e.g., "Yamazaki Baking Co. (Japan)" -> "Japan"
-    if not isinstance(name, str):
-        return ""
-    m = _re.search(r"\(([^)]+)\)\s*$", name.strip())
-    return m.group(1).strip() if m else ""
-
-def _dict_row_has_finance(r: dict) -> bool:
-    keys = {k.lower() for k in r.keys()}
-    return any(k in keys for k in _FINANCE_HINTS)
-
-def _headers_have_finance(headers) -> bool:
-    if not isinstance(headers, list): return False
-    hl = [str(h).strip().lower() for h in headers]
-    return any(any(hint in h for hint in _FINANCE_HINTS) for h in hl)
-
-def convert_buyer_profiles_to_sea_conglomerates(slide: dict) -> dict:
-    """
-    If buyer_profiles contains financial fields (dict rows or finance headers),
-    convert to sea_conglomerates template with concise description lines.
-    """
-    if slide.get("template") != "buyer_profiles" or not AUTO_USE_SEA_CONGLOMERATES:
-        return slide
-
-    data = slide.get("data", {})
-    rows = data.get("table_rows", [])
-    headers = data.get("table_headers", [])
-
-    finance_mode = False
-    dict_rows = []
-    if isinstance(rows, list) and rows and isinstance(rows[0], dict):
-        dict_rows = rows
-        finance_mode = any(_dict_row_has_finance(r) for r in dict_rows)
-    elif _headers_have_finance(headers):
-        finance_mode = True
-
-    if not finance_mode:
-        return slide  # no conversion
-
-    items = []
-    if dict_rows:
-        for r in dict_rows:
-            name = r.get("buyer_name") or r.get("name","")
-            country = r.get("country") or _extract_country_from_name(name)
-            parts = []
-
-            # Financials first if present
-            for k in ("revenue","ebitda","market_cap","net_income","margin","enterprise_value","valuation","ownership","ticker"):
-                v = r.get(k)
-                if v not in (None, ""):
-                    label = k.replace("_"," ").title()
-                    parts.append(f"{label}: {v}")
-
-            # Then rationale/synergies for context
-            if r.get("strategic_rationale"):
-                parts.append(f"Rationale: {r.get('strategic_rationale')}")
-            if r.get("key_synergies"):
-                parts.append(f"Synergies: {r.get('key_synergies')}")
-
-            desc = " • ".join(parts) if parts else "—"
-            items.append({"name": name, "country": country, "description": desc})
-    else:
-        # If rows are arrays and headers include finance terms, map by position
-        # Build index mapping from headers
-        idx = {h.strip().lower(): i for i, h in enumerate(headers) if isinstance(h, str)}
-        for r in rows:
-            name = r[idx.get("buyer name", 0)] if isinstance(r, list) and len(r)>0 else ""
-            country = _extract_country_from_name(name)
-            parts = []
-            for hint in list(_FINANCE_HINTS):
-                pos = None
-                # try exact header match or contains
-                for h, i in idx.items():
-                    if hint in h:
-                        pos = i; break
-                if pos is not None and isinstance(r, list) and len(r)>pos:
-                    v = r[pos]
-                    if v not in (None, ""):
-                        label = hint.replace("_"," ").title()
-                        parts.append(f"{label}: {v}")
-            # Try rationale/synergies columns
-            for key in ["strategic rationale","rationale","key synergies","synergies"]:
-                if key in idx and len(r)>idx[key]:
-                    val = r[idx[key]]
-                    if val not in (None, ""):
-                        parts.append(f"{key.title()}: {val}")
-            desc = " • ".join(parts) if parts else "—"
-            items.append({"name": name, "country": country, "description": desc})
-
-    # Build the new slide
-    new_slide = {
-        "template": "sea_conglomerates",
-        "data": items
-    }
-    # Preserve original title as an optional leading descriptor if present
-    if isinstance(data, dict) and "title" in data:
-        # Some renderers might read title; we prepend a descriptor row
-        pass
-
-    return new_slide
-# --- END: Auto-convert ---
-# --- BEGIN: Normalizers to prevent blank cells and schema drift ---
-def normalize_buyer_profiles_slide(slide: dict) -> dict:
-    if slide.get("template") != "buyer_profiles":
-        return slide
-    d = slide.setdefault("data", {})
-
-    headers = d.get("table_headers") or ["Buyer Profile", "Strategic Rationale", "Key Synergies", "Concerns", "Fit"]
-    if len(headers) == 4 and headers[-1].lower().startswith("fit"):
-        headers = [headers[0], headers[1], headers[2], "Concerns", headers[3]]
-    d["table_headers"] = headers[:5]
-
-    fixed_rows = []
-    for r in d.get("table_rows", []):
-        if isinstance(r, list):
-            r = {
-                "buyer_name":          (r[0] if len(r) > 0 else ""),
-                "strategic_rationale": (r[1] if len(r) > 1 else ""),
-                "key_synergies":       (r[2] if len(r) > 2 else ""),
-                "concerns":            (r[3] if len(r) > 3 else ""),
-                "fit_score":           (r[4] if len(r) > 4 else ""),
-            }
-        else:
-            r = dict(r)
-            r["buyer_name"]          = r.get("buyer_name") or r.get("name", "")
-            r["strategic_rationale"] = r.get("strategic_rationale") or r.get("rationale", "")
-            r["key_synergies"]       = r.get("key_synergies") or r.get("synergies", "")
-            r["concerns"]            = r.get("concerns", "")
-            r["fit_score"]           = r.get("fit_score") or r.get("fit", "")
-        fixed_rows.append(r)
-    d["table_rows"] = fixed_rows
-
-    d.setdefault("subtitle", d.get("subtitle", ""))
-    d.setdefault("company", slide.get("company") or "")
-    return slide
-
-
-def normalize_valuation_overview_slide(slide: dict) -> dict:
-    if slide.get("template") != "valuation_overview":
-        return slide
-    d = slide.setdefault("data", {})
-    rows = d.get("valuation_data", [])
-
-    any_22a = False
-    any_23e = False
-    any_metric = False
-
-    for r in rows:
-        meth = (r.get("methodology") or "").lower()
-        if not r.get("metric"):
-            if "precedent" in meth or "trading" in meth:
-                r["metric"] = "EV/Revenue"
-            elif "dcf" in meth or "discounted" in meth:
-                r["metric"] = "DCF"
-        any_metric = any_metric or bool(r.get("metric"))
-
-        if "22a_multiple" not in r:
-            r["22a_multiple"] = r.get("22A_multiple") or r.get("FY22_multiple") or "-"
-        if "23e_multiple" not in r:
-            r["23e_multiple"] = r.get("23E_multiple") or r.get("FY23E_multiple") or "-"
-
-        if not r.get("methodology_type"):
-            if "precedent" in meth:
-                r["methodology_type"] = "precedent_transactions"
-            elif "trading" in meth:
-                r["methodology_type"] = "trading_comps"
-            elif "dcf" in meth or "discounted" in meth:
-                r["methodology_type"] = "dcf"
-
-        any_22a = any_22a or (r.get("22a_multiple") not in ("", None))
-        any_23e = any_23e or (r.get("23e_multiple") not in ("", None))
-
-    d["__hide_metric_col"]  = not any_metric
-    d["__hide_22a_col"]     = not any_22a
-    d["__hide_23e_col"]     = not any_23e
-    return slide
-
-
-def normalize_plan(plan: dict) -> dict:
-    try:
-        slides_in = plan.get("slides", [])
-    except Exception:
-        return plan
-    slides_out = []
-    for s in slides_in:
-        # Convert finance-heavy buyer profiles into SEA Conglomerates slide first
-        s = convert_buyer_profiles_to_sea_conglomerates(s)
-        # Then run standard normalizers
-        s = normalize_buyer_profiles_slide(s)
-        s = normalize_valuation_overview_slide(s)
-        slides_out.append(s)
-    plan["slides"] = slides_out
-    return plan
-    slides_out = []
-    for s in slides_in:
-        s = normalize_buyer_profiles_slide(s)
-        s = normalize_valuation_overview_slide(s)
-        slides_out.append(s)
-    plan["slides"] = slides_out
-    return plan
-# --- END: Normalizers ---
 
 def extract_and_validate_jsons(response_text):
     """Extract JSONs and perform comprehensive validation with example-based checking"""
@@ -2013,17 +998,8 @@ def create_downloadable_files(content_ir, render_plan, company_name="company"):
 
 def create_zip_package(files_data):
     """Create a ZIP package with both JSON files and metadata"""
-    zip_buffer = io.BytesIO()
-    
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-        # Add Content IR file
-        zip_file.writestr(files_data['content_ir_filename'], files_data['content_ir_json'])
-        
-        # Add Render Plan file
-        zip_file.writestr(files_data['render_plan_filename'], files_data['render_plan_json'])
-        
-        # Add README with instructions
-        readme_content = f"""# AI-Generated Pitch Deck Files
+    # Add README with instructions
+    readme_content = f"""# AI-Generated Pitch Deck Files
 Company: {files_data['company_name']}
 Generated: {files_data['timestamp']}
 
@@ -2044,18 +1020,23 @@ Generated: {files_data['timestamp']}
 
 Generated by AI Deck Builder - LLM-Powered Pitch Deck Generator
 """
-        zip_file.writestr("README.txt", readme_content)
-        
-        # Add metadata file
-        metadata = {
-            "generated_at": files_data['timestamp'],
-            "company_name": files_data['company_name'],
-            "content_ir_file": files_data['content_ir_filename'],
-            "render_plan_file": files_data['render_plan_filename'],
-            "generator": "AI Deck Builder",
-            "version": "1.0"
-        }
-        zip_file.writestr("metadata.json", json.dumps(metadata, indent=2))
+    
+    # Add metadata file
+    metadata = {
+        "generated_at": files_data['timestamp'],
+        "company_name": files_data['company_name'],
+        "content_ir_file": files_data['content_ir_filename'],
+        "render_plan_file": files_data['render_plan_filename'],
+        "generator": "AI Deck Builder",
+        "version": "1.0"
+    }
+    zip_buffer = io.BytesIO()
+    write_bundle(zip_buffer, [
+        BundleMember(files_data['content_ir_filename'], text_chunks(files_data['content_ir_json'])),
+        BundleMember(files_data['render_plan_filename'], text_chunks(files_data['render_plan_json'])),
+        BundleMember("README.txt", text_chunks(readme_content)),
+        BundleMember("metadata.json", json_chunks(metadata)),
+    ])
     
     zip_buffer.seek(0)
     return zip_buffer
@@ -2095,11 +1076,29 @@ def call_llm_api(messages, model_name, api_key, service="perplexity"):
     except Exception as e:
         return f"Error calling {service} API: {str(e)}"
 
+def call_llm_api_or_raise(messages, model_name, api_key, service="perplexity"):
+    """call_llm_api for callers that must not mistake an error reply for model output"""
+    reply = call_llm_api(messages, model_name, api_key, service)
+    if is_llm_error(reply):
+        raise RuntimeError(reply[:300])
+    return reply
+
+def call_llm_api_with_continuation(messages, model_name, api_key, service="perplexity"):
+    """Call the LLM and, if its JSON was cut off at max_tokens, fetch only the missing tail"""
+    response = call_llm_api(messages, model_name, api_key, service)
+    
+    def request_tail(partial_text, prompt):
+        follow_up = messages + [
+            {"role": "assistant", "content": partial_text},
+            {"role": "user", "content": prompt},
+        ]
+        return call_llm_api(follow_up, model_name, api_key, service)
+    
+    return complete_truncated_response(response, request_tail)
+
 def call_perplexity_api(messages, model_name, api_key):
     """Call Perplexity API with the conversation - FIXED for message alternation"""
     try:
-        url = "https://api.perplexity.ai/chat/completions"
-        
         # Extract system message
         system_message = None
         conversation_messages = []
@@ -2153,7 +1152,7 @@ def call_perplexity_api(messages, model_name, api_key):
             "Content-Type": "application/json"
         }
         
-        response = requests.post(url, json=payload, headers=headers)
+        response = llm_post("perplexity", payload, headers)
         
         if response.status_code == 200:
             result = response.json()
@@ -2167,8 +1166,6 @@ def call_perplexity_api(messages, model_name, api_key):
 def call_claude_api(messages, model_name, api_key):
     """Call Claude API with the conversation"""
     try:
-        url = "https://api.anthropic.com/v1/messages"
-        
         # Convert messages format for Claude
         claude_messages = []
         system_message = ""
@@ -2198,7 +1195,7 @@ def call_claude_api(messages, model_name, api_key):
             "anthropic-version": "2023-06-01"
         }
         
-        response = requests.post(url, json=payload, headers=headers)
+        response = llm_post("claude", payload, headers)
         
         if response.status_code == 200:
             result = response.json()
@@ -2464,15 +1461,73 @@ with st.sidebar:
     company_name = st.text_input("Company name", value="Moelis & Company")
     skip_validate = st.checkbox("Skip validation", value=False)
 
+# Persistent sessions: state survives restarts and resumes on any worker sharing the store (?sid=...)
+PERSISTED_STATE_KEYS = ("chat_started", "generated_content_ir", "generated_render_plan",
+                        "brand_config", "files_data", "files_ready")
+
+
+@st.cache_resource
+def get_session_store():
+    return open_session_store(os.environ.get("SESSION_STORE", DEFAULT_STORE_URL))
+
+
+@st.cache_resource
+def get_render_pool():
+    """
+    One render pool per app process, shared by every browser session.
+    RENDER_WORKERS=0 renders inline in the script thread instead.
+    """
+    workers = int(os.environ.get("RENDER_WORKERS", max(1, (os.cpu_count() or 2) - 1)))
+    if workers <= 0:
+        return None
+    return RenderService(
+        workers=workers,
+        max_queue=int(os.environ.get("RENDER_QUEUE_MAX", 4 * workers)),
+        per_client=int(os.environ.get("RENDER_PER_SESSION", 1)),
+        # A session that stops polling (tab closed, rerun) forfeits its queued render
+        abandon_after=float(os.environ.get("RENDER_ABANDON_AFTER", 15)),
+    )
+
+
+def resume_session(store):
+    """Bind this browser session to a stored session, loading it when the URL names one."""
+    if "session_id" in st.session_state:
+        return st.session_state.session_id
+    session_id = st.query_params.get("sid")
+    if session_id and store.exists(session_id):
+        st.session_state.update(store.load_state(session_id))
+        st.session_state.messages = store.message_log(session_id, [{"role": "system", "content": SYSTEM_PROMPT}])
+    else:
+        session_id = store.create_session()
+        st.query_params["sid"] = session_id
+    st.session_state.session_id = session_id
+    return session_id
+
+
+def persist_session(store, session_id):
+    """Write changed state values; a message list replaced wholesale (e.g. Reset Chat) starts a new log."""
+    messages = st.session_state.get("messages")
+    if messages is not None and not (isinstance(messages, MessageLog) and messages.session_id == session_id):
+        st.session_state.messages = store.reset_messages(session_id, list(messages))
+    for key in PERSISTED_STATE_KEYS:
+        if key in st.session_state:
+            store.put_state(session_id, key, st.session_state[key])
+
+
+session_store = get_session_store()
+session_id = resume_session(session_store)
+
 # Initialize chat history
 if "messages" not in st.session_state:
-    st.session_state.messages = [
-        {"role": "system", "content": SYSTEM_PROMPT}
-    ]
+    st.session_state.messages = session_store.message_log(
+        session_id, [{"role": "system", "content": SYSTEM_PROMPT}])
 
 if "chat_started" not in st.session_state:
     st.session_state.chat_started = False
 
+# Catch up on changes made by the previous run (which may have ended in st.rerun)
+persist_session(session_store, session_id)
+
 # Main App Layout
 tab_chat, tab_json, tab_execute = st.tabs(["🤖 AI Copilot", "📄 JSON Editor", "⚙️ Execute"])
 
@@ -2548,7 +1603,7 @@ Let's start: **What is your company name and give me a brief overview of what yo
                 else:
                     # Get normal AI response
                     with st.spinner("🤖 Thinking..."):
-                        ai_response = call_llm_api(
+                        ai_response = call_llm_api_with_continuation(
                             st.session_state.messages,
                             selected_model,
                             api_key,
@@ -2575,20 +1630,46 @@ Let's start: **What is your company name and give me a brief overview of what yo
                             llm_feedback = create_validation_feedback_for_llm(validation_results)
                             
                             if llm_feedback:
+                                # Slide-level failures are repaired one slide at a time; a broken
+                                # Content IR still needs the full regeneration round trip
+                                repair_tasks = collect_repair_tasks(validation_results, render_plan)
+                                content_ir_ok = validation_results.get('structure_validation', {}).get('content_ir_structure_valid', True)
+                                
                                 # Show retry button
                                 if st.button("🔄 Auto-Fix Validation Issues", type="primary"):
-                                    # Add feedback message for LLM to fix issues
-                                    st.session_state.messages.append({"role": "user", "content": llm_feedback})
-                                    
-                                    with st.spinner("🔄 Fixing validation issues..."):
-                                        retry_response = call_llm_api(
-                                            st.session_state.messages,
-                                            selected_model,
-                                            api_key,
-                                            api_service
-                                        )
-                                    
-                                    st.session_state.messages.append({"role": "assistant", "content": retry_response})
+                                    if repair_tasks and content_ir_ok:
+                                        with st.spinner(f"🔧 Repairing {len(repair_tasks)} slide(s)..."):
+                                            repair_results = repair_slides(
+                                                repair_tasks,
+                                                lambda repair_messages: call_llm_api_or_raise(repair_messages, selected_model, api_key, api_service),
+                                                templates=load_templates_json(),
+                                                example_plan=EXAMPLES.get('render_plan'),
+                                                content_ir_keys=sorted(content_ir.keys()),
+                                            )
+                                        repaired_plan = merge_repairs(render_plan, repair_results)
+                                        for result in repair_results:
+                                            if result.error:
+                                                st.warning(f"Slide {result.task.index + 1} ({result.task.template}) could not be repaired: {result.error}")
+                                        
+                                        slide_list = ", ".join(str(t.index + 1) for t in repair_tasks)
+                                        st.session_state.messages.append({"role": "user", "content": f"🔧 Targeted repair of slide(s) {slide_list}"})
+                                        st.session_state.messages.append({"role": "assistant", "content": (
+                                            "CONTENT IR JSON:\n```json\n" + json.dumps(content_ir, indent=2) + "\n```\n\n"
+                                            "RENDER PLAN JSON:\n```json\n" + json.dumps(repaired_plan, indent=2) + "\n```"
+                                        )})
+                                    else:
+                                        # Add feedback message for LLM to fix issues
+                                        st.session_state.messages.append({"role": "user", "content": llm_feedback})
+                                        
+                                        with st.spinner("🔄 Fixing validation issues..."):
+                                            retry_response = call_llm_api_with_continuation(
+                                                st.session_state.messages,
+                                                selected_model,
+                                                api_key,
+                                                api_service
+                                            )
+                                        
+                                        st.session_state.messages.append({"role": "assistant", "content": retry_response})
                                     st.rerun()
                         
                         # If validation passed, create downloadable files
@@ -2677,7 +1758,7 @@ Please generate both complete JSON structures now with full validation complianc
                         st.session_state.messages.append({"role": "user", "content": completion_prompt})
                         
                         with st.spinner("🎯 Generating downloadable JSON files..."):
-                            completion_response = call_llm_api(
+                            completion_response = call_llm_api_with_continuation(
                                 st.session_state.messages,
                                 selected_model,
                                 api_key,
@@ -2946,7 +2027,7 @@ with tab_execute:
                 is_valid = display_validation_results(validation_results)
                 
                 # Traditional catalog validation (if available)
-                catalog = TemplateCatalog.from_file(templates_path)
+                catalog = load_catalog(templates_path)
                 if HAS_VALIDATORS and not skip_validate:
                     report = validate_render_plan_against_catalog(content_ir, render_plan, catalog)
                     summary = summarize_issues(report)
@@ -2971,6 +2052,11 @@ with tab_execute:
     # Generate deck
     st.markdown("---")
     out_name = st.text_input("Output filename", value="ai_generated_deck.pptx")
+    render_pool = None if os.environ.get("RENDER_SERVICE_URL") else get_render_pool()
+    if render_pool is not None and st.session_state.pop("render_job_id", None):
+        # A rerun interrupted this session's wait loop (e.g. the Cancel button): drop its queued render
+        render_pool.cancel_client(session_id)
+    read_only_charts = st.checkbox("Read-only charts (no embedded Excel workbooks, smaller file)", value=False)
     
     if st.button("🎯 Generate Pitch Deck", type="primary", disabled=(not content_ir or not render_plan)):
         if not Path(templates_path).exists():
@@ -2978,8 +2064,12 @@ with tab_execute:
         elif content_ir is None or render_plan is None:
             st.error("⚠️ Please fix JSON errors first")
         else:
-            # Final validation before generation
-            validation_results = validate_individual_slides(content_ir, render_plan)
+            # Final validation before generation (timed for the Slide Details report)
+            # Memory tracing for the allocation column of the timing tables (render and save only)
+            profiler = RenderProfiler(trace_memory=True)
+            # Overflow checks measure against the same catalog's layout_specs the render uses
+            with profiler.stage("validate"), layout_catalog(templates_path):
+                validation_results = validate_individual_slides(content_ir, render_plan)
             
             if not validation_results['overall_valid']:
                 st.error("🚨 **Cannot generate deck** - Validation failed!")
@@ -2999,25 +2089,86 @@ with tab_execute:
                     # Generate deck
                     # Normalize plan to avoid blank cells / missing fields
 
-                    render_plan = normalize_plan(render_plan)
-
-                    prs, saved_path = execute_plan(
-                        plan=render_plan,
-                        content_ir=content_ir,
-                        templates_path=templates_path,
-                        output_path=out_name,
-                        company_name=company_name,
-                        brand_config=brand_config,
-                        debug=True,
-                    )
+                    with profiler.stage("normalize"):
+                        render_plan = normalize_plan(render_plan)
+                        # Split oversized buyer / conglomerate / transaction lists across continuation slides
+                        render_plan = paginate_plan(render_plan, content_ir=content_ir)
+
+                    service_url = os.environ.get("RENDER_SERVICE_URL")
+                    if service_url:
+                        # Thin client: the render service owns the worker pool and queue
+                        client = RenderServiceClient(
+                            service_url, client_id=st.session_state.setdefault("render_client_id", uuid.uuid4().hex))
+                        try:
+                            deck_bytes, job_status = client.render(
+                                render_plan, content_ir=content_ir, brand_config=brand_config,
+                                company_name=company_name, chart_workbook="omit" if read_only_charts else None,
+                                templates_path=templates_path,
+                                on_status=lambda s: status_text.text(
+                                    f"📄 Rendering slides... (queue position {s['position']})" if s.get("position")
+                                    else "📄 Rendering slides..."),
+                            )
+                        except ServiceBusy as busy:
+                            st.warning(f"⏳ Render service is busy - try again in {busy.retry_after}s ({busy})")
+                            st.stop()
+                        prs = Presentation(io.BytesIO(deck_bytes))
+                        Path(out_name).write_bytes(deck_bytes)
+                        saved_path, render_report = out_name, None
+                    elif render_pool is not None:
+                        # Shared pool: this session's job waits its (fair) turn behind other sessions
+                        try:
+                            job_id, _ = render_pool.submit(
+                                {"render_plan": render_plan, "content_ir": content_ir, "brand_config": brand_config,
+                                 "company_name": company_name, "templates_path": templates_path},
+                                client_id=session_id, chart_workbook="omit" if read_only_charts else None)
+                        except QueueFull as busy:
+                            progress_bar.empty()
+                            status_text.empty()
+                            st.warning(f"⏳ All render workers are busy - try again in {busy.retry_after}s ({busy})")
+                            st.stop()
+                        st.session_state["render_job_id"] = job_id
+                        st.button("✖️ Cancel render", key="cancel_render")
+                        while True:
+                            job_status = render_pool.status(job_id)
+                            if job_status["state"] == QUEUED and job_status.get("position"):
+                                status_text.text(f"⏳ Waiting for a render worker: position {job_status['position']} "
+                                                 f"in queue (about {job_status.get('eta_s', 0):.0f}s)")
+                                progress_bar.progress(10)
+                            elif job_status["state"] not in (QUEUED, DONE, CANCELLED):
+                                status_text.text("📄 Rendering slides...")
+                                progress_bar.progress(40)
+                            else:
+                                break
+                            time.sleep(0.3)
+                        st.session_state.pop("render_job_id", None)
+                        record = job_status.get("record") or {}
+                        if job_status["state"] != DONE:
+                            raise RuntimeError(record.get("error") or f"Render job {job_status['state']}")
+                        shutil.copyfile(render_pool.result_path(job_id), out_name)
+                        prs, saved_path = Presentation(out_name), out_name
+                        render_report = RenderReport.from_dict(record["report"])
+                        render_report.stages[:0] = profiler.report.stages
+                    else:
+                        prs, saved_path = execute_plan(
+                            plan=render_plan,
+                            content_ir=content_ir,
+                            templates_path=templates_path,
+                            output_path=out_name,
+                            company_name=company_name,
+                            brand_config=brand_config,
+                            chart_workbook="omit" if read_only_charts else None,
+                            profiler=profiler,
+                            optimize=True,
+                            debug=True,
+                        )
+                        render_report = profiler.report
                     
                     progress_bar.progress(75)
                     status_text.text("💾 Preparing download...")
                     
-                    # Prepare download
-                    buf = io.BytesIO()
-                    prs.save(buf)
-                    buf.seek(0)
+                    # Prepare download: the optimized deck is already on disk, so stream it from there
+                    if not Path(saved_path).exists():
+                        save_optimized(prs, saved_path)
                     
                     progress_bar.progress(100)
                     status_text.text("✅ Deck generated successfully!")
@@ -3037,14 +2188,44 @@ with tab_execute:
                         with st.expander("📋 Slide Details"):
                             for i, slide_type in enumerate(slide_types, 1):
                                 st.write(f"{i}. {slide_type}")
-                    
-                    # Download button
+                            
+                            if render_report is not None:
+                                st.write(f"**⏱️ Render timing** ({render_report.total_seconds:.2f}s total)")
+                                st.dataframe(pd.DataFrame([vars(stage) for stage in render_report.stages]),
+                                             hide_index=True)
+                                st.write("**By template** (slowest first)")
+                                st.dataframe(pd.DataFrame(render_report.by_template()), hide_index=True)
+                                st.write("**By slide**")
+                                st.dataframe(pd.DataFrame([vars(timing) for timing in render_report.slides]),
+                                             hide_index=True)
+
+                    # Thumbnails (cached per slide content, so unchanged slides are not redrawn)
+                    with st.expander("🖼️ Slide Previews", expanded=True):
+                        previews = deck_previews(prs)
+                        preview_cols = st.columns(3)
+                        for i, png in enumerate(previews):
+                            with preview_cols[i % 3]:
+                                st.image(png, caption=f"Slide {i + 1}")
+
+                    # Download buttons
+                    with open(saved_path, "rb") as deck_file:
+                        st.download_button(
+                            "⬇️ Download Your AI-Generated Pitch Deck",
+                            data=deck_file,
+                            file_name=out_name,
+                            mime="application/vnd.openxmlformats-officedocument.presentationml.presentation",
+                            type="primary"
+                        )
+                    # Deck plus its inputs and render report in one archive. st.download_button
+                    # needs the whole archive in memory; iter_bundle is the bounded-memory path
+                    bundle_buf = io.BytesIO()
+                    write_bundle(bundle_buf, deck_bundle_members(
+                        content_ir, render_plan, brand_config, render_report, saved_path, company_name))
                     st.download_button(
-                        "⬇️ Download Your AI-Generated Pitch Deck",
-                        data=buf,
-                        file_name=out_name,
-                        mime="application/vnd.openxmlformats-officedocument.presentationml.presentation",
-                        type="primary"
+                        "📦 Download Bundle (deck + JSON + render report)",
+                        data=bundle_buf.getvalue(),
+                        file_name=f"{Path(out_name).stem}_bundle.zip",
+                        mime="application/zip",
                     )
                     
                     progress_bar.empty()
@@ -3054,6 +2235,8 @@ with tab_execute:
                     st.error(f"⚠️ Error generating deck: {str(e)}")
                     st.exception(e)
 
+persist_session(session_store, session_id)
+
 # Footer
 st.markdown("---")
 st.markdown("""
@@ -0,0 +1,283 @@
+"""
+batch_render.py
+Headless batch rendering across a process pool with a resumable manifest.
+A job is one deck: a render plan plus optional content IR, brand config and
+company name. Jobs come from:
+  - a directory: each sub-directory holding render_plan.json (and optionally
+    content_ir.json, brand_config.json), or each *.json file holding a job object
+  - a JSONL file (or "-" for stdin): one job object per line
+A job object is {"id", "render_plan", "content_ir", "brand_config", "company_name",
+"templates_path"}; a bare plan ({"slides": [...]}) is accepted too. templates_path
+picks the catalog whose layout_specs drive slide geometry (default: the bundled one).
+
+Workers are started once and warmed (renderers imported, fonts measured) before
+taking jobs. Every finished job is appended to <out>/manifest.jsonl with its
+output path, output hash, timings and error; on restart, jobs whose inputs are
+unchanged and whose output still exists are skipped.
+
+    python batch_render.py jobs/ --out decks/ --workers 4
+    python batch_render.py refresh.jsonl --out decks/ --chart-workbook omit
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, fields
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from brand_codec import brand_from_json, brand_to_json
+
+MANIFEST_NAME = "manifest.jsonl"
+STATUS_OK = "ok"
+STATUS_ERROR = "error"
+
+
+@dataclass
+class RenderJob:
+    job_id: str
+    render_plan: Dict[str, Any]
+    content_ir: Optional[Dict[str, Any]] = None
+    brand_config: Optional[Dict[str, Any]] = None
+    company_name: str = "Moelis"
+    templates_path: Optional[str] = None
+
+    def input_hash(self) -> str:
+        inputs = [self.render_plan, self.content_ir, self.brand_config, self.company_name]
+        if self.templates_path:
+            # Only when set, so manifests from before the field keep matching
+            inputs.append(self.templates_path)
+        payload = json.dumps(inputs, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The job as worker arguments; brand colours go as hex, since RGBColor does not pickle."""
+        job = {f.name: getattr(self, f.name) for f in fields(self)}
+        job["brand_config"] = brand_to_json(self.brand_config)
+        return job
+
+    def output_name(self) -> str:
+        safe = re.sub(r"[^A-Za-z0-9._-]+", "_", self.job_id).strip("_.")
+        if safe != self.job_id:
+            # Sanitising is lossy ("Acme Q3" / "Acme_Q3"): tag the name with a hash of the raw id
+            safe = f"{safe or 'job'}-{hashlib.sha1(self.job_id.encode('utf-8')).hexdigest()[:8]}"
+        return safe + ".pptx"
+
+
+def _job_from_object(obj: Dict[str, Any], default_id: str) -> RenderJob:
+    if "slides" in obj and "render_plan" not in obj:
+        obj = {"render_plan": obj}
+    plan = obj.get("render_plan") or obj.get("plan")
+    if not isinstance(plan, dict):
+        raise ValueError(f"Job '{default_id}' has no render_plan")
+    return RenderJob(
+        job_id=str(obj.get("id") or obj.get("job_id") or default_id),
+        render_plan=plan,
+        content_ir=obj.get("content_ir"),
+        brand_config=brand_from_json(obj.get("brand_config")),
+        company_name=obj.get("company_name") or "Moelis",
+        templates_path=obj.get("templates_path"),
+    )
+
+
+def _read_json(path: Path) -> Any:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _iter_jsonl(lines, origin: str) -> Iterator[RenderJob]:
+    for line_no, line in enumerate(lines, start=1):
+        if line.strip():
+            yield _job_from_object(json.loads(line), f"{origin}-{line_no}")
+
+
+def iter_jobs(source: str) -> Iterator[RenderJob]:
+    """Yield jobs from a directory, a JSONL file or stdin ("-")."""
+    if source == "-":
+        yield from _iter_jsonl(sys.stdin, "stdin")
+    elif Path(source).is_dir():
+        for entry in sorted(Path(source).iterdir()):
+            if entry.is_dir() and (entry / "render_plan.json").exists():
+                obj = {"id": entry.name, "render_plan": _read_json(entry / "render_plan.json")}
+                for key in ("content_ir", "brand_config"):
+                    if (entry / f"{key}.json").exists():
+                        obj[key] = _read_json(entry / f"{key}.json")
+                yield _job_from_object(obj, entry.name)
+            elif entry.suffix == ".json" and entry.is_file():
+                yield _job_from_object(_read_json(entry), entry.stem)
+    else:
+        with open(source, "r", encoding="utf-8") as f:
+            yield from _iter_jsonl(f, Path(source).stem)
+
+
+def load_manifest(out_dir: Path) -> Dict[str, Dict[str, Any]]:
+    """Latest manifest record per job id."""
+    records: Dict[str, Dict[str, Any]] = {}
+    path = out_dir / MANIFEST_NAME
+    if path.exists():
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue    # a line cut short by an interrupted run
+                records[record.get("job_id")] = record
+    return records
+
+
+def is_done(job: RenderJob, record: Optional[Dict[str, Any]]) -> bool:
+    return bool(
+        record
+        and record.get("status") == STATUS_OK
+        and record.get("input_hash") == job.input_hash()
+        and record.get("output")
+        and Path(record["output"]).exists()
+    )
+
+
+def _warm_worker() -> None:
+    """Import the renderers and build the default font tables once per worker process."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        import executor  # noqa: F401
+        from text_metrics import advance_table
+        advance_table("Arial")
+        advance_table("Arial", True)
+
+
+def render_job(job: Dict[str, Any], out_dir: str, chart_workbook: Optional[str] = None,
+               include_report: bool = False) -> Dict[str, Any]:
+    """
+    Render one job (given as a dict so it pickles cheaply) and return its manifest record.
+    include_report adds the full RenderReport (per-slide timings and, since it turns on
+    memory tracing, allocation deltas) as "report".
+    """
+    import executor
+    from adapters import error_slides
+    from render_profile import RenderProfiler
+    from pagination import paginate_plan
+
+    job_obj = RenderJob(**{**job, "brand_config": brand_from_json(job.get("brand_config"))})
+    output = str(Path(out_dir) / job_obj.output_name())
+    record: Dict[str, Any] = {
+        "job_id": job_obj.job_id,
+        "input_hash": job_obj.input_hash(),
+        "output": output,
+        "pid": os.getpid(),
+    }
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            plan = paginate_plan(job_obj.render_plan, content_ir=job_obj.content_ir)
+            profiler = RenderProfiler(trace_memory=include_report)
+            prs, saved_path = executor.execute_plan(
+                plan=plan,
+                content_ir=job_obj.content_ir,
+                out_path=output,
+                company_name=job_obj.company_name,
+                brand_config=job_obj.brand_config,
+                chart_workbook=chart_workbook,
+                templates_path=job_obj.templates_path,
+                profiler=profiler,
+                optimize=True,
+            )
+        if saved_path != output:
+            raise RuntimeError(f"Deck could not be saved to {output}")
+        blob = Path(output).read_bytes()
+        record.update(
+            status=STATUS_OK,
+            slides=len(prs.slides),
+            output_sha1=hashlib.sha1(blob).hexdigest(),
+            output_bytes=len(blob),
+            stages={stage.name: stage.seconds for stage in profiler.report.stages},
+        )
+        if include_report:
+            record["report"] = profiler.report.to_dict()
+        failed = error_slides(prs)
+        if failed:
+            # The deck is kept for inspection, but the job is not done
+            record.update(status=STATUS_ERROR, error_slides=failed,
+                          error=f"Renderer failed on slide(s) {', '.join(map(str, failed))}")
+    except Exception as e:
+        record.update(status=STATUS_ERROR, error=f"{type(e).__name__}: {e}")
+    record["seconds"] = round(time.perf_counter() - start, 4)
+    record["finished_at"] = datetime.now().isoformat(timespec="seconds")
+    return record
+
+
+def run_batch(
+    source: str,
+    out_dir: str,
+    workers: Optional[int] = None,
+    chart_workbook: Optional[str] = None,
+    force: bool = False,
+) -> Dict[str, int]:
+    """Render every pending job in `source`; returns counts of ok / error / skipped jobs."""
+    out_path = Path(out_dir)
+    out_path.mkdir(parents=True, exist_ok=True)
+    manifest = load_manifest(out_path)
+    counts = {"ok": 0, "error": 0, "skipped": 0}
+
+    pending: List[RenderJob] = []
+    seen = set()
+    outputs: Dict[str, str] = {}
+    for job in iter_jobs(source):
+        if job.job_id in seen:
+            raise ValueError(f"Duplicate job id '{job.job_id}'")
+        seen.add(job.job_id)
+        # Case-insensitive, since some filesystems are
+        other = outputs.setdefault(job.output_name().lower(), job.job_id)
+        if other != job.job_id:
+            raise ValueError(f"Job ids '{other}' and '{job.job_id}' would both write {job.output_name()}")
+        if not force and is_done(job, manifest.get(job.job_id)):
+            counts["skipped"] += 1
+        else:
+            pending.append(job)
+    print(f"[DEBUG] Batch: {len(pending)} jobs to render, {counts['skipped']} already done")
+    if not pending:
+        return counts
+
+    workers = workers or min(len(pending), os.cpu_count() or 1)
+    with open(out_path / MANIFEST_NAME, "a", encoding="utf-8") as manifest_file, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_warm_worker) as pool:
+        futures = {pool.submit(render_job, job.to_dict(), str(out_path), chart_workbook): job for job in pending}
+        for done, future in enumerate(as_completed(futures), start=1):
+            job = futures[future]
+            try:
+                record = future.result()
+            except Exception as e:     # the worker process itself died
+                record = {"job_id": job.job_id, "input_hash": job.input_hash(), "status": STATUS_ERROR,
+                          "error": f"{type(e).__name__}: {e}",
+                          "finished_at": datetime.now().isoformat(timespec="seconds")}
+            manifest_file.write(json.dumps(record) + "\n")
+            manifest_file.flush()
+            counts[record["status"]] += 1
+            detail = f"{record.get('seconds', 0):.2f}s" if record["status"] == STATUS_OK else record.get("error")
+            print(f"[DEBUG] Batch [{done}/{len(pending)}] {job.job_id}: {record['status']} ({detail})")
+    return counts
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Render many decks across a process pool")
+    parser.add_argument("source", help="job directory, JSONL file, or - for JSONL on stdin")
+    parser.add_argument("--out", default="batch_output", help="output directory (holds manifest.jsonl)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chart-workbook", choices=["embedded", "omit"], default=None)
+    parser.add_argument("--force", action="store_true", help="re-render jobs that are already done")
+    args = parser.parse_args(argv)
+
+    counts = run_batch(args.source, args.out, args.workers, args.chart_workbook, args.force)
+    print(f"[DEBUG] Batch finished: {counts['ok']} ok, {counts['error']} failed, {counts['skipped']} skipped")
+    return 1 if counts["error"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
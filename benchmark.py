@@ -0,0 +1,307 @@
+"""
+benchmark.py
+Renderer benchmark suite.
+Builds synthetic render plans from complete_render_plan.json, scaled by slide
+count, table rows, bullets per profile and chart points, and measures
+adapters.render_plan_to_pptx per template and per deck size: wall time
+(render and save separately), peak traced memory and output size. Each plan gets
+one cold run with every module-level render cache cleared (cold_*) and the median
+of `repeat` warm runs after it, since repeats of the same plan are mostly cache
+hits. Results are written as JSON so runs can be compared across commits.
+
+    python benchmark.py --sizes 14 56 --rows 10 --bullets 6 --points 12 --out bench.json
+    python benchmark.py --compare bench_before.json bench_after.json --metric cold_render_s
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import copy
+import io
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import adapters
+import catalog_loader
+import chart_cache
+import chart_styles
+import financial_metrics
+import layout_engine
+import plan_refs
+import precedent_analytics
+import table_builder
+import text_metrics
+
+SEED_PLAN = Path(__file__).with_name("complete_render_plan.json")
+
+# Row-list slots per template; tables given as lists of lists keep their header row
+ROW_PATHS = {
+    "buyer_profiles": ["table_rows"],
+    "precedent_transactions": ["transactions"],
+    "valuation_overview": ["valuation_data"],
+    "competitive_positioning": ["assessment"],
+    "product_service_footprint": ["coverage_table"],
+    "investor_considerations": ["considerations", "mitigants"],
+}
+
+# Chart series: (categories path, [value paths]) relative to the slide data
+CHART_PATHS = {
+    "historical_financial_performance": ("chart.categories", ["chart.revenue", "chart.ebitda"]),
+    "margin_cost_resilience": ("chart_data.categories", ["chart_data.values"]),
+    "growth_strategy_projections": ("slide_data.financial_projections.categories",
+                                    ["slide_data.financial_projections.revenue",
+                                     "slide_data.financial_projections.ebitda"]),
+}
+
+
+def load_seed_plan(path: Path = SEED_PLAN) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _get(node: Any, path: str) -> Any:
+    for key in path.split("."):
+        if not isinstance(node, dict):
+            return None
+        node = node.get(key)
+    return node
+
+
+def _set(node: Dict[str, Any], path: str, value: Any) -> None:
+    keys = path.split(".")
+    for key in keys[:-1]:
+        node = node.setdefault(key, {})
+    node[keys[-1]] = value
+
+
+def _cycle(items: List[Any], n: int, keep_header: bool = False) -> List[Any]:
+    """Repeat `items` up to length n (the header row of a list-of-lists table stays first)."""
+    if not items or n is None:
+        return items
+    header, body = ([items[0]], items[1:]) if keep_header and len(items) > 1 else ([], items)
+    return header + [copy.deepcopy(body[i % len(body)]) for i in range(n)]
+
+
+def _extend_series(categories: List[Any], series: List[List[float]], n: int, rng: random.Random):
+    """Extend (or cut) chart categories and values to n points with a seeded random walk."""
+    categories = list(categories or [])
+    series = [list(values or []) for values in series]
+    while len(categories) < n:
+        last = str(categories[-1]) if categories else "2020"
+        digits = "".join(ch for ch in last if ch.isdigit())
+        suffix = "E" if last.endswith("E") else ""
+        categories.append(f"{int(digits) + 1}{suffix}" if digits else f"P{len(categories) + 1}")
+        for values in series:
+            prev = values[-1] if values else 10.0
+            values.append(round(prev * (1 + rng.uniform(-0.05, 0.12)), 1))
+    return categories[:n], [values[:n] for values in series]
+
+
+def synthetic_plan(
+    slides: Optional[int] = None,
+    rows: Optional[int] = None,
+    bullets: Optional[int] = None,
+    chart_points: Optional[int] = None,
+    seed: int = 0,
+    base_plan: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    A render plan derived from the seed plan. None keeps the seed's own sizes.
+    slides: total slide count (the seed slides are cycled)
+    rows: rows per table / list slot, bullets: experience bullets per management profile,
+    chart_points: categories per chart.
+    """
+    rng = random.Random(seed)
+    base = base_plan or load_seed_plan()
+    seed_slides = base.get("slides", [])
+    count = slides or len(seed_slides)
+    out = []
+    for i in range(count):
+        slide = copy.deepcopy(seed_slides[i % len(seed_slides)])
+        template = slide.get("template")
+        data = slide.get("data")
+        if template == "sea_conglomerates" and isinstance(data, list):
+            slide["data"] = _cycle(data, rows)
+        elif isinstance(data, dict):
+            for path in ROW_PATHS.get(template, []):
+                items = _get(data, path)
+                if isinstance(items, list):
+                    _set(data, path, _cycle(items, rows, keep_header=bool(items) and isinstance(items[0], list)))
+            if template == "management_team" and bullets is not None:
+                for column in ("left_column_profiles", "right_column_profiles"):
+                    for profile in data.get(column, []):
+                        profile["experience_bullets"] = _cycle(profile.get("experience_bullets", []), bullets)
+            if template in CHART_PATHS and chart_points:
+                cat_path, value_paths = CHART_PATHS[template]
+                categories, series = _extend_series(
+                    _get(data, cat_path), [_get(data, p) for p in value_paths], chart_points, rng)
+                _set(data, cat_path, categories)
+                for path, values in zip(value_paths, series):
+                    _set(data, path, values)
+            if template == "competitive_positioning" and chart_points:
+                data["competitors"] = _cycle(data.get("competitors", []), chart_points)
+        out.append(slide)
+    return {"slides": out}
+
+
+def _render(plan: Dict[str, Any]):
+    # Renderers log heavily; keep their output out of the measurements
+    with contextlib.redirect_stdout(io.StringIO()):
+        return adapters.render_plan_to_pptx(plan=plan)
+
+
+def clear_render_caches() -> None:
+    """Empty every module-level cache the render path fills, so the next render runs cold."""
+    for cache in (chart_cache._blob_cache, financial_metrics._cache, precedent_analytics._cache,
+                  plan_refs._resolvers):
+        cache.clear()
+    for fn in (chart_styles.compile_chart_style, chart_styles._fragment, table_builder._compile_style,
+               text_metrics._font_files, text_metrics.load_font, text_metrics.advance_table,
+               text_metrics.wrap_lines, text_metrics._fit, catalog_loader._load_cached,
+               layout_engine._engine_for):
+        fn.cache_clear()
+
+
+def _timed_run(plan: Dict[str, Any]):
+    start = time.perf_counter()
+    prs = _render(plan)
+    mid = time.perf_counter()
+    buf = io.BytesIO()
+    prs.save(buf)
+    return mid - start, time.perf_counter() - mid, buf.tell()
+
+
+def measure_plan(plan: Dict[str, Any], repeat: int = 3) -> Dict[str, Any]:
+    """
+    One cold render/save (caches cleared first), the median of `repeat` warm runs,
+    and one traced cold run for peak memory.
+    """
+    clear_render_caches()
+    cold_render, cold_save, size = _timed_run(plan)
+    render_times, save_times = [], []
+    for _ in range(max(1, repeat)):
+        render_s, save_s, size = _timed_run(plan)
+        render_times.append(render_s)
+        save_times.append(save_s)
+    clear_render_caches()
+    tracemalloc.start()
+    try:
+        _render(plan).save(io.BytesIO())
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "slides": len(plan.get("slides", [])),
+        "cold_render_s": round(cold_render, 5),
+        "cold_wall_s": round(cold_render + cold_save, 5),
+        "render_s": round(statistics.median(render_times), 5),
+        "save_s": round(statistics.median(save_times), 5),
+        "wall_s": round(statistics.median(r + s for r, s in zip(render_times, save_times)), 5),
+        "peak_mem_kb": round(peak / 1024, 1),
+        "output_kb": round(size / 1024, 1),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=Path(__file__).parent, timeout=10).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def run_benchmarks(
+    sizes: List[int],
+    rows: Optional[int] = None,
+    bullets: Optional[int] = None,
+    chart_points: Optional[int] = None,
+    repeat: int = 3,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """Per-template results (one slide of each template) and per-deck-size results."""
+    base = load_seed_plan()
+    params = {"rows": rows, "bullets": bullets, "chart_points": chart_points, "repeat": repeat, "seed": seed}
+    scaled = synthetic_plan(rows=rows, bullets=bullets, chart_points=chart_points, seed=seed, base_plan=base)
+
+    templates: Dict[str, Any] = {}
+    for slide in scaled["slides"]:
+        template = slide.get("template")
+        if template in templates or template not in adapters.RENDERER_MAP:
+            continue
+        templates[template] = measure_plan({"slides": [slide]}, repeat)
+        print(f"[DEBUG] bench {template}: {templates[template]['cold_render_s'] * 1000:.1f} ms cold, "
+              f"{templates[template]['render_s'] * 1000:.1f} ms warm")
+
+    decks = []
+    for n in sizes:
+        plan = synthetic_plan(slides=n, rows=rows, bullets=bullets, chart_points=chart_points,
+                              seed=seed, base_plan=base)
+        decks.append(measure_plan(plan, repeat))
+        print(f"[DEBUG] bench deck of {n}: {decks[-1]['cold_wall_s']:.3f} s cold, "
+              f"{decks[-1]['wall_s']:.3f} s warm, {decks[-1]['output_kb']} KB")
+
+    return {
+        "commit": _git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": params,
+        "templates": templates,
+        "decks": decks,
+    }
+
+
+def compare_results(before: Dict[str, Any], after: Dict[str, Any], metric: str = "render_s") -> List[str]:
+    """Human-readable relative change of `metric` per template and per deck size."""
+
+    def delta(a: Optional[float], b: Optional[float]) -> str:
+        if not a or b is None:
+            return "n/a"
+        return f"{(b - a) / a * 100:+.1f}%"
+
+    lines = [f"{metric}: {before.get('commit')} -> {after.get('commit')}"]
+    for template, result in sorted(after.get("templates", {}).items()):
+        old = before.get("templates", {}).get(template, {}).get(metric)
+        lines.append(f"  {template:<34} {old!s:>10} -> {result.get(metric)!s:>10}  {delta(old, result.get(metric))}")
+    old_decks = {d["slides"]: d for d in before.get("decks", [])}
+    for deck in after.get("decks", []):
+        old = old_decks.get(deck["slides"], {}).get(metric)
+        lines.append(f"  deck of {deck['slides']:<26} {old!s:>10} -> {deck.get(metric)!s:>10}  {delta(old, deck.get(metric))}")
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the slide renderers on synthetic plans")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[14, 28, 56], help="deck sizes (slides)")
+    parser.add_argument("--rows", type=int, default=None, help="rows per table/list slot")
+    parser.add_argument("--bullets", type=int, default=None, help="experience bullets per profile")
+    parser.add_argument("--points", type=int, default=None, help="categories per chart")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="benchmark_results.json")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="compare two result files")
+    parser.add_argument("--metric", default="render_s")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        before, after = (json.loads(Path(p).read_text(encoding="utf-8")) for p in args.compare)
+        print("\n".join(compare_results(before, after, args.metric)))
+        return 0
+
+    results = run_benchmarks(args.sizes, args.rows, args.bullets, args.points, args.repeat, args.seed)
+    Path(args.out).write_text(json.dumps(results, indent=2), encoding="utf-8")
+    print(f"[DEBUG] Benchmark results written to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""
+brand_codec.py
+JSON form of a brand config.
+Brand configs hold RGBColor colours (a tuple subclass) and sometimes Pt/Emu
+lengths (an int subclass); plain json.dumps turns them into [r, g, b] lists and
+raw EMU counts that the renderers cannot use. brand_to_json writes colours as
+"#RRGGBB" and font sizes in points; brand_from_json is the decoder every JSON
+entry point (render service, batch jobs, brand fan-out) calls, and also accepts
+[r, g, b] lists, hex strings and the session store's tagged values.
+
+    json.dump(brand_to_json(brand_config), f)
+    brand_config = brand_from_json(json.load(f))
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+from pptx.dml.color import RGBColor
+from pptx.util import Length
+
+EMU_PER_POINT = 12700
+
+
+def _color(value: Any) -> RGBColor:
+    if isinstance(value, RGBColor):
+        return value
+    if isinstance(value, dict) and "__rgb__" in value:
+        value = value["__rgb__"]
+    if isinstance(value, str):
+        hex_value = value.strip().lstrip("#")
+        if len(hex_value) == 6:
+            try:
+                return RGBColor.from_string(hex_value.upper())
+            except ValueError:
+                pass
+    if isinstance(value, (list, tuple)) and len(value) == 3 and all(isinstance(c, int) for c in value):
+        if all(0 <= c <= 255 for c in value):
+            return RGBColor(*value)
+    raise ValueError(f"Invalid brand colour {value!r}: expected '#RRGGBB' or [r, g, b]")
+
+
+def _points(value: Any) -> Any:
+    if isinstance(value, dict) and "__emu__" in value:
+        value = Length(int(value["__emu__"]))
+    if isinstance(value, Length):
+        points = value.pt
+    elif isinstance(value, (int, float)) and not isinstance(value, bool) and value >= EMU_PER_POINT:
+        # A Pt that went through plain json.dumps: EMU, not points
+        points = value / EMU_PER_POINT
+    else:
+        return value
+    return int(points) if float(points).is_integer() else points
+
+
+def brand_to_json(brand_config: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Copy of `brand_config` that survives json.dumps: colours as '#RRGGBB', sizes in points."""
+    if not brand_config:
+        return brand_config
+    out = dict(brand_config)
+    if isinstance(out.get("color_scheme"), dict):
+        out["color_scheme"] = {name: "#" + str(color) if isinstance(color, RGBColor) else color
+                               for name, color in out["color_scheme"].items()}
+    if isinstance(out.get("typography"), dict):
+        out["typography"] = {name: _points(value) if name.endswith("_size") else value
+                             for name, value in out["typography"].items()}
+    return out
+
+
+def brand_from_json(brand_config: Any) -> Optional[Dict[str, Any]]:
+    """A brand config read from JSON with its colours back as RGBColor and sizes in points."""
+    if brand_config is None:
+        return None
+    if not isinstance(brand_config, dict):
+        raise ValueError("Invalid brand_config: expected an object")
+    out = dict(brand_config)
+    colors = out.get("color_scheme")
+    if colors is not None:
+        if not isinstance(colors, dict):
+            raise ValueError("Invalid brand_config: 'color_scheme' must be an object")
+        out["color_scheme"] = {name: _color(color) for name, color in colors.items()}
+    typography = out.get("typography")
+    if typography is not None:
+        if not isinstance(typography, dict):
+            raise ValueError("Invalid brand_config: 'typography' must be an object")
+        out["typography"] = {name: _points(value) if name.endswith("_size") else value
+                             for name, value in typography.items()}
+    return out
@@ -8,6 +8,7 @@ from pptx.util import Pt
 import io
 import json
 import requests
+from llm_cache import llm_post
 from typing import Dict, Optional, Tuple, List
 import logging
 
@@ -389,8 +390,6 @@ Return ONLY the JSON, no additional text."""
     def _call_perplexity_api(self, messages: List[Dict]) -> str:
         """Call Perplexity API - FIXED for message alternation"""
         try:
-            url = "https://api.perplexity.ai/chat/completions"
-            
             # FIX: Ensure proper message alternation for Perplexity
             cleaned_messages = self._build_alternating_messages(messages)
             
@@ -407,7 +406,7 @@ Return ONLY the JSON, no additional text."""
                 "Content-Type": "application/json"
             }
             
-            response = requests.post(url, json=payload, headers=headers)
+            response = llm_post("perplexity", payload, headers)
             
             if response.status_code == 200:
                 result = response.json()
@@ -466,8 +465,6 @@ Return ONLY the JSON, no additional text."""
     def _call_claude_api(self, messages: List[Dict]) -> str:
         """Call Claude API"""
         try:
-            url = "https://api.anthropic.com/v1/messages"
-            
             # Convert messages format for Claude
             claude_messages = []
             system_message = ""
@@ -497,7 +494,7 @@ Return ONLY the JSON, no additional text."""
                 "anthropic-version": "2023-06-01"
             }
             
-            response = requests.post(url, json=payload, headers=headers)
+            response = llm_post("claude", payload, headers)
             
             if response.status_code == 200:
                 result = response.json()
@@ -0,0 +1,198 @@
+"""
+brand_fanout.py
+Render one plan in several brandings without a full render per brand.
+The plan is normalized, validated (the app's checks) and paginated once, then
+laid out once per distinct typography and logo (text fitting depends on font
+metrics and sizes) with a sentinel palette: every brand colour slot gets a
+reserved RGB value. Each brand's deck is produced from that base package by
+substituting the sentinel colours in the slide and chart XML with the brand's
+own colours, across a thread pool.
+
+    decks = render_brand_fanout(plan, {"house": None, "co_advisor": co_advisor_config})
+    python brand_fanout.py plan.json --brand house --brand co_advisor=co_advisor_brand.json --out decks/
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import re
+import sys
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from pptx.dml.color import RGBColor
+
+import adapters
+from brand_codec import brand_from_json
+from chart_cache import chart_workbook_mode
+from pagination import paginate_plan
+from plan_validation import normalize_plan, validate_individual_slides
+from slide_templates import get_brand_styling
+
+# Colour slots get_brand_styling resolves for the renderers
+COLOR_SLOTS = ("primary", "secondary", "accent", "text", "background", "light_grey", "footer_grey")
+FONT_SLOTS = ("primary_font", "title_size", "header_size", "body_size", "small_size")
+
+# Reserved colours, one per slot; nothing in the templates draws with these
+SENTINELS = {slot: "0BAD%02X" % (i + 1) for i, slot in enumerate(COLOR_SLOTS)}
+_SENTINEL_RE = re.compile(rb'val="(0BAD0[1-%d])"' % len(COLOR_SLOTS))
+
+
+@dataclass(frozen=True)
+class BrandStyle:
+    """What a brand changes: the resolved colour per slot (hex), its typography and logo."""
+    colors: Tuple[Tuple[str, str], ...]
+    typography: Tuple[Tuple[str, Any], ...]
+    logo: Any = field(default=None, compare=False)
+    logo_key: Optional[str] = None
+
+    @property
+    def layout(self) -> Tuple[Any, ...]:
+        """Brands with equal layouts share one base render."""
+        return self.typography, self.logo_key
+
+    def substitutions(self) -> Dict[bytes, bytes]:
+        return {SENTINELS[slot].encode(): hex_value.encode() for slot, hex_value in self.colors}
+
+    def sentinel_config(self) -> Dict[str, Any]:
+        """Brand config the base layout is rendered with: this typography, sentinel colours."""
+        return {
+            "color_scheme": {slot: RGBColor.from_string(SENTINELS[slot]) for slot in COLOR_SLOTS},
+            "typography": dict(self.typography),
+            "logo": self.logo,
+        }
+
+
+def resolve_brand(brand_config: Optional[Dict[str, Any]]) -> BrandStyle:
+    """Resolve a brand config exactly as the renderers would (defaults filled in)."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        colors, fonts = get_brand_styling(brand_config)
+    logo = (brand_config or {}).get("logo")
+    return BrandStyle(
+        colors=tuple((slot, str(colors[slot])) for slot in COLOR_SLOTS),
+        typography=tuple((slot, fonts[slot] if slot == "primary_font" else fonts[slot].pt) for slot in FONT_SLOTS),
+        logo=logo,
+        logo_key=None if logo is None else (
+            str(Path(logo).resolve()) if isinstance(logo, (str, Path)) else hashlib.sha1(bytes(logo)).hexdigest()),
+    )
+
+
+def _render_base(plan: Dict[str, Any], style: BrandStyle, content_ir, company_name: str,
+                 chart_workbook: Optional[str]) -> List[Tuple[zipfile.ZipInfo, bytes]]:
+    """Lay the plan out once with the sentinel palette; returns the package entries."""
+    mode = chart_workbook_mode(chart_workbook) if chart_workbook else contextlib.nullcontext()
+    with mode, contextlib.redirect_stdout(io.StringIO()):
+        prs = adapters.render_plan_to_pptx(plan=plan, content_ir=content_ir, company_name=company_name,
+                                           brand_config=style.sentinel_config())
+    buf = io.BytesIO()
+    prs.save(buf)
+    with zipfile.ZipFile(buf) as zf:
+        return [(info, zf.read(info)) for info in zf.infolist()]
+
+
+def apply_brand(entries: List[Tuple[zipfile.ZipInfo, bytes]], style: BrandStyle) -> bytes:
+    """Write the base package with the sentinel colours swapped for the brand's."""
+    substitutions = style.substitutions()
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as zf:
+        for info, data in entries:
+            if info.filename.endswith(".xml"):
+                data = _SENTINEL_RE.sub(lambda m: b'val="%s"' % substitutions[m.group(1)], data)
+            # A fresh ZipInfo per deck: writestr fills in sizes and CRC, and the base is shared
+            entry = zipfile.ZipInfo(info.filename, info.date_time)
+            entry.external_attr = info.external_attr
+            zf.writestr(entry, data, compress_type=info.compress_type)
+    return out.getvalue()
+
+
+def _check_plan(plan: Dict[str, Any], content_ir: Optional[Dict[str, Any]]) -> None:
+    """The app's pre-render validation; raises ValueError where the app would refuse to render."""
+    results = validate_individual_slides(content_ir, plan)
+    if results["overall_valid"]:
+        return
+    problems = list(results["critical_issues"])
+    for sv in results["slide_validations"]:
+        if not sv["valid"]:
+            found = sv["issues"] + sv["missing_fields"] + sv["empty_fields"]
+            problems.append(f"slide {sv['slide_number']} ({sv['template']}): " + "; ".join(found))
+    raise ValueError("Render plan failed validation: " + " | ".join(problems))
+
+
+def render_brand_fanout(
+    plan: Dict[str, Any],
+    brands: Dict[str, Optional[Dict[str, Any]]],
+    content_ir: Optional[Dict[str, Any]] = None,
+    company_name: str = "Moelis",
+    chart_workbook: Optional[str] = None,
+    workers: Optional[int] = None,
+) -> Dict[str, bytes]:
+    """
+    Render `plan` once per distinct typography/logo and emit one .pptx (as bytes) per brand.
+    `brands` maps a name to a brand config (None for the house style). The plan is
+    normalized and validated as the app does before it renders; ValueError if invalid.
+    """
+    start = time.perf_counter()
+    plan = normalize_plan(plan)
+    _check_plan(plan, content_ir)
+    plan = paginate_plan(plan, content_ir=content_ir)
+    styles = {name: resolve_brand(config) for name, config in brands.items()}
+
+    bases: Dict[Tuple[Any, ...], List[Tuple[zipfile.ZipInfo, bytes]]] = {}
+    for style in styles.values():
+        if style.layout not in bases:
+            bases[style.layout] = _render_base(plan, style, content_ir, company_name, chart_workbook)
+    layout_s = time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=workers or min(len(styles), 8) or 1) as pool:
+        futures = {name: pool.submit(apply_brand, bases[style.layout], style) for name, style in styles.items()}
+        decks = {name: future.result() for name, future in futures.items()}
+    print(f"[DEBUG] Brand fan-out: {len(decks)} decks from {len(bases)} layouts "
+          f"({layout_s:.2f}s layout, {time.perf_counter() - start - layout_s:.2f}s branding)")
+    return decks
+
+
+def _parse_brand(arg: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """NAME (house style) or NAME=brand_config.json."""
+    name, _, path = arg.partition("=")
+    if not path:
+        return name, None
+    with open(path, "r", encoding="utf-8") as f:
+        return name, brand_from_json(json.load(f))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Render one plan in several brandings")
+    parser.add_argument("plan", help="render plan JSON")
+    parser.add_argument("--brand", action="append", required=True,
+                        help="NAME for the house style or NAME=brand_config.json (repeatable)")
+    parser.add_argument("--content-ir", default=None)
+    parser.add_argument("--company-name", default="Moelis")
+    parser.add_argument("--chart-workbook", choices=["embedded", "omit"], default=None)
+    parser.add_argument("--out", default="brand_decks")
+    args = parser.parse_args(argv)
+
+    with open(args.plan, "r", encoding="utf-8") as f:
+        plan = json.load(f)
+    content_ir = None
+    if args.content_ir:
+        with open(args.content_ir, "r", encoding="utf-8") as f:
+            content_ir = json.load(f)
+    decks = render_brand_fanout(plan, dict(_parse_brand(b) for b in args.brand), content_ir,
+                                args.company_name, args.chart_workbook)
+    out_dir = Path(args.out)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for name, blob in decks.items():
+        (out_dir / f"{name}.pptx").write_bytes(blob)
+        print(f"[DEBUG] Wrote {out_dir / f'{name}.pptx'} ({len(blob) // 1024} KB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
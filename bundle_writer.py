@@ -0,0 +1,178 @@
+"""
+bundle_writer.py
+Streaming ZIP bundle writer for deck exports.
+A bundle is one archive with the content IR, render plan, brand config, render
+report and the rendered deck. Members are written incrementally from chunk
+generators (JSON via iterencode, files in fixed-size reads). iter_bundle hands
+the archive out as it is produced, so its peak memory stays bounded by the chunk
+size however large the deck is; write_bundle is bounded too when the target is a
+file. Members that are already compressed (.pptx, images, workbooks) are stored
+instead of re-deflated. The brand config is written as brand_codec.brand_to_json
+produces it (hex colours, sizes in points), so a bundle directory can be fed
+straight back to batch_render.
+
+    with open("bundle.zip", "wb") as f:
+        write_bundle(f, deck_bundle_members(content_ir, render_plan, deck_path="deck.pptx"))
+
+    for chunk in iter_bundle(members):      # e.g. an HTTP response body
+        ...
+"""
+from __future__ import annotations
+
+import json
+import time
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, IO, Iterable, Iterator, List, Optional, Union
+
+from brand_codec import brand_to_json
+
+CHUNK_SIZE = 64 * 1024
+STORED_SUFFIXES = (".pptx", ".xlsx", ".docx", ".zip", ".png", ".jpg", ".jpeg", ".gif")
+
+
+@dataclass
+class BundleMember:
+    name: str
+    chunks: Callable[[], Iterable[bytes]]      # called once, when the member is written
+    compress: Optional[bool] = None            # None: decide from the file suffix
+    size: Optional[int] = None                 # uncompressed size, when known up front
+
+    @property
+    def compress_type(self) -> int:
+        compress = self.compress if self.compress is not None else not self.name.lower().endswith(STORED_SUFFIXES)
+        return zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+
+
+def json_chunks(obj: Any, indent: Optional[int] = 2) -> Callable[[], Iterator[bytes]]:
+    """
+    JSON encoded piecewise; objects that are not JSON types become str(obj). RGBColor
+    and Pt/Emu are tuple/int subclasses and would come out as lists and EMU counts,
+    so brand configs go through brand_to_json first.
+    """
+    def chunks() -> Iterator[bytes]:
+        encoder = json.JSONEncoder(indent=indent, default=str, ensure_ascii=False)
+        pending: List[str] = []
+        size = 0
+        for piece in encoder.iterencode(obj):
+            pending.append(piece)
+            size += len(piece)
+            if size >= CHUNK_SIZE:
+                yield "".join(pending).encode("utf-8")
+                pending, size = [], 0
+        if pending:
+            yield "".join(pending).encode("utf-8")
+    return chunks
+
+
+def text_chunks(text: str) -> Callable[[], Iterator[bytes]]:
+    return lambda: iter([text.encode("utf-8")])
+
+
+def file_chunks(path: Union[str, Path], chunk_size: int = CHUNK_SIZE) -> Callable[[], Iterator[bytes]]:
+    def chunks() -> Iterator[bytes]:
+        with open(path, "rb") as f:
+            while True:
+                block = f.read(chunk_size)
+                if not block:
+                    return
+                yield block
+    return chunks
+
+
+def _zip_info(member: BundleMember) -> zipfile.ZipInfo:
+    info = zipfile.ZipInfo(member.name, time.localtime()[:6])
+    info.compress_type = member.compress_type
+    info.external_attr = 0o644 << 16
+    if member.size is not None:
+        info.file_size = member.size        # lets zipfile switch to zip64 for huge members
+    return info
+
+
+def write_bundle(target: Union[str, Path, IO[bytes]], members: Iterable[BundleMember]) -> None:
+    """Write the bundle to a path or a writable binary stream (seekable or not)."""
+    with zipfile.ZipFile(target, "w") as zf:
+        for member in members:
+            with zf.open(_zip_info(member), "w") as dest:
+                for chunk in member.chunks():
+                    dest.write(chunk)
+
+
+class _ChunkSink:
+    """Write-only, non-seekable stream that hands out what has been written so far."""
+
+    def __init__(self):
+        self._parts: List[bytes] = []
+        self._pos = 0
+
+    def write(self, data: bytes) -> int:
+        self._parts.append(bytes(data))
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data, self._parts = b"".join(self._parts), []
+        return data
+
+
+def iter_bundle(members: Iterable[BundleMember]) -> Iterator[bytes]:
+    """Yield the bundle's bytes as they are produced, without holding the archive in memory."""
+    sink = _ChunkSink()
+    # zipfile writes local headers with data descriptors when the stream cannot seek
+    with zipfile.ZipFile(sink, "w") as zf:
+        for member in members:
+            with zf.open(_zip_info(member), "w") as dest:
+                for chunk in member.chunks():
+                    dest.write(chunk)
+                    data = sink.drain()
+                    if data:
+                        yield data
+            yield sink.drain()
+    yield sink.drain()
+
+
+def deck_bundle_members(
+    content_ir: Optional[Dict[str, Any]],
+    render_plan: Optional[Dict[str, Any]],
+    brand_config: Optional[Dict[str, Any]] = None,
+    render_report: Any = None,
+    deck_path: Optional[Union[str, Path]] = None,
+    company_name: str = "company",
+    prefix: str = "",
+) -> List[BundleMember]:
+    """The standard deck export: JSON inputs, brand config, render report, deck and metadata."""
+    members: List[BundleMember] = []
+    files: Dict[str, str] = {}
+
+    def add(key: str, name: str, chunks, size: Optional[int] = None) -> None:
+        files[key] = prefix + name
+        members.append(BundleMember(prefix + name, chunks, size=size))
+
+    if content_ir is not None:
+        add("content_ir", "content_ir.json", json_chunks(content_ir))
+    if render_plan is not None:
+        add("render_plan", "render_plan.json", json_chunks(render_plan))
+    if brand_config:
+        add("brand_config", "brand_config.json", json_chunks(brand_to_json(brand_config)))
+    if render_report is not None:
+        report = render_report.to_dict() if hasattr(render_report, "to_dict") else render_report
+        add("render_report", "render_report.json", json_chunks(report))
+    if deck_path is not None and Path(deck_path).exists():
+        add("deck", Path(deck_path).name, file_chunks(deck_path), Path(deck_path).stat().st_size)
+
+    metadata = {
+        "generated_at": time.strftime("%Y%m%d_%H%M%S"),
+        "company_name": company_name,
+        "files": files,
+        "generator": "AI Deck Builder",
+        "version": "1.1",
+    }
+    members.append(BundleMember(prefix + "metadata.json", json_chunks(metadata)))
+    return members
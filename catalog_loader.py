@@ -1,38 +1,108 @@
-
 # catalog_loader.py (patched to accept {"templates":[...]} as well)
+"""
+Compiled template catalog.
+Each template compiles once into a frozen, slotted TemplateDef with its slot
+names as frozensets (required, optional, chart slots), so plan validation is set
+arithmetic; the catalog also indexes templates by render_fn. load_catalog keeps
+the compiled catalog in-process until the file changes:
+
+    catalog = load_catalog("templates.json")
+    missing = catalog.get("business_overview").missing(slide["data"].keys())
+"""
 from __future__ import annotations
 
 import json
 import os
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Union
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple, Union
 
 PathLike = Union[str, os.PathLike]
 
-@dataclass
+# Slots that carry chart data (a chart_ref in the plan can stand in for them)
+CHART_SLOT_NAMES = frozenset({"chart", "chart_data", "chart_config"})
+
+
+@dataclass(frozen=True, slots=True)
+class ChartFrame:
+    frame_id: str
+    allowed_types: FrozenSet[str]
+
+
+@dataclass(frozen=True, slots=True)
 class TemplateDef:
     id: str
     purpose: str
     render_fn: str
-    required_slots: Dict[str, Any]
-    optional_slots: Dict[str, Any]
-    chart_frames: List[Dict[str, Any]]
+    required: FrozenSet[str]
+    optional: FrozenSet[str]
+    chart_slots: FrozenSet[str]
+    chart_frames: Tuple[ChartFrame, ...]
     validators: Dict[str, Any]
     layout_specs: Dict[str, Any]
     function_signature: Dict[str, Any]
+    known: FrozenSet[str] = frozenset()            # required | optional
+
+    @property
+    def chart_types(self) -> FrozenSet[str]:
+        """Chart types any of the template's frames accepts."""
+        return frozenset().union(*(frame.allowed_types for frame in self.chart_frames))
+
+    def missing(self, present: Iterable[str]) -> FrozenSet[str]:
+        return self.required - frozenset(present)
+
+    def unknown(self, present: Iterable[str]) -> FrozenSet[str]:
+        return frozenset(present) - self.known
+
 
-@dataclass
+def _slot_names(obj: Dict[str, Any], key: str) -> FrozenSet[str]:
+    # templates.json uses "required"/"optional" lists; older catalogs had "*_slots" dicts
+    value = obj.get(key)
+    if value is None:
+        value = obj.get(f"{key}_slots", ())
+    return frozenset(value)
+
+
+def compile_template(obj: Dict[str, Any]) -> TemplateDef:
+    tid = obj.get("id")
+    if not tid:
+        raise ValueError("Template missing 'id'")
+    required = _slot_names(obj, "required")
+    optional = _slot_names(obj, "optional") - required
+    frames = tuple(
+        ChartFrame(str(frame.get("frame_id", "")), frozenset(frame.get("allowed_types", ())))
+        for frame in obj.get("chart_frames", [])
+    )
+    return TemplateDef(
+        id=tid,
+        purpose=obj.get("purpose", ""),
+        render_fn=obj.get("render_fn", ""),
+        required=required,
+        optional=optional,
+        chart_slots=(required | optional) & CHART_SLOT_NAMES,
+        chart_frames=frames,
+        validators=obj.get("validators", {}),
+        layout_specs=obj.get("layout_specs", {}),
+        function_signature=obj.get("function_signature", {}),
+        known=required | optional,
+    )
+
+
+@dataclass(frozen=True)
 class TemplateCatalog:
     templates: Dict[str, TemplateDef]
+    by_render_fn: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
 
     @classmethod
-    def from_file(cls, path: PathLike) -> "TemplateCatalog":
-        path_str = os.fspath(path)
-        ext = os.path.splitext(path_str.lower())[1]
-        if ext not in (".json",):
-            raise ValueError(f"Unsupported catalog file type: {ext}")
-        with open(path_str, "r", encoding="utf-8") as f:
-            data = json.load(f)
+    def from_templates(cls, templates: Iterable[TemplateDef]) -> "TemplateCatalog":
+        by_id = {tpl.id: tpl for tpl in templates}
+        by_render_fn: Dict[str, List[str]] = {}
+        for tpl in by_id.values():
+            by_render_fn.setdefault(tpl.render_fn, []).append(tpl.id)
+        return cls(by_id, {fn: tuple(ids) for fn, ids in by_render_fn.items()})
+
+    @classmethod
+    def from_data(cls, data: Any) -> "TemplateCatalog":
         # Accept several shapes:
         items = None
         if isinstance(data, dict):
@@ -41,26 +111,40 @@ class TemplateCatalog:
             items = data
         if not isinstance(items, list):
             raise ValueError("Invalid templates.json format: expected list or {'slide_templates': [...]} or {'templates': [...]}")
-        templates: Dict[str, TemplateDef] = {}
-        for obj in items:
-            tid = obj.get("id")
-            if not tid:
-                raise ValueError("Template missing 'id'")
-            templates[tid] = TemplateDef(
-                id=tid,
-                purpose=obj.get("purpose",""),
-                render_fn=obj.get("render_fn",""),
-                required_slots=obj.get("required_slots", {}),
-                optional_slots=obj.get("optional_slots", {}),
-                chart_frames=obj.get("chart_frames", []),
-                validators=obj.get("validators", {}),
-                layout_specs=obj.get("layout_specs", {}),
-                function_signature=obj.get("function_signature", {}),
-            )
-        return cls(templates=templates)
+        return cls.from_templates(compile_template(obj) for obj in items)
+
+    @classmethod
+    def from_file(cls, path: PathLike) -> "TemplateCatalog":
+        path_str = os.fspath(path)
+        ext = os.path.splitext(path_str.lower())[1]
+        if ext not in (".json",):
+            raise ValueError(f"Unsupported catalog file type: {ext}")
+        with open(path_str, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls.from_data(data)
 
     def get(self, template_id: str) -> Optional[TemplateDef]:
         return self.templates.get(template_id)
 
+    def for_render_fn(self, render_fn: str) -> Tuple[TemplateDef, ...]:
+        return tuple(self.templates[tid] for tid in self.by_render_fn.get(render_fn, ()))
+
     def __contains__(self, template_id: str) -> bool:
         return template_id in self.templates
+
+    def __iter__(self) -> Iterator[TemplateDef]:
+        return iter(self.templates.values())
+
+    def __len__(self) -> int:
+        return len(self.templates)
+
+
+@lru_cache(maxsize=8)
+def _load_cached(path: str, mtime_ns: int, size: int) -> TemplateCatalog:
+    return TemplateCatalog.from_file(path)
+
+
+def load_catalog(path: PathLike) -> TemplateCatalog:
+    """The compiled catalog for `path`, reused in-process until the file changes."""
+    stat = os.stat(path)
+    return _load_cached(os.fspath(path), stat.st_mtime_ns, stat.st_size)
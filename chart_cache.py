@@ -0,0 +1,105 @@
+"""
+chart_cache.py
+Embedded chart workbook cache and workbook-free chart mode.
+python-pptx builds a fresh Excel workbook for every add_chart call. CachedChartData
+keys the generated xlsx blob on a hash of the categories and series, so identical
+chart data reuses one blob. In "omit" mode no workbook is generated at all and the
+chart keeps only its cached values in the chart XML. The deck still renders, but
+"Edit Data" in PowerPoint has no workbook to open, so it suits read-only decks.
+
+The mode comes from the SLIDE_CHART_WORKBOOK environment variable ("embedded" by
+default) and can be overridden per render with the chart_workbook_mode() context.
+"""
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Iterator
+
+from pptx.chart.data import ChartData
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+
+WORKBOOK_EMBEDDED = "embedded"
+WORKBOOK_OMIT = "omit"
+WORKBOOK_MODES = (WORKBOOK_EMBEDDED, WORKBOOK_OMIT)
+
+_BLOB_CACHE_SIZE = 64
+_blob_cache: "OrderedDict[str, bytes]" = OrderedDict()
+
+
+def _mode_from_env() -> str:
+    mode = os.environ.get("SLIDE_CHART_WORKBOOK", WORKBOOK_EMBEDDED).strip().lower()
+    return mode if mode in WORKBOOK_MODES else WORKBOOK_EMBEDDED
+
+
+_workbook_mode: ContextVar[str] = ContextVar("chart_workbook_mode", default=_mode_from_env())
+
+
+def get_chart_workbook_mode() -> str:
+    return _workbook_mode.get()
+
+
+@contextlib.contextmanager
+def chart_workbook_mode(mode: str) -> Iterator[None]:
+    """Render charts inside the block with the given workbook mode."""
+    if mode not in WORKBOOK_MODES:
+        raise ValueError(f"Unknown chart workbook mode '{mode}' (expected one of {WORKBOOK_MODES})")
+    token = _workbook_mode.set(mode)
+    try:
+        yield
+    finally:
+        _workbook_mode.reset(token)
+
+
+class CachedChartData(ChartData):
+    """ChartData whose xlsx blob is generated once per distinct categories/series content."""
+
+    def cache_key(self) -> str:
+        payload = {
+            "categories": [c.label for c in self.categories],
+            "categories_format": self.categories.number_format,
+            "series": [(s.name, list(s.values), s.number_format) for s in self],
+            "number_format": self.number_format,
+        }
+        blob = json.dumps(payload, default=str, separators=(",", ":"))
+        return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+    @property
+    def xlsx_blob(self) -> bytes:
+        if get_chart_workbook_mode() == WORKBOOK_OMIT:
+            # Placeholder only; strip_chart_workbook() drops the part before save
+            return b""
+        key = self.cache_key()
+        blob = _blob_cache.get(key)
+        if blob is None:
+            blob = _blob_cache[key] = super().xlsx_blob
+            if len(_blob_cache) > _BLOB_CACHE_SIZE:
+                _blob_cache.popitem(last=False)
+        else:
+            _blob_cache.move_to_end(key)
+        return blob
+
+
+def strip_chart_workbook(chart) -> None:
+    """Remove a chart's c:externalData reference and its embedded workbook relationship."""
+    chart_space = chart._chartSpace
+    external = chart_space.externalData
+    if external is None:
+        return
+    chart_part = chart.part
+    chart_space.remove(external)
+    for r_id, rel in list(chart_part.rels.items()):
+        if rel.reltype == RT.PACKAGE:
+            chart_part.drop_rel(r_id)
+
+
+def add_chart(shapes, chart_type, x, y, cx, cy, chart_data):
+    """slide.shapes.add_chart() that honours the current workbook mode."""
+    graphic_frame = shapes.add_chart(chart_type, x, y, cx, cy, chart_data)
+    if get_chart_workbook_mode() == WORKBOOK_OMIT:
+        strip_chart_workbook(graphic_frame.chart)
+    return graphic_frame
@@ -0,0 +1,186 @@
+"""
+chart_styles.py
+Compiled chart styles for the slide renderers.
+Each chart kind is described once (legend, axis fonts, gridlines, series fills,
+lines and markers). For a given brand it is compiled into `c:spPr` / `c:txPr`
+XML fragments that are cached and inserted at series, axis and legend level in
+one operation each. Point-level `c:dPt` entries are only written for points that
+differ from their series (e.g. the highlighted bar), so styling cost no longer
+grows with the number of categories.
+"""
+from __future__ import annotations
+
+import copy
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Tuple
+from xml.sax.saxutils import escape
+
+from pptx.enum.chart import XL_LEGEND_POSITION
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls
+
+_LEGEND_POSITIONS = {
+    "top": XL_LEGEND_POSITION.TOP,
+    "bottom": XL_LEGEND_POSITION.BOTTOM,
+    "right": XL_LEGEND_POSITION.RIGHT,
+}
+
+_EMU_PER_PT = 12700
+
+
+@dataclass(frozen=True)
+class SeriesStyle:
+    """Brand color keys ("primary", "secondary", ...) for one series; None leaves it to the chart default."""
+    fill: Optional[str] = None
+    line: Optional[str] = None
+    line_width: Optional[float] = None      # points
+    marker: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class ChartKind:
+    legend: Optional[str] = None            # "top" / "bottom" / "right"; None hides the legend
+    legend_size: Optional[float] = None
+    axis_size: Optional[float] = None       # tick label size in points; None keeps the default text
+    gridlines: bool = True                  # value gridlines on, category off; False keeps the defaults
+    clear_title: bool = False
+    series: Tuple[SeriesStyle, ...] = ()
+    highlight: Optional[str] = None         # fill for points passed as `highlight_points`
+
+
+CHART_KINDS: Dict[str, ChartKind] = {
+    # Competitive positioning: one bar series, the target company in the accent color
+    "highlight_bar": ChartKind(axis_size=9, clear_title=True,
+                               series=(SeriesStyle(fill="primary"),), highlight="secondary"),
+    # EBITDA margin trend: a single thick line with matching markers
+    "margin_line": ChartKind(axis_size=10, clear_title=True,
+                             series=(SeriesStyle(line="secondary", line_width=3, marker="secondary"),)),
+    # Historical revenue vs EBITDA columns
+    "revenue_ebitda": ChartKind(legend="top", legend_size=10, axis_size=10,
+                                series=(SeriesStyle(fill="primary"), SeriesStyle(fill="secondary"))),
+    # Growth strategy projections
+    "projection_bars": ChartKind(legend="bottom", gridlines=False,
+                                 series=(SeriesStyle(fill="primary"), SeriesStyle(fill="secondary"))),
+}
+
+
+@dataclass(frozen=True)
+class CompiledChartStyle:
+    series_sppr: Tuple[Optional[str], ...]
+    marker_sppr: Tuple[Optional[str], ...]
+    highlight_sppr: Optional[str]
+    axis_txpr: Optional[str]
+    legend_txpr: Optional[str]
+
+
+def _hex(color: Any) -> Optional[str]:
+    if color is None:
+        return None
+    if isinstance(color, str):
+        return color.lstrip("#").upper()[:6]
+    # RGBColor is a tuple subclass
+    return "%02X%02X%02X" % tuple(int(c) for c in color)
+
+
+def _solid(hex_color: str) -> str:
+    return f'<a:solidFill><a:srgbClr val="{hex_color}"/></a:solidFill>'
+
+
+def _sppr(fill: Optional[str], line: Optional[str] = None, line_width: Optional[float] = None) -> Optional[str]:
+    if not (fill or line):
+        return None
+    body = _solid(fill) if fill else ""
+    if line:
+        width = f' w="{int(line_width * _EMU_PER_PT)}"' if line_width else ""
+        body += f"<a:ln{width}>{_solid(line)}</a:ln>"
+    return f"<c:spPr {nsdecls('c', 'a')}>{body}</c:spPr>"
+
+
+def _txpr(size: Optional[float], font_name: Optional[str]) -> Optional[str]:
+    if size is None and not font_name:
+        return None
+    attrs = f' sz="{int(round(size * 100))}"' if size is not None else ""
+    latin = f'<a:latin typeface="{escape(font_name, {chr(34): "&quot;"})}"/>' if font_name else ""
+    return (
+        f"<c:txPr {nsdecls('c', 'a')}><a:bodyPr/><a:lstStyle/>"
+        f"<a:p><a:pPr><a:defRPr{attrs}>{latin}</a:defRPr></a:pPr><a:endParaRPr lang=\"en-US\"/></a:p>"
+        "</c:txPr>"
+    )
+
+
+@lru_cache(maxsize=64)
+def compile_chart_style(kind: str, palette: Tuple[Tuple[str, str], ...], font_name: Optional[str]) -> CompiledChartStyle:
+    """Compile a chart kind for one brand (palette as sorted (key, hex) pairs)."""
+    spec = CHART_KINDS[kind]
+    colors = dict(palette)
+    series_sppr = tuple(
+        _sppr(colors.get(s.fill), colors.get(s.line), s.line_width) for s in spec.series
+    )
+    marker_sppr = tuple(
+        _sppr(colors.get(s.marker), colors.get(s.marker)) if s.marker else None for s in spec.series
+    )
+    return CompiledChartStyle(
+        series_sppr=series_sppr,
+        marker_sppr=marker_sppr,
+        highlight_sppr=_sppr(colors.get(spec.highlight)) if spec.highlight else None,
+        axis_txpr=_txpr(spec.axis_size, font_name) if spec.axis_size is not None else None,
+        legend_txpr=_txpr(spec.legend_size, None) if spec.legend and spec.legend_size else None,
+    )
+
+
+@lru_cache(maxsize=256)
+def _fragment(xml: str):
+    return parse_xml(xml)
+
+
+def _set_child(parent, xml: Optional[str], tag: str) -> None:
+    """Replace parent's spPr/txPr child with a copy of the compiled fragment."""
+    if xml is None:
+        return
+    getattr(parent, f"_remove_{tag}")()
+    getattr(parent, f"_insert_{tag}")(copy.deepcopy(_fragment(xml)))
+
+
+def _palette(colors: Dict[str, Any]) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((k, _hex(v)) for k, v in colors.items() if v is not None))
+
+
+def apply_chart_style(
+    chart,
+    kind: str,
+    colors: Dict[str, Any],
+    fonts: Optional[Dict[str, Any]] = None,
+    highlight_points: Iterable[int] = (),
+    value_max: Optional[float] = None,
+) -> None:
+    """Style a freshly added chart as `kind` in the given brand colors and fonts."""
+    spec = CHART_KINDS[kind]
+    style = compile_chart_style(kind, _palette(colors), (fonts or {}).get("primary_font"))
+
+    chart.has_legend = spec.legend is not None
+    if spec.legend:
+        chart.legend.position = _LEGEND_POSITIONS[spec.legend]
+        _set_child(chart.legend._element, style.legend_txpr, "txPr")
+    if spec.clear_title:
+        chart.chart_title.has_text_frame = True
+        chart.chart_title.text_frame.clear()
+
+    category_axis, value_axis = chart.category_axis, chart.value_axis
+    if spec.gridlines:
+        category_axis.has_major_gridlines = False
+        value_axis.has_major_gridlines = True
+    _set_child(category_axis._element, style.axis_txpr, "txPr")
+    _set_child(value_axis._element, style.axis_txpr, "txPr")
+    if value_max is not None:
+        value_axis.maximum_scale = value_max
+
+    sers = chart._chartSpace.plotArea.sers
+    for ser, sppr, marker_sppr in zip(sers, style.series_sppr, style.marker_sppr):
+        _set_child(ser, sppr, "spPr")
+        if marker_sppr:
+            _set_child(ser.get_or_add_marker(), marker_sppr, "spPr")
+
+    if style.highlight_sppr and sers:
+        for idx in highlight_points:
+            _set_child(sers[0].get_or_add_dPt_for_point(idx), style.highlight_sppr, "spPr")
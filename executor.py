@@ -4,17 +4,21 @@ Orchestrates reading a plan (or content/content_ir), calls adapters.render_plan_
 and optionally saves to disk. Returns both presentation and save path for compatibility.
 Now supports brand configuration.
 """
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, Optional
 from pathlib import Path
 try:
     from pptx import Presentation  # type: ignore
 except Exception:
     Presentation = None  # type: ignore
 
+import contextlib
 import importlib
 
 # Local import (must be importable from working dir)
 adapters = importlib.import_module("adapters")
+from chart_cache import chart_workbook_mode
+from render_profile import RenderProfiler
+from package_optimizer import save_optimized
 
 def _ensure_prs(prs=None):
     """Return a python-pptx Presentation or create a new one."""
@@ -34,8 +38,12 @@ def execute_plan(
     deck_path: Optional[str] = None,
     company_name: str = "Moelis",
     brand_config: Optional[Dict] = None,  # NEW: Brand configuration
+    chart_workbook: Optional[str] = None,
+    profiler: Optional[RenderProfiler] = None,
+    optimize: bool = False,
+    templates_path: Optional[str] = None,
     **_ignore_kwargs,
-) -> Tuple[Any, str]:
+):
     """
     Build a deck from a plan/content/content_ir and return the pptx.Presentation and save path.
     If out_path/output_path/deck_path is provided, save the deck there.
@@ -49,6 +57,15 @@ def execute_plan(
         out_path/output_path/deck_path: Save path for the presentation
         company_name: Company name for footer
         brand_config: Brand configuration extracted from uploaded deck
+        chart_workbook: "embedded" (default) or "omit" to skip chart workbooks for read-only
+            decks; None uses the SLIDE_CHART_WORKBOOK environment setting
+        profiler: RenderProfiler that times the render and serialize stages and every
+            renderer call (e.g. one already holding the caller's normalize/validate
+            stages); read the timings from profiler.report afterwards
+        optimize: Prune unused layouts/parts and minify the package when saving
+            (see package_optimizer.py)
+        templates_path: Catalog whose layout_specs drive slide geometry (default: the
+            bundled templates.json)
     
     Returns:
         Tuple[Presentation, str]: The presentation object and the path where it was saved
@@ -58,36 +75,53 @@ def execute_plan(
     # Determine the save path
     save_path = out_path or output_path or deck_path or "deck.pptx"
 
-    prs_out = adapters.render_plan_to_pptx(
-        plan=plan, 
-        content=content, 
-        content_ir=content_ir, 
-        prs=prs_obj, 
-        company_name=company_name,
-        brand_config=brand_config  # Pass brand configuration to adapters
-    )
+    render_stage = profiler.stage("render") if profiler else contextlib.nullcontext()
+    serialize_stage = profiler.stage("serialize") if profiler else contextlib.nullcontext()
 
-    # Save if path is provided
-    if save_path:
-        save_path = str(save_path)
-        try:
-            Path(save_path).parent.mkdir(parents=True, exist_ok=True)
-            prs_out.save(save_path)
-        except Exception as e:
-            # Fallback to current directory if save fails
-            fallback_path = "deck.pptx"
-            try:
-                prs_out.save(fallback_path)
-                save_path = fallback_path
-            except Exception as e2:
-                print(f"Failed to save to both {save_path} and {fallback_path}: {e2}")
-                save_path = "failed_to_save.pptx"
+    # Entering the profiler runs its memory tracing (trace_memory=True) over render and save
+    with profiler or contextlib.nullcontext():
+        mode = chart_workbook_mode(chart_workbook) if chart_workbook else contextlib.nullcontext()
+        with mode, render_stage:
+            prs_out = adapters.render_plan_to_pptx(
+                plan=plan, 
+                content=content, 
+                content_ir=content_ir, 
+                prs=prs_obj, 
+                company_name=company_name,
+                brand_config=brand_config,  # Pass brand configuration to adapters
+                profiler=profiler,
+                templates_path=templates_path,
+            )
+
+        # Save if path is provided
+        if save_path:
+            with serialize_stage:
+                save_path = str(save_path)
+                try:
+                    Path(save_path).parent.mkdir(parents=True, exist_ok=True)
+                    if optimize:
+                        save_optimized(prs_out, save_path)
+                    else:
+                        prs_out.save(save_path)
+                except Exception as e:
+                    # Fallback to current directory if save fails
+                    fallback_path = "deck.pptx"
+                    try:
+                        prs_out.save(fallback_path)
+                        save_path = fallback_path
+                    except Exception as e2:
+                        print(f"Failed to save to both {save_path} and {fallback_path}: {e2}")
+                        save_path = "failed_to_save.pptx"
 
     return prs_out, save_path
 
 # Convenience for CLI/manual testing
 if __name__ == "__main__":
     import json, sys
+    # A job directory or JSONL stream is rendered by the batch runner (see batch_render.py)
+    if len(sys.argv) > 1 and (Path(sys.argv[1]).is_dir() or sys.argv[1] == "-" or sys.argv[1].endswith(".jsonl")):
+        import batch_render
+        sys.exit(batch_render.main(sys.argv[1:]))
     input_json = None
     if len(sys.argv) > 1:
         with open(sys.argv[1], "r", encoding="utf-8") as f:
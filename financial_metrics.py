@@ -0,0 +1,234 @@
+"""
+financial_metrics.py
+Derived-metrics engine for the Content IR financial facts.
+Computes margins, YoY growth and CAGRs vectorized from the base series in
+content_ir["facts"] (years, revenue_usd_m, ebitda_usd_m) once per facts block,
+cached by a hash of the facts, and fills the chart and metric fields of the
+historical_financial_performance, margin_cost_resilience and
+growth_strategy_projections slides when the plan leaves them out.
+"""
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+DERIVED_TEMPLATES = (
+    "historical_financial_performance",
+    "margin_cost_resilience",
+    "growth_strategy_projections",
+)
+
+# Reported margins may be rounded to one decimal place by the LLM
+MARGIN_TOLERANCE_PCT = 0.15
+
+_CACHE_SIZE = 16
+_cache: "OrderedDict[str, Optional[FinancialMetrics]]" = OrderedDict()
+
+
+@dataclass
+class FinancialMetrics:
+    years: List[str]
+    revenue: np.ndarray
+    ebitda: np.ndarray
+    margins: np.ndarray                    # EBITDA / revenue, in percent
+    revenue_growth: np.ndarray             # YoY percent, NaN for the first year
+    ebitda_growth: np.ndarray
+    revenue_cagr: Optional[float]          # percent over the full period
+    ebitda_cagr: Optional[float]
+    reported_margins: Optional[np.ndarray] = None
+
+    @property
+    def projection_idx(self) -> List[int]:
+        """Indexes of the estimate / forecast / projection years (suffixed E, F or P)."""
+        return [i for i, year in enumerate(self.years) if year.upper().endswith(("E", "F", "P"))]
+
+    @property
+    def actual_idx(self) -> int:
+        """Index of the latest actual (non-estimate) year, falling back to the last year."""
+        for i in range(len(self.years) - 1, -1, -1):
+            if not self.years[i].upper().endswith(("E", "F", "P")):
+                return i
+        return len(self.years) - 1
+
+    def margin_mismatches(self) -> List[int]:
+        """Indexes where the reported ebitda_margins disagree with EBITDA / revenue."""
+        if self.reported_margins is None or len(self.reported_margins) != len(self.margins):
+            return []
+        with np.errstate(invalid="ignore"):
+            bad = np.abs(self.reported_margins - self.margins) > MARGIN_TOLERANCE_PCT
+        return np.flatnonzero(bad & ~np.isnan(self.margins)).tolist()
+
+
+def _series(values: Any) -> Optional[np.ndarray]:
+    if not isinstance(values, list) or not values:
+        return None
+    try:
+        return np.array([float(v) for v in values], dtype=float)
+    except (TypeError, ValueError):
+        return None
+
+
+def _cagr(series: np.ndarray) -> Optional[float]:
+    periods = len(series) - 1
+    if periods < 1 or series[0] <= 0 or series[-1] <= 0:
+        return None
+    return float(((series[-1] / series[0]) ** (1.0 / periods) - 1.0) * 100.0)
+
+
+def _yoy(series: np.ndarray) -> np.ndarray:
+    growth = np.full(len(series), np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth[1:] = np.where(series[:-1] != 0, (series[1:] / series[:-1] - 1.0) * 100.0, np.nan)
+    return growth
+
+
+def _facts_key(facts: Dict[str, Any]) -> str:
+    payload = json.dumps(facts, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def compute_metrics(facts: Optional[Dict[str, Any]]) -> Optional[FinancialMetrics]:
+    """
+    Return the derived metrics for a facts block, or None when the base series are
+    missing or of mismatched length. Results are cached by facts hash.
+    """
+    if not isinstance(facts, dict):
+        return None
+    key = _facts_key(facts)
+    if key in _cache:
+        _cache.move_to_end(key)
+        return _cache[key]
+
+    years = facts.get("years")
+    revenue = _series(facts.get("revenue_usd_m"))
+    ebitda = _series(facts.get("ebitda_usd_m"))
+    metrics = None
+    if isinstance(years, list) and revenue is not None and ebitda is not None \
+            and len(years) == len(revenue) == len(ebitda):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            margins = np.where(revenue != 0, ebitda / revenue * 100.0, np.nan)
+        metrics = FinancialMetrics(
+            years=[str(y) for y in years],
+            revenue=revenue,
+            ebitda=ebitda,
+            margins=margins,
+            revenue_growth=_yoy(revenue),
+            ebitda_growth=_yoy(ebitda),
+            revenue_cagr=_cagr(revenue),
+            ebitda_cagr=_cagr(ebitda),
+            reported_margins=_series(facts.get("ebitda_margins")),
+        )
+
+    _cache[key] = metrics
+    if len(_cache) > _CACHE_SIZE:
+        _cache.popitem(last=False)
+    return metrics
+
+
+def _round_list(values: np.ndarray, digits: int = 1) -> List[float]:
+    return [round(float(v), digits) for v in values]
+
+
+def _number_list(values: np.ndarray) -> List[Any]:
+    """Keep whole numbers as ints so chart labels match what the LLM would have written."""
+    return [int(v) if float(v).is_integer() else round(float(v), 2) for v in values]
+
+
+def _key_metric_cards(m: FinancialMetrics) -> List[Dict[str, str]]:
+    i = m.actual_idx
+    year = m.years[i]
+    cards = [{
+        "title": f"Revenue {year}",
+        "value": f"US${m.revenue[i]:,.0f}m",
+        "period": f"FY{year}",
+        "note": f"↗ Up {m.revenue_growth[i]:.0f}% YoY" if i > 0 and not np.isnan(m.revenue_growth[i]) else "",
+    }, {
+        "title": f"EBITDA {year}",
+        "value": f"US${m.ebitda[i]:,.0f}m",
+        "period": f"FY{year}",
+        "note": f"↗ {m.margins[i]:.1f}% margin" + (f", up from {m.margins[i - 1]:.1f}%" if i > 0 else ""),
+    }]
+    span = f"{m.years[0]}–{m.years[-1]}"
+    if m.revenue_cagr is not None:
+        cards.append({"title": "Revenue CAGR", "value": f"{m.revenue_cagr:.1f}%", "period": span, "note": ""})
+    if m.ebitda_cagr is not None:
+        cards.append({"title": "EBITDA CAGR", "value": f"{m.ebitda_cagr:.1f}%", "period": span, "note": ""})
+    return cards
+
+
+def _fill(target: Dict[str, Any], key: str, value: Any) -> None:
+    """Set a field the plan left out or left empty (e.g. "revenue": [])."""
+    if not target.get(key):
+        target[key] = value
+
+
+def apply_derived_metrics(template: str, data: Any, facts: Optional[Dict[str, Any]]) -> Any:
+    """
+    Return a copy of a slide's data with missing or empty financial fields filled from
+    the facts. Non-empty plan fields always win; other templates pass through unchanged.
+    Projections are only ever filled from projection years in the facts.
+    """
+    if template not in DERIVED_TEMPLATES or not isinstance(data, dict):
+        return data
+    m = compute_metrics(facts)
+    if m is None:
+        return data
+
+    data = copy.deepcopy(data)
+    if template == "historical_financial_performance":
+        _fill(data, "chart", {})
+        chart = data["chart"]
+        if isinstance(chart, dict):
+            _fill(chart, "categories", list(m.years))
+            _fill(chart, "revenue", _number_list(m.revenue))
+            _fill(chart, "ebitda", _number_list(m.ebitda))
+        if not data.get("key_metrics"):
+            data["key_metrics"] = {"metrics": _key_metric_cards(m)}
+
+    elif template == "margin_cost_resilience":
+        _fill(data, "chart_data", {})
+        chart_data = data["chart_data"]
+        if isinstance(chart_data, dict):
+            _fill(chart_data, "categories", list(m.years))
+            _fill(chart_data, "values", _round_list(m.margins))
+        _fill(data, "chart_title", f"EBITDA Margin Trend ({m.years[0]}–{m.years[-1]})")
+
+    elif template == "growth_strategy_projections":
+        # Historical actuals never stand in for projections: without projection years
+        # the slot stays empty and validation flags it
+        idx = m.projection_idx
+        slide_data = data.get("slide_data", data)
+        projections = slide_data.get("financial_projections") if isinstance(slide_data, dict) else None
+        if idx and isinstance(slide_data, dict) and (projections is None or isinstance(projections, dict)):
+            projections = slide_data["financial_projections"] = dict(projections or {})
+            if not any(projections.get(k) for k in ("categories", "revenue", "ebitda")):
+                years = [m.years[i] for i in idx]
+                projections["categories"] = years
+                projections["revenue"] = _number_list(m.revenue[idx])
+                projections["ebitda"] = _number_list(m.ebitda[idx])
+                base = m.actual_idx if m.actual_idx < idx[0] else idx[0]
+                periods = idx[-1] - base
+                title = f"Revenue & EBITDA Projections ({years[0]}–{years[-1]}"
+                if periods > 0 and m.revenue[base] > 0 and m.revenue[idx[-1]] > 0:
+                    cagr = ((m.revenue[idx[-1]] / m.revenue[base]) ** (1.0 / periods) - 1.0) * 100.0
+                    title += f", {cagr:.0f}% projected revenue CAGR"
+                _fill(projections, "chart_title", title + ")")
+    return data
+
+
+def facts_consistency_issues(facts: Optional[Dict[str, Any]]) -> List[str]:
+    """Numeric checks on the facts block: reported margins vs EBITDA / revenue."""
+    m = compute_metrics(facts)
+    if m is None:
+        return []
+    return [
+        f"facts.ebitda_margins[{i}] ({m.reported_margins[i]:.1f}%) does not match "
+        f"EBITDA / revenue for {m.years[i]} ({m.margins[i]:.1f}%)"
+        for i in m.margin_mismatches()
+    ]
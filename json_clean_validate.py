@@ -1,58 +1,25 @@
 
-import json, ast, re, typing as t
+import json, typing as t
 from dataclasses import dataclass
 import pandas as pd
 
-CODE_FENCE_RE_START = re.compile(r"^\s*```(?:json|javascript|js)?\s*", flags=re.IGNORECASE)
-CODE_FENCE_RE_END   = re.compile(r"\s*```\s*$")
-
-ODD_QUOTES_MAP = {
-    "\u201c": '"', "\u201d": '"',
-    "\u2018": "'", "\u2019": "'",
-    "\u2013": "-", "\u2014": "-",
-    "\u00a0": " ",
-    "\ufeff": "",
-}
-
-def strip_code_fences(s: str) -> str:
-    s = s.strip()
-    s = CODE_FENCE_RE_START.sub("", s)
-    s = CODE_FENCE_RE_END.sub("", s)
-    return s.strip()
-
-def replace_odd_quotes(s: str) -> str:
-    for bad, good in ODD_QUOTES_MAP.items():
-        s = s.replace(bad, good)
-    return s
-
-def remove_trailing_commas(s: str) -> str:
-    return re.sub(r",\s*(?=[}\]])", "", s)
-
-def sanitize_text(s: str) -> str:
-    return replace_odd_quotes(strip_code_fences(s))
+from json_scanner import repair_json
+from precedent_analytics import analyze_transactions
 
 def parse_json_with_fallbacks(s: str):
     try:
         return json.loads(s)
     except Exception:
         pass
-    try:
-        s2 = remove_trailing_commas(s)
-        return json.loads(s2)
-    except Exception:
-        pass
-    try:
-        return ast.literal_eval(s)
-    except Exception:
-        pass
-    try:
-        s2 = remove_trailing_commas(s)
-        return ast.literal_eval(s2)
-    except Exception as e:
-        raise ValueError(f"Unable to parse chatbot JSON. Last error: {e}")
+    # One repairing scan (fences, quotes, trailing commas, Python literals) instead of re-parsing
+    found = repair_json(s)
+    if found.error:
+        raise ValueError(f"Unable to parse chatbot JSON. Last error: {found.error}")
+    return found.value
 
 def sanitize_and_parse(raw: str):
-    return parse_json_with_fallbacks(sanitize_text(raw))
+    # The scanner handles fences and curly quotes itself, and only outside string values
+    return parse_json_with_fallbacks(raw)
 
 @dataclass
 class VError:
@@ -188,13 +155,19 @@ def validate_precedent_transactions(data, path, errors):
             require(tx, "target", str, f"{path}.transactions[{i}]", errors)
             require(tx, "acquirer", str, f"{path}.transactions[{i}]", errors)
             require(tx, "country", str, f"{path}.transactions[{i}]", errors)
-            ev  = require(tx, "enterprise_value", (int,float), f"{path}.transactions[{i}]", errors)
-            rev = require(tx, "revenue", (int,float), f"{path}.transactions[{i}]", errors)
-            mult = require(tx, "ev_revenue_multiple", (int,float), f"{path}.transactions[{i}]", errors)
-            if isinstance(ev, (int,float)) and isinstance(rev, (int,float)) and isinstance(mult, (int,float)) and rev:
-                calc = ev / rev
-                if not approx_equal(calc, mult):
-                    errors.append(VError(f"{path}.transactions[{i}].ev_revenue_multiple", f"Multiple {mult} not ~ EV/Revenue ({calc:.2f})"))
+            require(tx, "enterprise_value", (int,float), f"{path}.transactions[{i}]", errors)
+            require(tx, "revenue", (int,float), f"{path}.transactions[{i}]", errors)
+            require(tx, "ev_revenue_multiple", (int,float), f"{path}.transactions[{i}]", errors)
+        # Numeric checks run vectorized over the shared columnar frame
+        frame = analyze_transactions(txs).frame
+        for i, row in frame[~frame["multiple_consistent"]].iterrows():
+            errors.append(VError(f"{path}.transactions[{i}].ev_revenue_multiple",
+                                 f"Multiple {row['ev_revenue_multiple']:g} not ~ EV/Revenue ({row['implied_multiple']:.2f})"))
+        for i, row in frame[(frame["enterprise_value"] <= 0) | (frame["revenue"] <= 0)].iterrows():
+            errors.append(VError(f"{path}.transactions[{i}]", "Enterprise value and revenue must be positive"))
+        for i, row in frame[frame["outlier"]].iterrows():
+            errors.append(VError(f"{path}.transactions[{i}].ev_revenue_multiple",
+                                 f"Multiple {row['ev_revenue_multiple']:g}x is an outlier for this set", level="WARNING"))
 
 def validate_valuation_overview(data, path, errors):
     v = require_list_of(data, "valuation_data", dict, path, errors, min_len=1)
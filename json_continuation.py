@@ -0,0 +1,98 @@
+"""
+json_continuation.py
+Truncation-aware generation for oversized JSON answers.
+When an LLM answer stops mid-object (max_tokens reached), the scanner's cursor
+says exactly where it stopped. Instead of regenerating the whole answer, we ask
+the model for only the missing tail and stitch it onto the partial text.
+"""
+from __future__ import annotations
+
+import re
+from typing import Any, Callable, Optional
+
+from json_scanner import ScannedJSON, scan_json_objects
+
+MAX_CONTINUATIONS = 2
+
+# The longest repeated stretch we look for when the model restates the last line
+_MAX_OVERLAP = 400
+_MIN_OVERLAP = 12
+_TAIL_CONTEXT = 300
+
+# call_llm_api reports failures as text ("Claude API Error: ...", "Error calling ...");
+# this pattern is the one place that recognises such replies
+LLM_ERROR_PATTERN = re.compile(r"^(?:\w+ API Error:|Error calling |Unknown service:)")
+
+
+def is_llm_error(reply: Any) -> bool:
+    """True for call_llm_api's error replies (not model output)."""
+    return isinstance(reply, str) and LLM_ERROR_PATTERN.match(reply) is not None
+
+
+def find_truncation(response_text: str) -> Optional[ScannedJSON]:
+    """Return the trailing JSON object if the response was cut off inside it."""
+    found = scan_json_objects(response_text or "")
+    if found and not found[-1].complete:
+        return found[-1]
+    return None
+
+
+def continuation_prompt(response_text: str, truncated: ScannedJSON) -> str:
+    """Ask for exactly the missing remainder, anchored on the cursor and the last characters."""
+    cursor = truncated.cursor
+    closers = "".join(truncated.open_stack)
+    where = cursor.describe() if cursor else "inside a JSON object"
+    return (
+        "Your previous answer was cut off by the output length limit while writing JSON, "
+        f"{where}.\n"
+        f"It ended with exactly these characters:\n<<<{response_text[-_TAIL_CONTEXT:]}>>>\n\n"
+        "Continue EXACTLY from the next character. Output only the missing remainder: "
+        "do not repeat any earlier text, do not restart the JSON, do not add a code fence or "
+        f"commentary before it. The open structures still to close are: {closers}\n"
+        "After the JSON is complete, continue with any remaining part of your answer "
+        "(for example the RENDER PLAN JSON if it has not been written yet)."
+    )
+
+
+def _strip_leading_fence(tail: str) -> str:
+    stripped = tail.lstrip()
+    if stripped.startswith("```"):
+        newline = stripped.find("\n")
+        return stripped[newline + 1:] if newline != -1 else ""
+    return tail
+
+
+def stitch_continuation(response_text: str, tail: str) -> str:
+    """Join a continuation onto the partial answer, dropping a restated overlap."""
+    tail = _strip_leading_fence(tail or "")
+    if tail.startswith("<<<"):
+        tail = tail[3:]
+    limit = min(_MAX_OVERLAP, len(tail), len(response_text))
+    for k in range(limit, _MIN_OVERLAP - 1, -1):
+        if response_text.endswith(tail[:k]):
+            return response_text + tail[k:]
+    return response_text + tail
+
+
+def complete_truncated_response(
+    response_text: str,
+    request_tail: Callable[[str, str], str],
+    max_rounds: int = MAX_CONTINUATIONS,
+) -> str:
+    """
+    Repair a truncated answer with continuation calls.
+    `request_tail(partial_text, prompt)` sends one follow-up and returns the new text.
+    Returns the stitched answer (unchanged when it was not truncated).
+    """
+    for round_no in range(1, max_rounds + 1):
+        truncated = find_truncation(response_text)
+        if truncated is None:
+            break
+        print(f"[DEBUG] JSON truncated {truncated.cursor.describe() if truncated.cursor else ''}; "
+              f"requesting continuation {round_no}/{max_rounds}")
+        tail = request_tail(response_text, continuation_prompt(response_text, truncated))
+        if not tail or is_llm_error(tail):
+            print(f"[DEBUG] Continuation failed: {str(tail)[:200]}")
+            break
+        response_text = stitch_continuation(response_text, tail)
+    return response_text
@@ -0,0 +1,332 @@
+"""
+json_scanner.py
+Single-pass tolerant JSON scanner for LLM responses.
+Walks the response once, locating balanced top-level JSON objects while tracking
+strings and escapes, and repairs the usual LLM damage in the same pass: code
+fences, smart quotes, single-quoted strings, trailing and missing commas, raw
+newlines inside strings, Python literals (True/False/None), unquoted keys and
+// comments. Each object is then handed to json.loads exactly once.
+"""
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, List, Optional
+
+_SMART_OPEN = "\u201c\u201d"     # curly double quotes used as string delimiters
+_QUOTES = '"' + "'" + _SMART_OPEN
+_CLOSERS = {"{": "}", "[": "]"}
+_PY_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_VALID_ESCAPES = set('"\\/bfnrtu')
+_CONTROL_ESCAPES = {"\n": "\\n", "\r": "\\r", "\t": "\\t", "\b": "\\b", "\f": "\\f"}
+
+# Runs of characters that need no attention inside a string / between tokens
+_PLAIN_DQ = re.compile(r'[^"\\\x00-\x1f]+')
+_PLAIN_SQ = re.compile(r"[^'\"\\\x00-\x1f]+")
+_PLAIN_SMART = re.compile(r'[^"\u201c\u201d\\\x00-\x1f]+')
+_WHITESPACE = re.compile(r"[ \t\r\n\u00a0\ufeff]+")
+_IDENT = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+_NUMBER = re.compile(r"[-+0-9.eE]+")
+
+# How much prose before an object is kept as its label ("CONTENT IR JSON:" etc.)
+_LABEL_CHARS = 200
+
+
+@dataclass
+class JsonCursor:
+    """Where a truncated document stopped: the open keys/indexes and what must come next."""
+    path: List[Any]             # e.g. ["management_team", "left_column_profiles", 1, "experience_bullets"]
+    open_stack: List[str]       # closers still pending, innermost first
+    in_string: bool             # cut off inside a string value or key
+    expecting: str              # string / key_string / key / colon / value / comma_or_close
+
+    def describe(self) -> str:
+        path = list(self.path)
+        # In an array the next value gets the index after the last one started
+        if path and isinstance(path[-1], int) and self.expecting == "value":
+            path[-1] += 1
+        # A new key replaces the previous sibling key, so leave that one out
+        if path and isinstance(path[-1], str) and self.expecting in ("key", "key_string"):
+            path[-1] = None
+        location = "".join(f"[{p}]" if isinstance(p, int) else f".{p}" for p in path if p is not None)
+        state = {
+            "string": "in the middle of a string value",
+            "key_string": "in the middle of a key",
+            "key": "where the next key should start",
+            "colon": "right after a key, before its colon",
+            "value": "where the next value should start",
+            "comma_or_close": "right after a complete value",
+        }[self.expecting]
+        return f"at {location.lstrip('.') or 'the top level'}, {state}"
+
+
+@dataclass
+class ScannedJSON:
+    start: int                  # offset of the opening brace in the source text
+    end: int                    # offset just past the closing brace (len(text) if truncated)
+    text: str                   # repaired JSON text
+    complete: bool              # False when the input ran out before the object closed
+    open_stack: List[str] = field(default_factory=list)  # closers still pending at the end
+    label: str = ""             # prose immediately before the object
+    value: Any = None
+    error: Optional[str] = None
+    cursor: Optional[JsonCursor] = None     # set only when the object is truncated
+
+
+def _scan_string(text: str, i: int, out: List[str]):
+    """
+    Copy the string starting at text[i] into `out` as a valid double-quoted JSON
+    string. Returns (index after the closing quote, terminated?).
+    """
+    quote = text[i]
+    if quote == "'":
+        plain, closers = _PLAIN_SQ, "'"
+    elif quote in _SMART_OPEN:
+        plain, closers = _PLAIN_SMART, _SMART_OPEN
+    else:
+        plain, closers = _PLAIN_DQ, '"'
+    n = len(text)
+    out.append('"')
+    i += 1
+    while i < n:
+        m = plain.match(text, i)
+        if m:
+            out.append(m.group())
+            i = m.end()
+            if i >= n:
+                break
+        ch = text[i]
+        if ch in closers:
+            out.append('"')
+            return i + 1, True
+        if ch == "\\":
+            nxt = text[i + 1] if i + 1 < n else ""
+            if quote == "'" and nxt == "'":
+                out.append("'")
+            elif nxt in _VALID_ESCAPES:
+                out.append("\\" + nxt)
+            else:
+                # Invalid escape such as \x or \$: keep the backslash literally
+                out.append("\\\\")
+                i += 1
+                continue
+            i += 2
+            continue
+        if ch == '"':
+            # A double quote inside a single- or smart-quoted string
+            out.append('\\"')
+        elif ch in _CONTROL_ESCAPES:
+            out.append(_CONTROL_ESCAPES[ch])
+        else:
+            out.append("\\u%04x" % ord(ch))
+        i += 1
+    return n, False
+
+
+def _scan_value(text: str, start: int) -> ScannedJSON:
+    """Scan one object/array starting at text[start] and return its repaired text."""
+    out: List[str] = []
+    stack: List[str] = []
+    path: List[Any] = []      # per open container: current key (object) or item index (array)
+    n = len(text)
+    i = start
+    pending_comma = None      # index in `out` of a comma that a closer would make trailing
+    prev = "open"             # kind of the last token: open / key / value / comma / colon
+
+    def truncated(in_string: bool, in_key: bool = False) -> ScannedJSON:
+        expecting = ("key_string" if in_key else "string") if in_string else _expecting(stack, prev)
+        cursor = JsonCursor(path=list(path), open_stack=stack[::-1], in_string=in_string,
+                            expecting=expecting)
+        return ScannedJSON(start, n, "".join(out), False, stack[::-1], cursor=cursor)
+
+    def value_start():
+        # Missing comma between two values, and array index bookkeeping
+        if prev == "value":
+            out.append(",")
+        if stack and stack[-1] == "]":
+            path[-1] += 1
+
+    while i < n:
+        ch = text[i]
+
+        if ch in _QUOTES:
+            is_key = bool(stack) and stack[-1] == "}" and prev in ("open", "comma", "value")
+            if is_key:
+                if prev == "value":
+                    out.append(",")
+            else:
+                value_start()
+            pending_comma = None
+            mark = len(out)
+            i, terminated = _scan_string(text, i, out)
+            if not terminated:
+                return truncated(True, is_key)
+            if is_key:
+                path[-1] = json.loads("".join(out[mark:]))
+            prev = "key" if is_key else "value"
+            continue
+
+        m = _WHITESPACE.match(text, i)
+        if m:
+            out.append(" " if "\n" not in m.group() else "\n")
+            i = m.end()
+            continue
+
+        if ch in "{[":
+            if stack:
+                value_start()
+            pending_comma = None
+            stack.append(_CLOSERS[ch])
+            path.append(None if ch == "{" else -1)
+            out.append(ch)
+            prev = "open"
+            i += 1
+            continue
+
+        if ch in "}]":
+            if pending_comma is not None:
+                out[pending_comma] = ""
+                pending_comma = None
+            # A mismatched closer is taken as the one that is actually pending
+            out.append(stack.pop() if stack else ch)
+            if path:
+                path.pop()
+            prev = "value"
+            i += 1
+            if not stack:
+                return ScannedJSON(start, i, "".join(out), True)
+            continue
+
+        if ch == ",":
+            if prev not in ("comma", "open"):
+                out.append(",")
+                pending_comma = len(out) - 1
+                prev = "comma"
+            i += 1
+            continue
+
+        if ch == ":":
+            out.append(":")
+            pending_comma = None
+            prev = "colon"
+            i += 1
+            continue
+
+        if ch == "`":
+            # Stray fence inside the object: drop it and any language tag
+            while i < n and text[i] == "`":
+                i += 1
+            m = _IDENT.match(text, i)
+            if m:
+                i = m.end()
+            continue
+
+        if ch == "/" and i + 1 < n and text[i + 1] in "/*":
+            end = text.find("\n", i) if text[i + 1] == "/" else text.find("*/", i + 2)
+            i = n if end == -1 else (end if text[i + 1] == "/" else end + 2)
+            continue
+
+        m = _IDENT.match(text, i)
+        if m:
+            word = m.group()
+            j = m.end()
+            while j < n and text[j] in " \t":
+                j += 1
+            pending_comma = None
+            if j < n and text[j] == ":" and stack and stack[-1] == "}" and prev in ("open", "comma", "value"):
+                if prev == "value":
+                    out.append(",")
+                out.append('"' + word + '"')   # unquoted key
+                path[-1] = word
+                prev = "key"
+            else:
+                value_start()
+                out.append(_PY_LITERALS.get(word, word))
+                prev = "value"
+            i = m.end()
+            continue
+
+        m = _NUMBER.match(text, i)
+        if m:
+            value_start()
+            pending_comma = None
+            num = m.group()
+            out.append(num[1:] if num.startswith("+") else num)
+            prev = "value"
+            i = m.end()
+            continue
+
+        # Anything else is copied and left for json.loads to report
+        out.append(ch)
+        pending_comma = None
+        i += 1
+
+    return truncated(False)
+
+
+def _expecting(stack: List[str], prev: str) -> str:
+    """What the next token of a truncated document has to be (outside a string)."""
+    in_object = bool(stack) and stack[-1] == "}"
+    if prev == "key":
+        return "colon"
+    if prev == "colon":
+        return "value"
+    if prev in ("open", "comma"):
+        return "key" if in_object else "value"
+    return "comma_or_close"
+
+
+def _looks_like_object_start(text: str, i: int) -> bool:
+    """A '{' in prose only starts JSON when followed by a key (quoted or bare) or an immediate '}'."""
+    m = _WHITESPACE.match(text, i + 1)
+    j = m.end() if m else i + 1
+    if j < len(text) and (text[j] in _QUOTES or text[j] == "}"):
+        return True
+    m = _IDENT.match(text, j)
+    if m is None:
+        return False
+    j = m.end()
+    m = _WHITESPACE.match(text, j)
+    j = m.end() if m else j
+    return j < len(text) and text[j] == ":"
+
+
+def _parse(found: ScannedJSON) -> ScannedJSON:
+    try:
+        found.value = json.loads(found.text)
+    except json.JSONDecodeError as e:
+        found.error = str(e) if found.complete else f"Unterminated JSON ({e})"
+    return found
+
+
+def scan_json_objects(text: str) -> List[ScannedJSON]:
+    """Return every balanced (or truncated trailing) top-level JSON object in `text`."""
+    results: List[ScannedJSON] = []
+    if not text:
+        return results
+    i = 0
+    prev_end = 0
+    n = len(text)
+    while i < n:
+        i = text.find("{", i)
+        if i == -1:
+            break
+        if not _looks_like_object_start(text, i):
+            i += 1
+            continue
+        found = _scan_value(text, i)
+        found.label = text[max(prev_end, i - _LABEL_CHARS):i]
+        results.append(_parse(found))
+        i = prev_end = found.end
+    return results
+
+
+def repair_json(text: str) -> ScannedJSON:
+    """Scan `text` as a single JSON object or array (whichever bracket comes first)."""
+    starts = [p for p in (text.find("{"), text.find("[")) if p != -1]
+    if not starts:
+        found = ScannedJSON(0, len(text), text, False)
+        found.error = "No JSON object or array found"
+        return found
+    return _parse(_scan_value(text, min(starts)))
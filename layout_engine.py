@@ -0,0 +1,229 @@
+"""
+layout_engine.py
+Catalog-driven slide geometry.
+A template's "layout_specs" in templates.json names its frames in inches on the
+design canvas (13.333 x 7.5 by default). The engine turns them into EMU rectangles
+for a given slide size and item counts, and caches the result per
+(template, slide size, counts), so repeated templates in a deck reuse their
+geometry and layout tweaks need no code changes.
+
+    "layout_specs": {
+      "frames": {
+        "chart":   {"x": 2, "y": 1.7, "w": 9, "h": 2.3},
+        "metrics": {"x": 0.5, "y": 4.4, "w": 12.5, "h": 1.1, "repeat": "row",
+                    "item_w": 2.8, "distribute": 4, "max": 4,
+                    "parts": {"value": {"x": 0.1, "y": 0.3, "right": 0.1, "h": 0.25}}},
+        "points":  {"x": 1, "y": 5.7, "w": 7, "repeat": "column", "start": 0.25,
+                    "pitch": 0.18, "item_h": 0.16, "max": 5}
+      }
+    }
+
+Frame keys: x, y, w, h (or right / bottom, measured in from the parent's far edge);
+parts are laid out relative to their frame (or to each item of a repeated frame).
+Repeated frames step by `pitch` from `start`, or with `distribute: N` spread N
+items of item_w / item_h evenly with equal gaps before, between and after them.
+
+    layout = layout_for("historical_financial_performance", prs, metrics=len(metrics))
+    slide.shapes.add_chart(chart_type, *layout.frame("chart").box, chart_data)
+    for item, metric in zip(layout.items("metrics"), metrics):
+        add_text(slide, *item.part("value").box, metric["value"])
+
+layout_for reads the catalog set with layout_catalog(templates_path) (the
+renderer does this per job); a template without layout_specs there falls back to
+the specs in the bundled templates.json.
+"""
+from __future__ import annotations
+
+import contextlib
+import os
+from collections import OrderedDict
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from pptx.util import Emu
+
+from catalog_loader import TemplateCatalog, load_catalog
+
+DEFAULT_TEMPLATES_PATH = Path(__file__).with_name("templates.json")
+DESIGN_SIZE = (13.333, 7.5)
+EMU_PER_INCH = 914400
+_CACHE_SIZE = 256
+
+
+class LayoutError(LookupError):
+    """Raised when neither the active nor the bundled catalog has layout_specs for a template."""
+
+
+@dataclass(frozen=True)
+class Frame:
+    left: Emu
+    top: Emu
+    width: Emu
+    height: Emu
+    parts: Dict[str, "Frame"] = field(default_factory=dict)
+
+    @property
+    def box(self) -> Tuple[Emu, Emu, Emu, Emu]:
+        """(left, top, width, height), ready to splat into add_textbox / add_shape / add_chart."""
+        return self.left, self.top, self.width, self.height
+
+    def part(self, name: str) -> "Frame":
+        return self.parts[name]
+
+
+@dataclass(frozen=True)
+class SlideLayout:
+    template_id: str
+    frames: Dict[str, Frame]
+    groups: Dict[str, Tuple[Frame, ...]]
+
+    def frame(self, name: str) -> Frame:
+        return self.frames[name]
+
+    def items(self, name: str) -> Tuple[Frame, ...]:
+        return self.groups[name]
+
+
+class _Scaler:
+    """Inches on the design canvas -> EMU on the actual slide."""
+
+    def __init__(self, design: Tuple[float, float], slide_width: int, slide_height: int):
+        self.sx = slide_width / (design[0] * EMU_PER_INCH)
+        self.sy = slide_height / (design[1] * EMU_PER_INCH)
+
+    def frame(self, x: float, y: float, w: float, h: float, parts: Dict[str, Frame]) -> Frame:
+        def emu(inches: float, scale: float) -> Emu:
+            return Emu(int(round(inches * EMU_PER_INCH * scale)))
+        return Frame(emu(x, self.sx), emu(y, self.sy), emu(w, self.sx), emu(h, self.sy), parts)
+
+
+def _rect(spec: Dict[str, Any], parent: Tuple[float, float, float, float]) -> Tuple[float, float, float, float]:
+    """Absolute (x, y, w, h) in design inches for a spec placed inside `parent`."""
+    px, py, pw, ph = parent
+    x, y = float(spec.get("x", 0)), float(spec.get("y", 0))
+    w = float(spec["w"]) if "w" in spec else pw - x - float(spec.get("right", 0))
+    h = float(spec["h"]) if "h" in spec else ph - y - float(spec.get("bottom", 0))
+    return px + x, py + y, w, h
+
+
+def _build(spec: Dict[str, Any], rect: Tuple[float, float, float, float], scaler: _Scaler) -> Frame:
+    parts = {name: _build(part, _rect(part, rect), scaler) for name, part in spec.get("parts", {}).items()}
+    return scaler.frame(*rect, parts)
+
+
+def _repeat(spec: Dict[str, Any], rect: Tuple[float, float, float, float], count: Optional[int],
+            scaler: _Scaler) -> Tuple[Frame, ...]:
+    x, y, w, h = rect
+    row = spec["repeat"] == "row"
+    limit = spec.get("max")
+    n = count if count is not None else (limit or spec.get("distribute") or 0)
+    if limit is not None:
+        n = min(n, limit)
+    item_w = float(spec.get("item_w", w))
+    item_h = float(spec.get("item_h", h))
+    item = item_w if row else item_h
+    if spec.get("distribute"):
+        # Equal gaps before, between and after a fixed number of slots
+        slots = int(spec["distribute"])
+        gap = ((w if row else h) - slots * item) / (slots + 1)
+        start, pitch = gap, item + gap
+    else:
+        start, pitch = float(spec.get("start", 0)), float(spec.get("pitch", item))
+    items = []
+    for i in range(max(n, 0)):
+        offset = start + i * pitch
+        item_rect = (x + offset, y, item_w, item_h) if row else (x, y + offset, item_w, item_h)
+        items.append(_build(spec, item_rect, scaler))
+    return tuple(items)
+
+
+def compute_layout(template_id: str, layout_specs: Dict[str, Any], slide_width: int, slide_height: int,
+                   counts: Optional[Dict[str, int]] = None) -> SlideLayout:
+    """Lay out every frame in `layout_specs` (uncached; see LayoutEngine)."""
+    counts = counts or {}
+    design = tuple(layout_specs.get("design_size", DESIGN_SIZE))
+    scaler = _Scaler(design, slide_width, slide_height)
+    canvas = (0.0, 0.0, float(design[0]), float(design[1]))
+    frames: Dict[str, Frame] = {}
+    groups: Dict[str, Tuple[Frame, ...]] = {}
+    for name, spec in layout_specs.get("frames", {}).items():
+        rect = _rect(spec, canvas)
+        if spec.get("repeat") in ("row", "column"):
+            groups[name] = _repeat(spec, rect, counts.get(name), scaler)
+        frames[name] = _build(spec, rect, scaler)
+    return SlideLayout(template_id, frames, groups)
+
+
+class LayoutEngine:
+    """Computes and caches slide layouts for the templates in one catalog."""
+
+    def __init__(self, catalog: TemplateCatalog, max_entries: int = _CACHE_SIZE):
+        self.catalog = catalog
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[tuple, SlideLayout]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def layout(self, template_id: str, slide_width: int, slide_height: int, **counts: int) -> Optional[SlideLayout]:
+        """The template's layout, or None when the catalog has no layout_specs for it."""
+        key = (template_id, int(slide_width), int(slide_height), tuple(sorted(counts.items())))
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return cached
+        tpl = self.catalog.get(template_id)
+        if tpl is None or not tpl.layout_specs:
+            return None
+        self.misses += 1
+        layout = compute_layout(template_id, tpl.layout_specs, int(slide_width), int(slide_height), counts)
+        self._cache[key] = layout
+        if len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        return layout
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._cache)}
+
+
+@lru_cache(maxsize=8)
+def _engine_for(path: str, mtime_ns: int, size: int) -> LayoutEngine:
+    return LayoutEngine(load_catalog(path))
+
+
+def get_layout_engine(templates_path: Optional[os.PathLike] = None) -> LayoutEngine:
+    """One engine per catalog file, replaced (with a cold cache) when the file changes."""
+    path = os.fspath(templates_path or DEFAULT_TEMPLATES_PATH)
+    stat = os.stat(path)
+    return _engine_for(path, stat.st_mtime_ns, stat.st_size)
+
+
+_catalog_path: ContextVar[Optional[str]] = ContextVar("layout_catalog", default=None)
+
+
+@contextlib.contextmanager
+def layout_catalog(templates_path: Optional[os.PathLike]) -> Iterator[None]:
+    """Scope the catalog that layout_for reads to one render job (None: the bundled one)."""
+    token = _catalog_path.set(os.fspath(templates_path) if templates_path else None)
+    try:
+        yield
+    finally:
+        _catalog_path.reset(token)
+
+
+def layout_for(template_id: str, prs, templates_path: Optional[os.PathLike] = None,
+               **counts: int) -> SlideLayout:
+    """Layout for a slide of `template_id` in `prs`; counts size the repeated frames by name."""
+    path = os.fspath(templates_path) if templates_path else _catalog_path.get()
+    layout = None
+    if path:
+        layout = get_layout_engine(path).layout(template_id, prs.slide_width, prs.slide_height, **counts)
+    if layout is None and (not path or Path(path).resolve() != DEFAULT_TEMPLATES_PATH.resolve()):
+        # Custom catalogs without layout_specs keep the bundled geometry
+        layout = get_layout_engine().layout(template_id, prs.slide_width, prs.slide_height, **counts)
+    if layout is None:
+        raise LayoutError(f"No layout_specs for template '{template_id}' in {path or DEFAULT_TEMPLATES_PATH}")
+    return layout
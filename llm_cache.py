@@ -0,0 +1,147 @@
+"""
+llm_cache.py
+Record/replay layer for the LLM chat calls (the app's call_llm_api, the brand
+extractor and the auto-fix loop all post through llm_post()).
+Responses are keyed on (provider, model, normalized messages) and kept on disk as
+one JSON file per key, so interviews and repairs can be replayed offline and
+benchmarked without keys or network.
+
+    LLM_CACHE_MODE   off (default) | record | replay | auto (replay on hit, else call and record)
+    LLM_CACHE_DIR    where recordings live (default .llm_cache)
+    PERPLEXITY_API_URL / ANTHROPIC_API_URL
+                     override the endpoints, e.g. to point at mock_llm_server.py
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import requests
+
+MODE_OFF, MODE_RECORD, MODE_REPLAY, MODE_AUTO = "off", "record", "replay", "auto"
+CACHE_MODES = (MODE_OFF, MODE_RECORD, MODE_REPLAY, MODE_AUTO)
+
+DEFAULT_URLS = {
+    "perplexity": "https://api.perplexity.ai/chat/completions",
+    "claude": "https://api.anthropic.com/v1/messages",
+}
+URL_ENV = {"perplexity": "PERPLEXITY_API_URL", "claude": "ANTHROPIC_API_URL"}
+
+
+def provider_url(provider: str) -> str:
+    return os.environ.get(URL_ENV[provider]) or DEFAULT_URLS[provider]
+
+
+def cache_mode() -> str:
+    mode = os.environ.get("LLM_CACHE_MODE", MODE_OFF).strip().lower()
+    return mode if mode in CACHE_MODES else MODE_OFF
+
+
+def normalize_messages(payload: Dict[str, Any]) -> list:
+    """Role/content pairs with surrounding whitespace stripped; a top-level system prompt comes first."""
+    messages = []
+    if payload.get("system"):
+        messages.append(("system", str(payload["system"]).strip()))
+    for msg in payload.get("messages", []):
+        content = msg.get("content", "")
+        if not isinstance(content, str):
+            content = json.dumps(content, sort_keys=True)
+        messages.append((msg.get("role", ""), content.strip()))
+    return messages
+
+
+def cache_key(provider: str, payload: Dict[str, Any]) -> str:
+    blob = json.dumps([provider, payload.get("model"), normalize_messages(payload)],
+                      ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class CachedResponse:
+    """The parts of requests.Response the callers use."""
+
+    def __init__(self, status_code: int, body: Any, text: Optional[str] = None):
+        self.status_code = status_code
+        self._body = body
+        self.text = text if text is not None else json.dumps(body)
+
+    def json(self) -> Any:
+        return self._body
+
+
+class LLMCache:
+    """Disk store: <dir>/<key[:2]>/<key>.json holding the request summary and the response body."""
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        if not path.exists():
+            with self._lock:
+                self.misses += 1
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            record = json.load(f)
+        with self._lock:
+            self.hits += 1
+        return record
+
+    def put(self, key: str, provider: str, payload: Dict[str, Any], body: Any, latency_s: float) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        record = {
+            "provider": provider,
+            "model": payload.get("model"),
+            "messages": normalize_messages(payload),
+            "response": body,
+            "latency_s": round(latency_s, 3),
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(record, f, ensure_ascii=False)
+        os.replace(tmp, path)       # atomic, so concurrent recorders never leave a torn file
+
+
+_caches: Dict[str, LLMCache] = {}
+
+
+def get_cache() -> LLMCache:
+    directory = os.environ.get("LLM_CACHE_DIR", ".llm_cache")
+    if directory not in _caches:
+        _caches[directory] = LLMCache(directory)
+    return _caches[directory]
+
+
+def llm_post(provider: str, payload: Dict[str, Any], headers: Dict[str, str], timeout: float = 300):
+    """POST a chat request to `provider` ("perplexity" or "claude") through the record/replay cache."""
+    mode = cache_mode()
+    if mode == MODE_OFF:
+        return requests.post(provider_url(provider), json=payload, headers=headers, timeout=timeout)
+
+    cache = get_cache()
+    key = cache_key(provider, payload)
+    if mode in (MODE_REPLAY, MODE_AUTO):
+        record = cache.get(key)
+        if record is not None:
+            return CachedResponse(200, record["response"])
+        if mode == MODE_REPLAY:
+            print(f"[DEBUG] LLM cache miss in replay mode ({provider}, {payload.get('model')}, {key[:12]})")
+            return CachedResponse(404, None, text=f"LLM cache miss in replay mode (key {key[:12]})")
+
+    start = time.perf_counter()
+    response = requests.post(provider_url(provider), json=payload, headers=headers, timeout=timeout)
+    if response.status_code == 200:
+        cache.put(key, provider, payload, response.json(), time.perf_counter() - start)
+    return response
@@ -0,0 +1,194 @@
+"""
+media_registry.py
+Media registry for a render job: images (logos, pictures) are hashed once,
+optionally downscaled to the size they are placed at, and handed to python-pptx
+as identical blobs, so every placement of the same picture links to one part in
+ppt/media instead of a copy per slide.
+
+    with media_registry(max_dpi=220):
+        ...renderers call add_picture(slide.shapes, "logo.png", left, top, height=...)
+
+dedupe_media(prs) merges image parts that are already in a presentation with the
+same content (for instance brand template decks that carry duplicated media).
+"""
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import io
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+
+from PIL import Image
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.util import Emu
+
+EMU_PER_INCH = 914400
+DEFAULT_MAX_DPI = 220
+# Only re-encode when it saves at least this share of the pixels
+_MIN_DOWNSCALE = 0.8
+
+ImageSource = Union[str, Path, bytes, io.BytesIO]
+
+
+@dataclass
+class _Source:
+    sha1: str
+    blob: bytes
+    size: Tuple[int, int]           # pixels
+    format: str
+
+
+@dataclass
+class MediaStats:
+    placements: int = 0
+    unique_sources: int = 0
+    downscaled: int = 0
+    bytes_in: int = 0               # what the placements would weigh as separate copies
+    bytes_out: int = 0              # distinct blobs actually handed to the package
+
+    def as_dict(self) -> Dict[str, int]:
+        return dict(vars(self))
+
+
+class MediaRegistry:
+    """Hash-keyed image store; one instance per render job."""
+
+    def __init__(self, max_dpi: Optional[int] = DEFAULT_MAX_DPI):
+        self.max_dpi = max_dpi
+        self.stats = MediaStats()
+        self._by_key: Dict[str, _Source] = {}          # resolved path -> source
+        self._by_sha1: Dict[str, _Source] = {}
+        self._variants: Dict[Tuple[str, int, int], bytes] = {}
+        self._emitted: set = set()
+
+    def source(self, image: ImageSource) -> _Source:
+        """Load and hash an image once per distinct path or blob."""
+        if isinstance(image, (str, Path)):
+            key: Optional[str] = str(Path(image).resolve())
+            cached = self._by_key.get(key)
+            if cached is not None:
+                return cached
+            blob = Path(image).read_bytes()
+        else:
+            key = None
+            blob = image.getvalue() if isinstance(image, io.BytesIO) else bytes(image)
+        sha1 = hashlib.sha1(blob).hexdigest()
+        src = self._by_sha1.get(sha1)
+        if src is None:
+            with Image.open(io.BytesIO(blob)) as im:
+                src = _Source(sha1, blob, im.size, im.format or "PNG")
+            self._by_sha1[sha1] = src
+            self.stats.unique_sources += 1
+        if key is not None:
+            self._by_key[key] = src
+        return src
+
+    def placed_size(self, src: _Source, width: Optional[int], height: Optional[int]) -> Tuple[int, int]:
+        """Placed size in EMU, filling in a missing side from the aspect ratio."""
+        px_w, px_h = src.size
+        if width is None and height is None:
+            return Emu(int(px_w * EMU_PER_INCH / 72)), Emu(int(px_h * EMU_PER_INCH / 72))
+        if width is None:
+            width = int(height * px_w / px_h)
+        elif height is None:
+            height = int(width * px_h / px_w)
+        return Emu(width), Emu(height)
+
+    def blob_for(self, src: _Source, width: int, height: int) -> bytes:
+        """The source blob, downscaled to `max_dpi` at the placed size when that pays off."""
+        if not self.max_dpi:
+            return src.blob
+        target = (max(1, round(width / EMU_PER_INCH * self.max_dpi)),
+                  max(1, round(height / EMU_PER_INCH * self.max_dpi)))
+        if target[0] * target[1] >= src.size[0] * src.size[1] * _MIN_DOWNSCALE:
+            return src.blob
+        key = (src.sha1,) + target
+        blob = self._variants.get(key)
+        if blob is None:
+            with Image.open(io.BytesIO(src.blob)) as im:
+                im.load()
+                resized = im.resize(target, Image.LANCZOS)
+            out = io.BytesIO()
+            fmt = src.format if src.format in ("PNG", "JPEG", "GIF") else "PNG"
+            if fmt == "JPEG" and resized.mode not in ("RGB", "L"):
+                resized = resized.convert("RGB")
+            resized.save(out, format=fmt, **({"quality": 90} if fmt == "JPEG" else {"optimize": True}))
+            blob = out.getvalue()
+            if len(blob) >= len(src.blob):
+                blob = src.blob
+            else:
+                self.stats.downscaled += 1
+            self._variants[key] = blob
+        return blob
+
+    def add_picture(self, shapes, image: ImageSource, left: int, top: int,
+                    width: Optional[int] = None, height: Optional[int] = None):
+        """shapes.add_picture through the registry; returns the Picture shape."""
+        src = self.source(image)
+        width, height = self.placed_size(src, width, height)
+        blob = self.blob_for(src, width, height)
+        self.stats.placements += 1
+        self.stats.bytes_in += len(src.blob)
+        digest = hashlib.sha1(blob).digest() if blob is not src.blob else bytes.fromhex(src.sha1)
+        if digest not in self._emitted:
+            self._emitted.add(digest)
+            self.stats.bytes_out += len(blob)
+        # python-pptx reuses an existing image part whose SHA1 matches, so equal blobs share one part
+        return shapes.add_picture(io.BytesIO(blob), left, top, width, height)
+
+
+_current: ContextVar[Optional[MediaRegistry]] = ContextVar("media_registry", default=None)
+
+
+def get_media_registry() -> MediaRegistry:
+    """The registry of the current render job (a throwaway one outside of a job)."""
+    return _current.get() or MediaRegistry()
+
+
+@contextlib.contextmanager
+def media_registry(max_dpi: Optional[int] = DEFAULT_MAX_DPI) -> Iterator[MediaRegistry]:
+    """Scope a registry to one render job; nested jobs reuse the outer registry."""
+    outer = _current.get()
+    if outer is not None:
+        yield outer
+        return
+    registry = MediaRegistry(max_dpi)
+    token = _current.set(registry)
+    try:
+        yield registry
+    finally:
+        _current.reset(token)
+
+
+def add_picture(shapes, image: ImageSource, left: int, top: int,
+                width: Optional[int] = None, height: Optional[int] = None):
+    return get_media_registry().add_picture(shapes, image, left, top, width, height)
+
+
+def dedupe_media(prs) -> int:
+    """Point every image relationship at one part per distinct image content; returns parts merged."""
+    canonical: Dict[str, Any] = {}
+    merged = set()
+    for part in list(prs.part.package.iter_parts()):
+        element = getattr(part, "_element", None)
+        if element is None:
+            continue
+        for rId, rel in list(part.rels.items()):
+            if rel.is_external or rel.reltype != RT.IMAGE:
+                continue
+            target = rel.target_part
+            keep = canonical.setdefault(hashlib.sha1(target.blob).hexdigest(), target)
+            if keep is target:
+                continue
+            # Relate to the kept part (reusing an existing relationship to it), move the
+            # references over and drop the old relationship; the orphaned part is not saved
+            new_rId = part.relate_to(keep, RT.IMAGE)
+            for attr in element.xpath(".//@r:embed | .//@r:link | .//@r:id"):
+                if attr == rId:
+                    attr.getparent().set(attr.attrname, new_rId)
+            part.rels.pop(rId)
+            merged.add(id(target))
+    return len(merged)
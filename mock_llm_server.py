@@ -0,0 +1,223 @@
+"""
+mock_llm_server.py
+Local stand-in for the Perplexity and Anthropic chat APIs, plus a small load
+generator, so LLM-bound paths can be exercised and benchmarked air-gapped.
+
+    POST /chat/completions   Perplexity (OpenAI-style) request and response
+    POST /v1/messages        Anthropic Messages request and response
+
+Replies come from an llm_cache recording directory when one matches the request,
+otherwise a deterministic filler of --reply-tokens tokens. Each reply is delayed
+by --latency-ms plus its token count over --tokens-per-s, like a real provider.
+
+    python mock_llm_server.py serve --port 8766 --latency-ms 400 --tokens-per-s 80 --recordings .llm_cache
+    PERPLEXITY_API_URL=http://127.0.0.1:8766/chat/completions \\
+    ANTHROPIC_API_URL=http://127.0.0.1:8766/v1/messages streamlit run app.py
+
+bench posts to PERPLEXITY_API_URL / ANTHROPIC_API_URL and falls back to this mock
+on its default port (never to the real provider) when they are unset:
+
+    ANTHROPIC_API_URL=http://127.0.0.1:8766/v1/messages \\
+    python mock_llm_server.py bench --provider claude --requests 200 --concurrency 16
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from llm_cache import URL_ENV, LLMCache, cache_key, llm_post
+
+DEFAULT_PORT = 8766
+PATHS = {"/chat/completions": "perplexity", "/v1/messages": "claude"}
+_FILLER = ("The company operates a differentiated platform with recurring revenue, "
+           "disciplined cost control and a clear path to margin expansion. ").split()
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough provider-style count (about four characters per token)."""
+    return max(1, len(text) // 4)
+
+
+def _reply_text(provider: str, payload: Dict[str, Any], recordings: Optional[LLMCache], reply_tokens: int) -> str:
+    if recordings is not None:
+        record = recordings.get(cache_key(provider, payload))
+        if record is not None:
+            body = record["response"]
+            if provider == "claude":
+                return body.get("content", [{}])[0].get("text", "")
+            return body.get("choices", [{}])[0].get("message", {}).get("content", "")
+    # Roughly reply_tokens tokens of deterministic filler
+    words = [_FILLER[i % len(_FILLER)] for i in range(int(reply_tokens * 0.75))]
+    return " ".join(words)
+
+
+def _response_body(provider: str, model: str, text: str, prompt_tokens: int, completion_tokens: int) -> Dict[str, Any]:
+    if provider == "claude":
+        return {
+            "id": f"msg_mock_{uuid.uuid4().hex[:24]}",
+            "type": "message",
+            "role": "assistant",
+            "model": model,
+            "content": [{"type": "text", "text": text}],
+            "stop_reason": "end_turn",
+            "usage": {"input_tokens": prompt_tokens, "output_tokens": completion_tokens},
+        }
+    return {
+        "id": f"mock-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": text}}],
+        "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                  "total_tokens": prompt_tokens + completion_tokens},
+    }
+
+
+def _make_handler(latency_ms: float, tokens_per_s: float, reply_tokens: int, recordings: Optional[LLMCache]):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _send_json(self, code: int, payload: Dict[str, Any]) -> None:
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            provider = PATHS.get(self.path.split("?")[0].rstrip("/"))
+            if provider is None:
+                return self._send_json(404, {"error": {"message": f"unknown path {self.path}"}})
+            try:
+                payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)))
+            except ValueError as e:
+                return self._send_json(400, {"error": {"message": f"invalid JSON: {e}"}})
+            if provider == "claude" and not self.headers.get("x-api-key"):
+                return self._send_json(401, {"error": {"type": "authentication_error", "message": "missing x-api-key"}})
+
+            text = _reply_text(provider, payload, recordings, reply_tokens)
+            prompt_tokens = sum(estimate_tokens(str(m.get("content", ""))) for m in payload.get("messages", []))
+            prompt_tokens += estimate_tokens(str(payload.get("system", ""))) if payload.get("system") else 0
+            completion_tokens = estimate_tokens(text)
+            max_tokens = payload.get("max_tokens")
+            if max_tokens and completion_tokens > max_tokens:
+                text = text[: max_tokens * 4]
+                completion_tokens = max_tokens
+            delay = latency_ms / 1000 + (completion_tokens / tokens_per_s if tokens_per_s > 0 else 0)
+            time.sleep(delay)
+            self._send_json(200, _response_body(provider, payload.get("model", "mock"), text,
+                                                prompt_tokens, completion_tokens))
+
+        def log_message(self, fmt, *args):
+            pass
+
+    return Handler
+
+
+def serve(host: str, port: int, latency_ms: float, tokens_per_s: float, reply_tokens: int,
+          recordings: Optional[str]) -> None:
+    handler = _make_handler(latency_ms, tokens_per_s, reply_tokens, LLMCache(recordings) if recordings else None)
+    server = ThreadingHTTPServer((host, port), handler)
+    print(f"[DEBUG] Mock LLM server on http://{host}:{port} "
+          f"(latency {latency_ms:.0f} ms, {tokens_per_s:.0f} tokens/s, recordings: {recordings or 'none'})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def _bench_payload(provider: str, model: str, i: int, distinct: int) -> Dict[str, Any]:
+    messages = [{"role": "user", "content": f"Benchmark prompt {i % distinct}: summarize the target's financials."}]
+    payload: Dict[str, Any] = {"model": model, "messages": messages, "max_tokens": 4000, "temperature": 0.7}
+    if provider == "claude":
+        payload["system"] = "You are an investment banking analyst."
+    else:
+        payload["messages"] = [{"role": "system", "content": "You are an investment banking analyst."}] + messages
+    return payload
+
+
+def run_bench(provider: str, model: str, requests_total: int, concurrency: int, distinct: int) -> Dict[str, Any]:
+    """Fire requests through llm_post (so LLM_CACHE_MODE applies) and report latency and throughput."""
+    headers = {"x-api-key": "mock", "Authorization": "Bearer mock", "Content-Type": "application/json",
+               "anthropic-version": "2023-06-01"}
+    latencies: List[float] = []
+    errors = 0
+    lock = threading.Lock()
+
+    def one(i: int) -> None:
+        nonlocal errors
+        start = time.perf_counter()
+        try:
+            response = llm_post(provider, _bench_payload(provider, model, i, distinct), headers)
+        except requests.RequestException:
+            response = None             # refused, reset or timed out: counted, not fatal
+        elapsed = time.perf_counter() - start
+        with lock:
+            if response is not None and response.status_code == 200:
+                latencies.append(elapsed)
+            else:
+                errors += 1
+
+    wall = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(requests_total)))
+    wall = time.perf_counter() - wall
+    latencies.sort()
+
+    def pct(p: float) -> Optional[float]:
+        return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 4) if latencies else None
+
+    return {
+        "provider": provider, "requests": requests_total, "concurrency": concurrency, "errors": errors,
+        "wall_s": round(wall, 3), "throughput_rps": round(len(latencies) / wall, 2) if wall else None,
+        "p50_s": pct(0.50), "p95_s": pct(0.95), "p99_s": pct(0.99),
+        "mean_s": round(statistics.mean(latencies), 4) if latencies else None,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Mock Perplexity/Anthropic server and LLM load generator")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_serve = sub.add_parser("serve")
+    p_serve.add_argument("--host", default="127.0.0.1")
+    p_serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    p_serve.add_argument("--latency-ms", type=float, default=300)
+    p_serve.add_argument("--tokens-per-s", type=float, default=100)
+    p_serve.add_argument("--reply-tokens", type=int, default=400)
+    p_serve.add_argument("--recordings", default=None, help="llm_cache directory to answer from")
+    p_bench = sub.add_parser("bench", help="load test whatever PERPLEXITY_API_URL / ANTHROPIC_API_URL point at "
+                                               "(default: this mock on its default port)")
+    p_bench.add_argument("--provider", choices=["perplexity", "claude"], default="perplexity")
+    p_bench.add_argument("--model", default="sonar-pro")
+    p_bench.add_argument("--requests", type=int, default=100)
+    p_bench.add_argument("--concurrency", type=int, default=8)
+    p_bench.add_argument("--distinct", type=int, default=10**9, help="distinct prompts (lower it to exercise the cache)")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        serve(args.host, args.port, args.latency_ms, args.tokens_per_s, args.reply_tokens, args.recordings)
+    else:
+        # Load tests go to the local mock unless an endpoint is chosen explicitly
+        path = next(p for p, provider in PATHS.items() if provider == args.provider)
+        os.environ.setdefault(URL_ENV[args.provider], f"http://127.0.0.1:{DEFAULT_PORT}{path}")
+        print(f"[DEBUG] Benchmarking {os.environ[URL_ENV[args.provider]]}")
+        print(json.dumps(run_bench(args.provider, args.model, args.requests, args.concurrency, args.distinct), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
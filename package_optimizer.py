@@ -0,0 +1,138 @@
+"""
+package_optimizer.py
+Post-render optimization of the output .pptx package.
+Decks start from the default python-pptx template and the renderers only use the
+Blank layout, so every output carries ten unused layouts, the template's stale
+thumbnail and its printer settings. optimize_presentation() prunes those from the
+object model (parts no longer reachable are not written on save);
+optimize_package() then minifies every XML part (whitespace between elements
+only, text content untouched) and rewrites the zip with each member deflated at
+the highest level or stored, whichever is smaller (embedded workbooks still
+shrink under deflate; media does not). If the rewrite comes out no smaller, the
+pruned package is written as python-pptx produced it.
+
+    stats = save_optimized(prs, "deck.pptx")
+"""
+from __future__ import annotations
+
+import io
+import zipfile
+import zlib
+from dataclasses import dataclass
+from typing import Dict, IO, Union
+
+from lxml import etree
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+
+XML_SUFFIXES = (".xml", ".rels")
+# Compressed media gains nothing from deflate; everything else is tried both ways
+STORED_SUFFIXES = (".png", ".jpg", ".jpeg", ".gif", ".mp4", ".m4a", ".wdp")
+_XML_SPACE = "{http://www.w3.org/XML/1998/namespace}space"
+_PARSER = etree.XMLParser(resolve_entities=False, huge_tree=True)
+
+
+@dataclass
+class OptimizeStats:
+    layouts_removed: int = 0
+    parts_dropped: int = 0
+    bytes_before: int = 0           # pruned package as python-pptx writes it
+    bytes_after: int = 0            # as written (never more than bytes_before)
+
+    def as_dict(self) -> Dict[str, int]:
+        return dict(vars(self))
+
+
+def _has_placeholders(part_element) -> bool:
+    return bool(part_element.xpath(".//p:nvPr/p:ph"))
+
+
+def optimize_presentation(prs, stats: OptimizeStats = None) -> OptimizeStats:
+    """Prune unused layouts, master placeholders and template leftovers in place."""
+    stats = stats or OptimizeStats()
+    for master in prs.slide_masters:
+        for layout in list(master.slide_layouts):
+            if not layout.used_by_slides:
+                master.slide_layouts.remove(layout)
+                stats.layouts_removed += 1
+
+    # Master placeholders only matter to layouts and slides that use placeholders
+    if not any(_has_placeholders(s._element) for s in prs.slides) and \
+            not any(_has_placeholders(l._element) for m in prs.slide_masters for l in m.slide_layouts):
+        for master in prs.slide_masters:
+            sp_tree = master.shapes._spTree
+            for sp in sp_tree.xpath("./p:sp[p:nvSpPr/p:nvPr/p:ph]"):
+                sp_tree.remove(sp)
+
+    # The template's thumbnail shows the template, not this deck
+    package = prs.part.package
+    for rId, rel in list(package._rels.items()):
+        if rel.reltype == RT.THUMBNAIL:
+            package._rels.pop(rId)
+            stats.parts_dropped += 1
+    for rId, rel in list(prs.part.rels.items()):
+        if rel.reltype == RT.PRINTER_SETTINGS:
+            prs.part.rels.pop(rId)
+            stats.parts_dropped += 1
+    return stats
+
+
+def minify_xml(blob: bytes) -> bytes:
+    """Drop whitespace-only text between elements; leaf text and xml:space="preserve" stay."""
+    root = etree.fromstring(blob, _PARSER)
+    for el in root.iter():
+        if not isinstance(el.tag, str):
+            continue
+        if len(el) and el.text is not None and not el.text.strip() and el.get(_XML_SPACE) != "preserve":
+            el.text = None
+        parent = el.getparent()
+        if el.tail is not None and not el.tail.strip() and \
+                (parent is None or parent.get(_XML_SPACE) != "preserve"):
+            el.tail = None
+    return etree.tostring(root, xml_declaration=True, encoding="UTF-8", standalone=True)
+
+
+def _deflate_helps(data: bytes, level: int) -> bool:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return len(compressor.compress(data)) + len(compressor.flush()) < len(data)
+
+
+def optimize_package(blob: bytes, level: int = 9) -> bytes:
+    """Rewrite a .pptx zip with minified XML and per-part compression."""
+    src = zipfile.ZipFile(io.BytesIO(blob))
+    names = src.namelist()
+    # [Content_Types].xml first, as Office writes it
+    names.sort(key=lambda n: n != "[Content_Types].xml")
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w") as zf:
+        for name in names:
+            data = src.read(name)
+            lower = name.lower()
+            if lower.endswith(XML_SUFFIXES):
+                try:
+                    data = minify_xml(data)
+                except etree.XMLSyntaxError:
+                    pass
+            if lower.endswith(STORED_SUFFIXES) or not _deflate_helps(data, level):
+                zf.writestr(name, data, compress_type=zipfile.ZIP_STORED)
+            else:
+                zf.writestr(name, data, compress_type=zipfile.ZIP_DEFLATED, compresslevel=level)
+    return out.getvalue()
+
+
+def save_optimized(prs, target: Union[str, IO[bytes]], level: int = 9) -> OptimizeStats:
+    """Prune, save, minify and re-zip `prs` to a path or writable binary stream."""
+    stats = optimize_presentation(prs)
+    buf = io.BytesIO()
+    prs.save(buf)
+    stats.bytes_before = buf.tell()
+    blob = optimize_package(buf.getvalue(), level)
+    if len(blob) >= stats.bytes_before:
+        blob = buf.getvalue()
+    stats.bytes_after = len(blob)
+    if isinstance(target, str):
+        with open(target, "wb") as f:
+            f.write(blob)
+    else:
+        target.write(blob)
+    print(f"[DEBUG] Package optimized: {stats.as_dict()}")
+    return stats
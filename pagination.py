@@ -0,0 +1,130 @@
+"""
+pagination.py
+Pagination stage that runs between normalize_plan and rendering.
+Splits oversized row collections (buyer tables, conglomerate lists, precedent
+transactions) across continuation slides using per-template capacity limits,
+and computes summary statistics once across the full set so every page of a
+split slide shows the same figures.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from plan_refs import RefError, RefResolver, resolve_slide_data, resolver_for
+from precedent_analytics import analyze_transactions
+
+# Maximum rows that fit on one slide for each paginated template
+PAGE_CAPACITY = {
+    "buyer_profiles": 6,
+    "sea_conglomerates": 4,
+    "precedent_transactions": 8,
+}
+
+CONTINUED_SUFFIX = " (cont'd)"
+
+_DEFAULT_TITLES = {
+    "buyer_profiles": "Potential Strategic Buyers",
+    "sea_conglomerates": "SEA Conglomerate Strategic Buyers",
+    "precedent_transactions": "Precedent Transactions Analysis",
+}
+
+
+def _get_rows(template: str, data: Any) -> Optional[List[Any]]:
+    """Return the row collection a template paginates over, or None."""
+    if template == "buyer_profiles" and isinstance(data, dict):
+        rows = data.get("table_rows")
+    elif template == "precedent_transactions" and isinstance(data, dict):
+        rows = data.get("transactions")
+    elif template == "sea_conglomerates":
+        if isinstance(data, list):
+            rows = data
+        elif isinstance(data, dict):
+            rows = data.get("conglomerates", data.get("data"))
+        else:
+            rows = None
+    else:
+        rows = None
+    return rows if isinstance(rows, list) else None
+
+
+def _with_rows(template: str, data: Any, rows: List[Any]) -> Dict[str, Any]:
+    """Return a copy of `data` (always a dict) holding `rows` in the template's row slot."""
+    if template == "sea_conglomerates":
+        page = {k: v for k, v in data.items() if k != "data"} if isinstance(data, dict) else {}
+        page["conglomerates"] = rows
+        return page
+    page = dict(data)
+    page["table_rows" if template == "buyer_profiles" else "transactions"] = rows
+    return page
+
+
+def transaction_summary(transactions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Median/mean/min/max/quartile EV/Revenue multiples across a full transaction set."""
+    return dict(analyze_transactions(transactions).summary)
+
+
+def paginate_slide(slide: Dict[str, Any], capacity: Optional[Dict[str, int]] = None,
+                   resolver: Optional[RefResolver] = None) -> List[Dict[str, Any]]:
+    """Split one slide into continuation slides if its rows exceed the template capacity."""
+    template = slide.get("template")
+    data = slide.get("data")
+    original = slide
+    # Rows held by reference must be resolved before they can be counted
+    if resolver is not None and template in PAGE_CAPACITY:
+        try:
+            data = resolve_slide_data(slide, data, resolver)
+        except RefError:
+            return [original]
+        slide = {k: v for k, v in slide.items() if k != "content_ir_key"}
+        slide["data"] = data
+    rows = _get_rows(template, data)
+    if rows is None:
+        return [original]
+    # Already paginated (the stage may run more than once on the same plan)
+    if isinstance(data, dict) and "__page" in data:
+        return [original]
+
+    summary = transaction_summary(rows) if template == "precedent_transactions" else None
+    limit = (capacity or PAGE_CAPACITY).get(template, 0)
+
+    if limit <= 0 or len(rows) <= limit:
+        if summary is None:
+            # Nothing to split: leave any references for the renderer to resolve
+            return [original]
+        return [{**slide, "data": {**data, "__summary": summary}}]
+
+    base_title = data.get("title") if isinstance(data, dict) else None
+    base_title = base_title or _DEFAULT_TITLES.get(template, "")
+    chunks = [rows[i:i + limit] for i in range(0, len(rows), limit)]
+
+    pages = []
+    for page_idx, chunk in enumerate(chunks):
+        page_data = _with_rows(template, data, chunk)
+        page_data["title"] = base_title if page_idx == 0 else base_title + CONTINUED_SUFFIX
+        page_data["__page"] = page_idx + 1
+        page_data["__page_count"] = len(chunks)
+        if summary is not None:
+            page_data["__summary"] = summary
+        pages.append({**slide, "data": page_data})
+    return pages
+
+
+def paginate_plan(plan: Dict[str, Any], capacity: Optional[Dict[str, int]] = None,
+                  content_ir: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Run pagination over every slide in a normalized render plan.
+    Pass `content_ir` when the plan may hold its rows as references into it.
+    A plan without a 'slides' list is returned unchanged, for the renderer to reject.
+    """
+    slides_in = plan.get("slides") if isinstance(plan, dict) else None
+    if not isinstance(slides_in, list):
+        return plan
+    resolver = resolver_for(content_ir) if isinstance(content_ir, dict) else None
+    slides_out = []
+    for s in slides_in:
+        if isinstance(s, dict):
+            slides_out.extend(paginate_slide(s, capacity, resolver))
+        else:
+            slides_out.append(s)
+    plan["slides"] = slides_out
+    return plan
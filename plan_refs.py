@@ -0,0 +1,148 @@
+"""
+plan_refs.py
+Reference-based render plans.
+Any value in a slide's data may be a JSON-pointer reference into the Content IR,
+e.g. {"$ref": "#/strategic_buyers"} or {"$ref": "#/facts/years"}, and a slide may
+carry a top-level `content_ir_key` naming the IR block that fills its main slot.
+References are resolved lazily, one slide at a time at render time, through a
+resolver whose pointer cache is shared by every slide rendered against the same IR.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+REF_KEY = "$ref"
+
+# Slot a list-valued content_ir_key fills for each template
+ROW_SLOTS = {
+    "buyer_profiles": "table_rows",
+    "precedent_transactions": "transactions",
+    "sea_conglomerates": "conglomerates",
+    "valuation_overview": "valuation_data",
+}
+
+_MISSING = object()
+_RESOLVERS_SIZE = 4
+_resolvers: "OrderedDict[int, Tuple[Any, RefResolver]]" = OrderedDict()
+
+
+class RefError(KeyError):
+    """Raised when a reference cannot be resolved against the Content IR."""
+
+
+def is_ref(value: Any) -> bool:
+    return isinstance(value, dict) and isinstance(value.get(REF_KEY), str)
+
+
+def _normalize_pointer(pointer: str) -> str:
+    """Accept '#/a/b', '/a/b' and a bare top-level key 'a'."""
+    if pointer.startswith("#"):
+        pointer = pointer[1:]
+    if pointer and not pointer.startswith("/"):
+        pointer = "/" + pointer
+    return pointer
+
+
+class RefResolver:
+    """Resolves JSON pointers against one Content IR document, caching each pointer."""
+
+    def __init__(self, document: Any):
+        self.document = document
+        self._cache: Dict[str, Any] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, pointer: str) -> Any:
+        pointer = _normalize_pointer(pointer)
+        cached = self._cache.get(pointer, _MISSING)
+        if cached is not _MISSING:
+            self.hits += 1
+            return cached
+        self.misses += 1
+        node = self.document
+        for token in pointer.split("/")[1:]:
+            token = token.replace("~1", "/").replace("~0", "~")
+            if isinstance(node, dict) and token in node:
+                node = node[token]
+            elif isinstance(node, list) and token.isdigit() and int(token) < len(node):
+                node = node[int(token)]
+            else:
+                raise RefError(f"Unresolved reference '#{pointer}'")
+        self._cache[pointer] = node
+        return node
+
+    def resolve(self, value: Any, _seen: Tuple[str, ...] = ()) -> Any:
+        """
+        Return a copy of `value` with every reference replaced by its target.
+        Sibling keys next to a `$ref` override fields of a dict target.
+        """
+        if is_ref(value):
+            pointer = _normalize_pointer(value[REF_KEY])
+            if pointer in _seen:
+                raise RefError(f"Circular reference '#{pointer}'")
+            target = self.resolve(self.lookup(pointer), _seen + (pointer,))
+            siblings = {k: self.resolve(v, _seen) for k, v in value.items() if k != REF_KEY}
+            if siblings and isinstance(target, dict):
+                return {**target, **siblings}
+            return target
+        if isinstance(value, dict):
+            return {k: self.resolve(v, _seen) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self.resolve(v, _seen) for v in value]
+        return value
+
+    def unresolved(self, value: Any, path: str = "data") -> List[str]:
+        """Paths of references in `value` that do not resolve (used by validation)."""
+        problems = []
+        if is_ref(value):
+            try:
+                self.resolve(value)
+            except RefError as e:
+                problems.append(f"{path}: {e.args[0]}")
+        elif isinstance(value, dict):
+            for k, v in value.items():
+                problems.extend(self.unresolved(v, f"{path}.{k}"))
+        elif isinstance(value, list):
+            for i, v in enumerate(value):
+                problems.extend(self.unresolved(v, f"{path}[{i}]"))
+        return problems
+
+
+def resolver_for(content_ir: Any) -> RefResolver:
+    """Shared resolver for a Content IR object, so its pointer cache spans the whole plan."""
+    key = id(content_ir)
+    entry = _resolvers.get(key)
+    if entry is not None and entry[0] is content_ir:
+        _resolvers.move_to_end(key)
+        return entry[1]
+    resolver = RefResolver(content_ir)
+    # The entry holds a reference to the document so its id cannot be reused while cached
+    _resolvers[key] = (content_ir, resolver)
+    if len(_resolvers) > _RESOLVERS_SIZE:
+        _resolvers.popitem(last=False)
+    return resolver
+
+
+def resolve_slide_data(slide: Dict[str, Any], data: Any, resolver: Optional[RefResolver]) -> Any:
+    """
+    Resolve a slide's references and apply its `content_ir_key`.
+    A list-valued key fills the template's row slot when that slot is missing or empty;
+    a dict-valued key is merged under the slide's own data. Explicit data always wins.
+    """
+    if resolver is None:
+        return data
+    content_key = slide.get("content_ir_key")
+    if content_key:
+        target = resolver.lookup(content_key)
+        template = slide.get("template")
+        slot = ROW_SLOTS.get(template)
+        if isinstance(target, list) and slot:
+            if isinstance(data, dict) and not data.get(slot):
+                data = {**data, slot: target}
+            elif not data:
+                data = {slot: target}
+        elif isinstance(target, dict) and isinstance(data, dict):
+            data = {**target, **data}
+    # resolve() rebuilds every container, so the IR itself is never handed to a renderer
+    return resolver.resolve(data)
@@ -0,0 +1,976 @@
+"""
+plan_validation.py
+Render plan normalizers and the per-slide validation the app runs before it
+renders, shared with the batch tools (brand fan-out) so every entry point
+renders the same normalized plan and rejects the same incomplete slides.
+
+    plan = normalize_plan(plan)
+    results = validate_individual_slides(content_ir, plan)
+    if not results["overall_valid"]: ...
+"""
+import os
+import re as _re
+
+import numpy as np
+
+from financial_metrics import compute_metrics, facts_consistency_issues
+from plan_refs import RefError, is_ref, resolver_for
+from text_metrics import text_overflow_warnings
+
+# COMPREHENSIVE SLIDE VALIDATION SYSTEM
+def validate_individual_slides(content_ir, render_plan):
+    """Validate each slide individually to ensure no empty boxes or missing content"""
+    
+    validation_results = {
+        'overall_valid': True,
+        'slide_validations': [],
+        'critical_issues': [],
+        'warnings': [],
+        'summary': {
+            'total_slides': 0,
+            'valid_slides': 0,
+            'invalid_slides': 0,
+            'slides_with_warnings': 0
+        }
+    }
+    
+    if not render_plan or 'slides' not in render_plan:
+        validation_results['critical_issues'].append("No render plan or slides found")
+        validation_results['overall_valid'] = False
+        return validation_results
+    
+    slides = render_plan['slides']
+    validation_results['summary']['total_slides'] = len(slides)
+    
+    if isinstance(content_ir, dict):
+        validation_results['warnings'].extend(facts_consistency_issues(content_ir.get('facts')))
+    
+    # Define validation rules for each template
+    template_validators = {
+        'business_overview': validate_business_overview_slide,
+        'investor_considerations': validate_investor_considerations_slide,
+        'product_service_footprint': validate_product_service_footprint_slide,
+        'product_service_overview': validate_product_service_overview_slide,
+        'buyer_profiles': validate_buyer_profiles_slide,
+        'historical_financial_performance': validate_historical_financial_performance_slide,
+        'management_team': validate_management_team_slide,
+        'growth_strategy_projections': validate_growth_strategy_slide,
+        'competitive_positioning': validate_competitive_positioning_slide,
+        'valuation_overview': validate_valuation_overview_slide,
+        'trading_comparables': validate_trading_comparables_slide,
+        'precedent_transactions': validate_precedent_transactions_slide,
+        'margin_cost_resilience': validate_margin_cost_resilience_slide,
+        'financial_summary': validate_financial_summary_slide,
+        'transaction_overview': validate_transaction_overview_slide,
+        'appendix': validate_appendix_slide,
+        'sea_conglomerates': validate_sea_conglomerates_slide
+    }
+    
+    # Validate each slide
+    for i, slide in enumerate(slides):
+        slide_num = i + 1
+        template = slide.get('template', 'unknown')
+        
+        slide_validation = {
+            'slide_number': slide_num,
+            'template': template,
+            'valid': True,
+            'issues': [],
+            'warnings': [],
+            'missing_fields': [],
+            'empty_fields': []
+        }
+        
+        # Basic slide structure validation
+        if not slide.get('data') and not slide.get('content_ir_key'):
+            slide_validation['issues'].append("Missing 'data' section")
+            slide_validation['valid'] = False
+        
+        # Every {"$ref": "#/..."} must point at something in the Content IR
+        if isinstance(content_ir, dict):
+            ref_issues = resolver_for(content_ir).unresolved(slide.get('data'))
+            if ref_issues:
+                slide_validation['issues'].extend(ref_issues)
+                slide_validation['valid'] = False
+        
+        # Template-specific validation
+        if template in template_validators:
+            template_validator = template_validators[template]
+            template_validation = template_validator(slide, content_ir)
+            
+            slide_validation['issues'].extend(template_validation.get('issues', []))
+            slide_validation['warnings'].extend(template_validation.get('warnings', []))
+            slide_validation['missing_fields'].extend(template_validation.get('missing_fields', []))
+            slide_validation['empty_fields'].extend(template_validation.get('empty_fields', []))
+            
+            if template_validation.get('issues') or template_validation.get('missing_fields') or template_validation.get('empty_fields'):
+                slide_validation['valid'] = False
+            
+            # Predicted text overflow (font metrics), so long strings are caught before rendering
+            slide_validation['warnings'].extend(text_overflow_warnings(template, slide.get('data')))
+        else:
+            slide_validation['warnings'].append(f"Unknown template type: {template}")
+        
+        # Update summary counts
+        if slide_validation['valid']:
+            validation_results['summary']['valid_slides'] += 1
+        else:
+            validation_results['summary']['invalid_slides'] += 1
+            validation_results['overall_valid'] = False
+        
+        if slide_validation['warnings']:
+            validation_results['summary']['slides_with_warnings'] += 1
+        
+        validation_results['slide_validations'].append(slide_validation)
+    
+    return validation_results
+
+# FIXED SLIDE-SPECIFIC VALIDATORS
+def validate_business_overview_slide(slide, content_ir):
+    """Validate business overview slide for completeness"""
+    validation = {'issues': [], 'warnings': [], 'missing_fields': [], 'empty_fields': []}
+    
+    data = slide.get('data', {})
+    
+    # Required fields for business overview
+    required_fields = {
+        'title': 'Slide title',
+        'description': 'Business description',
+        'highlights': 'Key highlights',
+        'services': 'Services/products list',
+        'positioning_desc': 'Market positioning description'
+    }
+    
+    for field, description in required_fields.items():
+        if field not in data:
+            validation['missing_fields'].append(f"Missing {description} ({field})")
+        elif not data[field] or (isinstance(data[field], list) and len(data[field]) == 0):
+            validation['empty_fields'].append(f"Empty {description} ({field})")
+        elif isinstance(data[field], str) and (data[field].strip() == '' or '[' in data[field]):
+            validation['empty_fields'].append(f"Placeholder or empty {description} ({field})")
+    
+    # Validate highlights array
+    if 'highlights' in data and isinstance(data['highlights'], list):
+        if len(data['highlights']) < 3:
+            validation['warnings'].append("Less than 3 highlights provided - consider adding more")
+        for i, highlight in enumerate(data['highlights']):
+            if not highlight or highlight.strip() == '' or '[' in highlight:
+                validation['empty_fields'].append(f"Empty highlight #{i+1}")
+    
+    # Validate services array
+    if 'services' in data and isinstance(data['services'], list):
+        if len(data['services']) < 2:
+            validation['warnings'].append("Less than 2 services listed - consider adding more")
+        for i, service in enumerate(data['services']):
+            if not service or service.strip() == '' or '[' in service:
+                validation['empty_fields'].append(f"Empty service #{i+1}")
+    
+    return validation
+
+def validate_product_service_footprint_slide(slide, content_ir):
+    """Validate product service footprint slide - the one with empty boxes"""
+    validation = {'issues': [], 'warnings': [], 'missing_fields': [], 'empty_fields': []}
+    
+    data = slide.get('data', {})
+    
+    # Required fields
+    if 'title' not in data or not data['title']:
+        validation['missing_fields'].append("Missing slide title")
+    
+    if 'services' not in data:
+        validation['missing_fields'].append("Missing services array")
+    elif not isinstance(data['services'], list) or len(data['services']) == 0:
+        validation['empty_fields'].append("Empty services array")
+    else:
+        # Validate each service entry
+        for i, service in enumerate(data['services']):
+            service_num = i + 1
+            if not isinstance(service, dict):
+                validation['issues'].append(f"Service #{service_num} is not a proper object")
+                continue
+                
+            if 'title' not in service or not service['title'] or service['title'].strip() == '':
+                validation['empty_fields'].append(f"Service #{service_num} missing title")
+            elif '[' in service['title']:
+                validation['empty_fields'].append(f"Service #{service_num} has placeholder title")
+                
+            if 'desc' not in service or not service['desc'] or service['desc'].strip() == '':
+                validation['empty_fields'].append(f"Service #{service_num} missing description")
+            elif '[' in service['desc']:
+                validation['empty_fields'].append(f"Service #{service_num} has placeholder description")
+    
+    # Check for market coverage data (right side of slide)
+    if 'coverage_table' in data:
+        coverage_data = data['coverage_table']
+        if not coverage_data or (isinstance(coverage_data, list) and len(coverage_data) == 0):
+            validation['empty_fields'].append("Empty coverage table section")
+    else:
+        validation['warnings'].append("No coverage table data - right side may appear empty")
+    
+    if 'metrics' in data:
+        metrics = data['metrics']
+        if not metrics or (isinstance(metrics, dict) and len(metrics) == 0):
+            validation['empty_fields'].append("Empty metrics section")
+    else:
+        validation['warnings'].append("No operational metrics - may result in empty boxes")
+    
+    return validation
+
+def validate_buyer_profiles_slide(slide, content_ir):
+    """Validate buyer profiles slide - FIXED to handle both approaches correctly"""
+    validation = {'issues': [], 'warnings': [], 'missing_fields': [], 'empty_fields': []}
+    
+    data = slide.get('data', {})
+    
+    # Check for content_ir_key (preferred) or table_rows (fallback)
+    has_content_ir_key = 'content_ir_key' in slide
+    has_table_rows = 'table_rows' in data
+    
+    if not has_content_ir_key and not has_table_rows:
+        validation['issues'].append("Missing content_ir_key - table will be empty")
+    elif has_content_ir_key:
+        content_key = slide['content_ir_key']
+        
+        # Verify the key (a top-level name or a "#/..." pointer) exists in content_ir and has data
+        try:
+            buyers = resolver_for(content_ir).lookup(content_key)
+        except RefError:
+            buyers = None
+            validation['issues'].append(f"content_ir_key '{content_key}' not found in Content IR")
+        if buyers is None:
+            pass
+        elif not buyers or len(buyers) == 0:
+            validation['empty_fields'].append(f"Empty {content_key} array in Content IR")
+        else:
+            # Validate buyer data completeness
+            if not isinstance(buyers, list):
+                validation['issues'].append(f"content_ir_key '{content_key}' should be an array")
+            else:
+                for i, buyer in enumerate(buyers):
+                    buyer_num = i + 1
+                    if not isinstance(buyer, dict):
+                        validation['issues'].append(f"Buyer #{buyer_num} should be an object")
+                        continue
+                    
+                    # Check for required buyer fields - FIXED for your data structure
+                    required_buyer_fields = ['buyer_name', 'strategic_rationale', 'fit']
+                    for field in required_buyer_fields:
+                        if field not in buyer:
+                            validation['empty_fields'].append(f"Buyer #{buyer_num} missing {field}")
+                        elif not buyer[field] or str(buyer[field]).strip() == '':
+                            validation['empty_fields'].append(f"Buyer #{buyer_num} has empty {field}")
+                        elif '[' in str(buyer[field]):
+                            validation['empty_fields'].append(f"Buyer #{buyer_num} has placeholder {field}")
+    
+    elif is_ref(data.get('table_rows')):
+        # Reference into the Content IR; unresolved references are reported per slide
+        pass
+    elif has_table_rows and not has_content_ir_key:
+        # Validate table_rows content - FIXED to handle your data structure
+        validation['warnings'].append("Using hardcoded table_rows - content_ir_key preferred for dynamic data")
+        
+        table_rows = data.get('table_rows', [])
+        if not table_rows or len(table_rows) == 0:
+            validation['empty_fields'].append("Empty table_rows array")
+        else:
+            for i, row in enumerate(table_rows):
+                row_num = i + 1
+                # Your table_rows contain dictionaries, not lists
+                if isinstance(row, dict):
+                    # Check if it has required fields
+                    required_fields = ['buyer_name', 'strategic_rationale']
+                    for field in required_fields:
+                        if field not in row or not row[field] or str(row[field]).strip() == '':
+                            validation['empty_fields'].append(f"Table row #{row_num} missing or empty {field}")
+                elif isinstance(row, list):
+                    if len(row) == 0:
+                        validation['empty_fields'].append(f"Table row #{row_num} is empty")
+                    else:
+                        for j, cell in enumerate(row):
+                            cell_num = j + 1
+                            if not cell or str(cell).strip() == '' or '[' in str(cell):
+                                validation['empty_fields'].append(f"Table row #{row_num}, cell #{cell_num} is empty or placeholder")
+                else:
+                    validation['empty_fields'].append(f"Table row #{row_num} has invalid structure")
+    
+    # Validate required fields
+    required_fields = ['title', 'table_headers']
+    for field in required_fields:
+        if field not in data:
+            validation['missing_fields'].append(f"Missing {field}")
+        elif not data[field]:
+            validation['empty_fields'].append(f"Empty {field}")
+        elif field == 'table_headers' and isinstance(data[field], list):
+            if len(data[field]) < 2:
+                validation['warnings'].append("Less than 2 table headers - table may look incomplete")
+            for i, header in enumerate(data[field]):
+                if not header or str(header).strip() == '':
+                    validation['empty_fields'].append(f"Table header #{i+1} is empty")
+    
+    return validation
+
+def validate_management_team_slide(slide, content_ir):
+    """Validate management team slide - FIXED for correct field names"""
+    validation = {'issues': [], 'warnings': [], 'missing_fields': [], 'empty_fields': []}
+    
+    # Check if using content_ir_key approach
+    if 'content_ir_key' in slide:
+        content_key = slide['content_ir_key']
+        if content_key not in content_ir:
+            validation['issues'].append(f"content_ir_key '{content_key}' not found in Content IR")
+            return validation
+        mgmt_data = content_ir[content_key]
+    else:
+        # Check data section
+        data = slide.get('data', {})
+        if 'management_team' not in content_ir:
+            validation['issues'].append("No management_team data in Content IR")
+            return validation
+        mgmt_data = content_ir['management_team']
+    
+    # Check for required profile arrays
+    for column in ['left_column_profiles', 'right_column_profiles']:
+        if column not in mgmt_data:
+            validation['missing_fields'].append(f"Missing {column}")
+        elif not isinstance(mgmt_data[column], list) or len(mgmt_data[column]) == 0:
+            validation['empty_fields'].append(f"Empty {column}")
+        else:
+            # Validate individual profiles - FIXED FIELD NAMES
+            for i, profile in enumerate(mgmt_data[column]):
+                profile_num = i + 1
+                # Check for the CORRECT field names used in your data
+                required_profile_fields = ['role_title', 'experience_bullets']
+                for field in required_profile_fields:
+                    if field not in profile or not profile[field]:
+                        validation['empty_fields'].append(f"{column} profile #{profile_num} missing/placeholder {field}")
+                    elif field == 'role_title' and '[' in str(profile[field]):
+                        validation['empty_fields'].append(f"{column} profile #{profile_num} missing/placeholder {field}")
+                    elif field == 'experience_bullets' and (not isinstance(profile[field], list) or len(profile[field]) == 0):
+                        validation['empty_fields'].append(f"{column} profile #{profile_num} missing/placeholder {field}")
+    
+    return validation
+
+def validate_historical_financial_performance_slide(slide, content_ir):
+    """Validate historical financial performance slide"""
+    validation = {'issues': [], 'warnings': [], 'missing_fields': [], 'empty_fields': []}
+    
+    data = slide.get('data', {})
+    
+    # Required fields for historical financial performance
+    required_fields = {
+        'title': 'Slide title',
+        'chart': 'Financial performance chart data',
+        'key_metrics': 'Key financial metrics'
+    }
+    
+    # Chart series and key metrics can be derived from content_ir facts at render time
+    metrics = compute_metrics((content_ir or {}).get('facts'))
+    if metrics is not None:
+        for field in ('chart', 'key_metrics'):
+            if not data.get(field):
+                required_fields.pop(field)
+                validation['warnings'].append(f"No {field} in plan - derived from content_ir facts")
+    
+    for field, description in required_fields.items():
+        if field not in data:
+            validation['missing_fields'].append(f"Missing {description}")
+        elif not data[field]:
+            validation['empty_fields'].append(f"Empty {description}")
+    
+    # Validate chart data; only series left empty are derived from the facts
+    chart = data.get('chart')
+    if chart and not isinstance(chart, dict):
+        validation['issues'].append("Chart data must be an object with categories, revenue and ebitda")
+    elif isinstance(chart, dict) and (chart or metrics is None):
+        chart_required = ['categories', 'revenue', 'ebitda']
+        for field in chart_required:
+            if not chart.get(field):
+                if metrics is None:
+                    validation['empty_fields'].append(f"Missing chart {field} data")
+            elif not isinstance(chart[field], list):
+                validation['issues'].append(f"Chart {field} must be a list")
+        series = [chart.get(field) for field in chart_required]
+        if all(isinstance(s, list) and s for s in series) and len({len(s) for s in series}) > 1:
+            validation['issues'].append("Chart categories, revenue and ebitda have different lengths")
+    
+    # Validate key metrics
+    if 'key_metrics' in data and isinstance(data['key_metrics'], dict):
+        metrics = data['key_metrics']
+        if 'metrics' in metrics and isinstance(metrics['metrics'], list):
+            if len(metrics['metrics']) < 3:
+                validation['warnings'].append("Less than 3 key metrics - consider adding more")
+        else:
+            validation['empty_fields'].append("Missing metrics array in key_metrics")
+    
+    return validation
+
+def validate_growth_strategy_slide(slide, content_ir):
+    """Validate growth strategy slide"""
+    validation = {'issues': [], 'warnings': [], 'missing_fields': [], 'empty_fields': []}
+    
+    data = slide.get('data', {})
+    
+    # Get actual data structure - check for slide_data wrapper
+    if 'slide_data' in data:
+        actual_data = data['slide_data']
+    else:
+        actual_data = data
+    
+    # Required fields for growth strategy
+    required_fields = {
+        'title': 'Slide title',
+        'growth_strategy': 'Growth strategy section',
+        'financial_projections': 'Financial projections'
+    }
+    
+    for field, description in required_fields.items():
+        if field not in actual_data:
+            validation['missing_fields'].append(f"Missing {description}")
+        elif not actual_data[field]:
+            validation['empty_fields'].append(f"Empty {description}")
+    
+    # Validate growth strategy
+    if 'growth_strategy' in actual_data and isinstance(actual_data['growth_strategy'], dict):
+        growth_strat = actual_data['growth_strategy']
+        if 'strategies' in growth_strat and isinstance(growth_strat['strategies'], list):
+            if len(growth_strat['strategies']) < 3:
+                validation['warnings'].append("Less than 3 growth strategies - consider adding more")
+        else:
+            validation['empty_fields'].append("Missing strategies array in growth_strategy")
+    
+    return validation
+
+def validate_competitive_positioning_slide(slide, content_ir):
+    """Validate competitive positioning slide - FIXED for correct field names"""
+    validation = {'issues': [], 'warnings': [], 'missing_fields': [], 'empty_fields': []}
+    
+    data = slide.get('data', {})
+    
+    # FIXED: Use the correct field names from your data structure
+    required_fields = {
+        'title': 'Slide title',
+        'competitors': 'Competitors list',
+        'advantages': 'Competitive advantages'  # FIXED from 'competitive_advantages'
+    }
+    
+    for field, description in required_fields.items():
+        if field not in data:
+            validation['missing_fields'].append(f"Missing {description}")
+        elif not data[field]:
+            validation['empty_fields'].append(f"Empty {description}")
+    
+    # Validate competitors array - FIXED for correct structure
+    if 'competitors' in data and isinstance(data['competitors'], list):
+        if len(data['competitors']) < 3:
+            validation['warnings'].append("Less than 3 competitors listed - consider adding more")
+        for i, competitor in enumerate(data['competitors']):
+            comp_num = i + 1
+            # Your data structure has 'name' and 'revenue' - not strengths/weaknesses
+            if isinstance(competitor, dict):
+                if 'name' not in competitor or not competitor['name']:
+                    validation['empty_fields'].append(f"Competitor #{comp_num} missing name")
+                if 'revenue' not in competitor or not competitor['revenue']:
+                    validation['empty_fields'].append(f"Competitor #{comp_num} missing revenue")
+            elif not competitor or '[' in str(competitor):
+                validation['empty_fields'].append(f"Competitor #{comp_num} is empty or placeholder")
+    
+    # Check assessment table
+    if 'assessment' in data:
+        assessment = data['assessment']
+        if not assessment or not isinstance(assessment, list) or len(assessment) == 0:
+            validation['empty_fields'].append("Empty competitive assessment table")
+    else:
+        validation['warnings'].append("No competitive assessment table")
+    
+    # Check for barriers and advantages
+    for section in ['barriers', 'advantages']:
+        if section in data and isinstance(data[section], list):
+            for i, item in enumerate(data[section]):
+                if isinstance(item, dict):
+                    if not item.get('title') or not item.get('desc'):
+                        validation['empty_fields'].append(f"{section.title()} #{i+1} missing title or description")
+    
+    return validation
+
+def validate_valuation_overview_slide(slide, content_ir):
+    """Validate valuation overview slide - FIXED for correct field names"""
+    validation = {'issues': [], 'warnings': [], 'missing_fields': [], 'empty_fields': []}
+    
+    data = slide.get('data', {})
+    
+    # FIXED: Use the correct field names from your data structure
+    required_fields = {
+        'title': 'Slide title',
+        'valuation_data': 'Valuation methodologies data'  # FIXED
+    }
+    
+    for field, description in required_fields.items():
+        if field not in data:
+            validation['missing_fields'].append(f"Missing {description}")
+        elif not data[field]:
+            validation['empty_fields'].append(f"Empty {description}")
+    
+    # Validate valuation_data array
+    if 'valuation_data' in data and isinstance(data['valuation_data'], list):
+        if len(data['valuation_data']) < 2:
+            validation['warnings'].append("Less than 2 valuation methodologies - consider adding more")
+        for i, method in enumerate(data['valuation_data']):
+            method_num = i + 1
+            if isinstance(method, dict):
+                required_method_fields = ['methodology', 'enterprise_value', 'commentary']
+                for field in required_method_fields:
+                    if field not in method or not method[field]:
+                        validation['empty_fields'].append(f"Methodology #{method_num} missing {field}")
+            elif not method or '[' in str(method):
+                validation['empty_fields'].append(f"Methodology #{method_num} is empty or placeholder")
+    
+    return validation
+
+def validate_trading_comparables_slide(slide, content_ir):
+    """Validate trading comparables slide"""
+    validation = {'issues': [], 'warnings': [], 'missing_fields': [], 'empty_fields': []}
+    
+    data = slide.get('data', {})
+    
+    # Required fields
+    required_fields = {
+        'title': 'Slide title',
+        'comparable_companies': 'Comparable companies list',
+        'metrics': 'Financial metrics comparison'
+    }
+    
+    for field, description in required_fields.items():
+        if field not in data:
+            validation['missing_fields'].append(f"Missing {description}")
+        elif not data[field]:
+            validation['empty_fields'].append(f"Empty {description}")
+    
+    # Validate comparable companies
+    if 'comparable_companies' in data and isinstance(data['comparable_companies'], list):
+        if len(data['comparable_companies']) < 4:
+            validation['warnings'].append("Less than 4 comparable companies - consider adding more")
+        for i, company in enumerate(data['comparable_companies']):
+            comp_num = i + 1
+            if isinstance(company, dict):
+                required_comp_fields = ['name', 'market_cap', 'revenue', 'ebitda_multiple']
+                for field in required_comp_fields:
+                    if field not in company or not company[field]:
+                        validation['empty_fields'].append(f"Comparable #{comp_num} missing {field}")
+                    elif '[' in str(company[field]):
+                        validation['empty_fields'].append(f"Comparable #{comp_num} has placeholder {field}")
+    
+    return validation
+
+def validate_precedent_transactions_slide(slide, content_ir):
+    """Validate precedent transactions slide"""
+    validation = {'issues': [], 'warnings': [], 'missing_fields': [], 'empty_fields': []}
+    
+    data = slide.get('data', {})
+    
+    # Required fields
+    required_fields = {
+        'title': 'Slide title',
+        'transactions': 'Precedent transactions list'
+    }
+    
+    for field, description in required_fields.items():
+        if field not in data:
+            validation['missing_fields'].append(f"Missing {description}")
+        elif not data[field]:
+            validation['empty_fields'].append(f"Empty {description}")
+    
+    # Validate transactions
+    if 'transactions' in data and isinstance(data['transactions'], list):
+        if len(data['transactions']) < 3:
+            validation['warnings'].append("Less than 3 precedent transactions - consider adding more")
+        for i, transaction in enumerate(data['transactions']):
+            trans_num = i + 1
+            if isinstance(transaction, dict):
+                required_trans_fields = ['target', 'acquirer', 'date', 'enterprise_value', 'revenue', 'ev_revenue_multiple']
+                for field in required_trans_fields:
+                    if field not in transaction or not transaction[field]:
+                        validation['empty_fields'].append(f"Transaction #{trans_num} missing {field}")
+                    elif '[' in str(transaction[field]):
+                        validation['empty_fields'].append(f"Transaction #{trans_num} has placeholder {field}")
+    
+    return validation
+
+def validate_margin_cost_resilience_slide(slide, content_ir):
+    """Validate margin/cost resilience slide - FIXED for correct field names"""
+    validation = {'issues': [], 'warnings': [], 'missing_fields': [], 'empty_fields': []}
+    
+    data = slide.get('data', {})
+    
+    # FIXED: Use the correct field names from your data structure
+    required_fields = {
+        'title': 'Slide title',
+        'cost_management': 'Cost management initiatives',  # FIXED
+        'risk_mitigation': 'Risk mitigation strategies'     # FIXED
+    }
+    
+    for field, description in required_fields.items():
+        if field not in data:
+            validation['missing_fields'].append(f"Missing {description}")
+        elif not data[field]:
+            validation['empty_fields'].append(f"Empty {description}")
+    
+    # Validate cost management items
+    if 'cost_management' in data:
+        cost_mgmt = data['cost_management']
+        if isinstance(cost_mgmt, dict) and 'items' in cost_mgmt:
+            items = cost_mgmt['items']
+            if not items or len(items) == 0:
+                validation['empty_fields'].append("Empty cost management items")
+            else:
+                for i, item in enumerate(items):
+                    if not isinstance(item, dict):
+                        validation['empty_fields'].append(f"Cost management item #{i+1} is not properly structured")
+                    elif not item.get('title') or not item.get('description'):
+                        validation['empty_fields'].append(f"Cost management item #{i+1} missing title or description")
+    
+    # Validate risk mitigation
+    if 'risk_mitigation' in data:
+        risk_mit = data['risk_mitigation']
+        if isinstance(risk_mit, dict):
+            if 'main_strategy' not in risk_mit:
+                validation['missing_fields'].append("Missing main strategy in risk mitigation")
+    
+    # Check a hand-written margin series against the facts it should be derived from
+    metrics = compute_metrics((content_ir or {}).get('facts'))
+    values = (data.get('chart_data') or {}).get('values') if isinstance(data.get('chart_data'), dict) else None
+    if metrics is not None and isinstance(values, list) and len(values) == len(metrics.margins):
+        try:
+            diffs = np.abs(np.array(values, dtype=float) - metrics.margins)
+            if np.nanmax(diffs) > 0.5:
+                validation['warnings'].append("chart_data values do not match EBITDA / revenue from content_ir facts - omit them to derive automatically")
+        except (TypeError, ValueError):
+            validation['issues'].append("chart_data values must be numbers")
+        
+    return validation
+
+def validate_investor_considerations_slide(slide, content_ir):
+    """Validate investor considerations slide"""
+    validation = {'issues': [], 'warnings': [], 'missing_fields': [], 'empty_fields': []}
+    
+    data = slide.get('data', {})
+    
+    required_fields = {
+        'title': 'Slide title',
+        'considerations': 'Investment considerations list',
+        'mitigants': 'Risk mitigants list'
+    }
+    
+    for field, description in required_fields.items():
+        if field not in data:
+            validation['missing_fields'].append(f"Missing {description}")
+        elif not data[field] or (isinstance(data[field], list) and len(data[field]) == 0):
+            validation['empty_fields'].append(f"Empty {description}")
+    
+    return validation
+
+def validate_financial_summary_slide(slide, content_ir):
+    """Validate financial summary slide"""
+    validation = {'issues': [], 'warnings': [], 'missing_fields': [], 'empty_fields': []}
+    
+    data = slide.get('data', {})
+    
+    required_fields = {
+        'title': 'Slide title',
+        'key_metrics': 'Key financial metrics',
+        'performance_highlights': 'Performance highlights'
+    }
+    
+    for field, description in required_fields.items():
+        if field not in data:
+            validation['missing_fields'].append(f"Missing {description}")
+        elif not data[field]:
+            validation['empty_fields'].append(f"Empty {description}")
+    
+    return validation
+
+def validate_transaction_overview_slide(slide, content_ir):
+    """Validate transaction overview slide"""
+    validation = {'issues': [], 'warnings': [], 'missing_fields': [], 'empty_fields': []}
+    
+    data = slide.get('data', {})
+    
+    required_fields = {
+        'title': 'Slide title',
+        'transaction_structure': 'Transaction structure',
+        'key_terms': 'Key transaction terms',
+        'timeline': 'Transaction timeline'
+    }
+    
+    for field, description in required_fields.items():
+        if field not in data:
+            validation['missing_fields'].append(f"Missing {description}")
+        elif not data[field]:
+            validation['empty_fields'].append(f"Empty {description}")
+    
+    return validation
+
+def validate_product_service_overview_slide(slide, content_ir):
+    """Validate product/service overview slide"""
+    validation = {'issues': [], 'warnings': [], 'missing_fields': [], 'empty_fields': []}
+    
+    data = slide.get('data', {})
+    
+    # Required fields
+    required_fields = {
+        'title': 'Slide title',
+        'products': 'Products list',
+        'market_position': 'Market positioning'
+    }
+    
+    for field, description in required_fields.items():
+        if field not in data:
+            validation['missing_fields'].append(f"Missing {description}")
+        elif not data[field]:
+            validation['empty_fields'].append(f"Empty {description}")
+    
+    return validation
+
+def validate_appendix_slide(slide, content_ir):
+    """Validate appendix slide"""
+    validation = {'issues': [], 'warnings': [], 'missing_fields': [], 'empty_fields': []}
+    
+    data = slide.get('data', {})
+    
+    if 'title' not in data or not data['title']:
+        validation['missing_fields'].append("Missing appendix title")
+    
+    return validation
+
+def validate_sea_conglomerates_slide(slide, content_ir):
+    """Validate SEA conglomerates slide"""
+    validation = {'issues': [], 'warnings': [], 'missing_fields': [], 'empty_fields': []}
+    
+    data = slide.get('data', [])
+    
+    if not data or len(data) == 0:
+        validation['empty_fields'].append("Empty conglomerates data")
+    else:
+        for i, conglomerate in enumerate(data):
+            cong_num = i + 1
+            if isinstance(conglomerate, dict):
+                required_fields = ['name', 'country', 'description']
+                for field in required_fields:
+                    if field not in conglomerate or not conglomerate[field]:
+                        validation['empty_fields'].append(f"Conglomerate #{cong_num} missing {field}")
+    
+    return validation
+
+# --- BEGIN: Auto-convert buyer_profiles with financials → sea_conglomerates ---
+
+AUTO_USE_SEA_CONGLOMERATES = os.getenv("AUTO_USE_SEA_CONGLOMERATES", "1") not in ("0","false","False","no","No")
+
+_FINANCE_HINTS = {"revenue","ebitda","market_cap","net_income","profit","earnings","margin","ticker","ownership","assets","liabilities","enterprise_value","ev","valuation"}
+
+def _extract_country_from_name(name: str) -> str:
+    # e.g., "Yamazaki Baking Co. (Japan)" -> "Japan"
+    if not isinstance(name, str):
+        return ""
+    m = _re.search(r"\(([^)]+)\)\s*$", name.strip())
+    return m.group(1).strip() if m else ""
+
+def _dict_row_has_finance(r: dict) -> bool:
+    keys = {k.lower() for k in r.keys()}
+    return any(k in keys for k in _FINANCE_HINTS)
+
+def _headers_have_finance(headers) -> bool:
+    if not isinstance(headers, list): return False
+    hl = [str(h).strip().lower() for h in headers]
+    return any(any(hint in h for hint in _FINANCE_HINTS) for h in hl)
+
+def convert_buyer_profiles_to_sea_conglomerates(slide: dict) -> dict:
+    """
+    If buyer_profiles contains financial fields (dict rows or finance headers),
+    convert to sea_conglomerates template with concise description lines.
+    """
+    if slide.get("template") != "buyer_profiles" or not AUTO_USE_SEA_CONGLOMERATES:
+        return slide
+
+    data = slide.get("data", {})
+    rows = data.get("table_rows", [])
+    headers = data.get("table_headers", [])
+    if is_ref(rows):
+        return slide  # rows live in the Content IR; leave them to the renderer
+
+    finance_mode = False
+    dict_rows = []
+    if isinstance(rows, list) and rows and isinstance(rows[0], dict):
+        dict_rows = rows
+        finance_mode = any(_dict_row_has_finance(r) for r in dict_rows)
+    elif _headers_have_finance(headers):
+        finance_mode = True
+
+    if not finance_mode:
+        return slide  # no conversion
+
+    items = []
+    if dict_rows:
+        for r in dict_rows:
+            name = r.get("buyer_name") or r.get("name","")
+            country = r.get("country") or _extract_country_from_name(name)
+            parts = []
+
+            # Financials first if present
+            for k in ("revenue","ebitda","market_cap","net_income","margin","enterprise_value","valuation","ownership","ticker"):
+                v = r.get(k)
+                if v not in (None, ""):
+                    label = k.replace("_"," ").title()
+                    parts.append(f"{label}: {v}")
+
+            # Then rationale/synergies for context
+            if r.get("strategic_rationale"):
+                parts.append(f"Rationale: {r.get('strategic_rationale')}")
+            if r.get("key_synergies"):
+                parts.append(f"Synergies: {r.get('key_synergies')}")
+
+            desc = " • ".join(parts) if parts else "—"
+            items.append({"name": name, "country": country, "description": desc})
+    else:
+        # If rows are arrays and headers include finance terms, map by position
+        # Build index mapping from headers
+        idx = {h.strip().lower(): i for i, h in enumerate(headers) if isinstance(h, str)}
+        for r in rows:
+            name = r[idx.get("buyer name", 0)] if isinstance(r, list) and len(r)>0 else ""
+            country = _extract_country_from_name(name)
+            parts = []
+            for hint in list(_FINANCE_HINTS):
+                pos = None
+                # try exact header match or contains
+                for h, i in idx.items():
+                    if hint in h:
+                        pos = i; break
+                if pos is not None and isinstance(r, list) and len(r)>pos:
+                    v = r[pos]
+                    if v not in (None, ""):
+                        label = hint.replace("_"," ").title()
+                        parts.append(f"{label}: {v}")
+            # Try rationale/synergies columns
+            for key in ["strategic rationale","rationale","key synergies","synergies"]:
+                if key in idx and len(r)>idx[key]:
+                    val = r[idx[key]]
+                    if val not in (None, ""):
+                        parts.append(f"{key.title()}: {val}")
+            desc = " • ".join(parts) if parts else "—"
+            items.append({"name": name, "country": country, "description": desc})
+
+    # Build the new slide
+    new_slide = {
+        "template": "sea_conglomerates",
+        "data": items
+    }
+    # Preserve original title as an optional leading descriptor if present
+    if isinstance(data, dict) and "title" in data:
+        # Some renderers might read title; we prepend a descriptor row
+        pass
+
+    return new_slide
+# --- END: Auto-convert ---
+# --- BEGIN: Normalizers to prevent blank cells and schema drift ---
+def normalize_buyer_profiles_slide(slide: dict) -> dict:
+    if slide.get("template") != "buyer_profiles":
+        return slide
+    d = slide.setdefault("data", {})
+
+    headers = d.get("table_headers") or ["Buyer Profile", "Strategic Rationale", "Key Synergies", "Concerns", "Fit"]
+    if len(headers) == 4 and headers[-1].lower().startswith("fit"):
+        headers = [headers[0], headers[1], headers[2], "Concerns", headers[3]]
+    d["table_headers"] = headers[:5]
+
+    if is_ref(d.get("table_rows")):
+        d.setdefault("subtitle", "")
+        d.setdefault("company", slide.get("company") or "")
+        return slide
+
+    fixed_rows = []
+    for r in d.get("table_rows", []):
+        if isinstance(r, list):
+            r = {
+                "buyer_name":          (r[0] if len(r) > 0 else ""),
+                "strategic_rationale": (r[1] if len(r) > 1 else ""),
+                "key_synergies":       (r[2] if len(r) > 2 else ""),
+                "concerns":            (r[3] if len(r) > 3 else ""),
+                "fit_score":           (r[4] if len(r) > 4 else ""),
+            }
+        else:
+            r = dict(r)
+            r["buyer_name"]          = r.get("buyer_name") or r.get("name", "")
+            r["strategic_rationale"] = r.get("strategic_rationale") or r.get("rationale", "")
+            r["key_synergies"]       = r.get("key_synergies") or r.get("synergies", "")
+            r["concerns"]            = r.get("concerns", "")
+            r["fit_score"]           = r.get("fit_score") or r.get("fit", "")
+        fixed_rows.append(r)
+    d["table_rows"] = fixed_rows
+
+    d.setdefault("subtitle", d.get("subtitle", ""))
+    d.setdefault("company", slide.get("company") or "")
+    return slide
+
+
+def normalize_valuation_overview_slide(slide: dict) -> dict:
+    if slide.get("template") != "valuation_overview":
+        return slide
+    d = slide.setdefault("data", {})
+    rows = d.get("valuation_data", [])
+
+    any_22a = False
+    any_23e = False
+    any_metric = False
+
+    for r in rows:
+        meth = (r.get("methodology") or "").lower()
+        if not r.get("metric"):
+            if "precedent" in meth or "trading" in meth:
+                r["metric"] = "EV/Revenue"
+            elif "dcf" in meth or "discounted" in meth:
+                r["metric"] = "DCF"
+        any_metric = any_metric or bool(r.get("metric"))
+
+        if "22a_multiple" not in r:
+            r["22a_multiple"] = r.get("22A_multiple") or r.get("FY22_multiple") or "-"
+        if "23e_multiple" not in r:
+            r["23e_multiple"] = r.get("23E_multiple") or r.get("FY23E_multiple") or "-"
+
+        if not r.get("methodology_type"):
+            if "precedent" in meth:
+                r["methodology_type"] = "precedent_transactions"
+            elif "trading" in meth:
+                r["methodology_type"] = "trading_comps"
+            elif "dcf" in meth or "discounted" in meth:
+                r["methodology_type"] = "dcf"
+
+        any_22a = any_22a or (r.get("22a_multiple") not in ("", None))
+        any_23e = any_23e or (r.get("23e_multiple") not in ("", None))
+
+    d["__hide_metric_col"]  = not any_metric
+    d["__hide_22a_col"]     = not any_22a
+    d["__hide_23e_col"]     = not any_23e
+    return slide
+
+
+def normalize_plan(plan: dict) -> dict:
+    try:
+        slides_in = plan.get("slides", [])
+    except Exception:
+        return plan
+    slides_out = []
+    for s in slides_in:
+        # Convert finance-heavy buyer profiles into SEA Conglomerates slide first
+        s = convert_buyer_profiles_to_sea_conglomerates(s)
+        # Then run standard normalizers
+        s = normalize_buyer_profiles_slide(s)
+        s = normalize_valuation_overview_slide(s)
+        slides_out.append(s)
+    plan["slides"] = slides_out
+    return plan
+    slides_out = []
+    for s in slides_in:
+        s = normalize_buyer_profiles_slide(s)
+        s = normalize_valuation_overview_slide(s)
+        slides_out.append(s)
+    plan["slides"] = slides_out
+    return plan
+# --- END: Normalizers ---
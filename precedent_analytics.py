@@ -0,0 +1,145 @@
+"""
+precedent_analytics.py
+Columnar precedent-transaction analytics.
+Loads a transaction list into a pandas frame once and computes the consistency
+checks, outlier flags, quartiles and bar scaling vectorized, so the validator,
+the pagination stage and the renderer all share the same numbers instead of each
+looping over the rows. Frames are cached by a hash of the transaction rows.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+NUMERIC_COLUMNS = ["enterprise_value", "revenue", "ev_revenue_multiple"]
+TEXT_COLUMNS = ["date", "target", "acquirer", "country"]
+
+# Same tolerance as json_clean_validate.approx_equal
+MULTIPLE_REL_TOLERANCE = 0.02
+# Tukey fences for outlier flags
+OUTLIER_IQR_FACTOR = 1.5
+
+# Bar geometry used by render_precedent_transactions_slide (inches)
+BAR_INCHES_PER_X = 0.6
+BAR_MAX_INCHES = 1.7
+BAR_MIN_INCHES = 0.1
+
+_CACHE_SIZE = 32
+_cache: "OrderedDict[str, PrecedentAnalytics]" = OrderedDict()
+
+
+@dataclass
+class PrecedentAnalytics:
+    frame: pd.DataFrame
+    summary: Dict[str, Any]
+
+    def inconsistent_rows(self) -> pd.DataFrame:
+        """Rows whose stated multiple is not ~ EV/Revenue."""
+        return self.frame[~self.frame["multiple_consistent"]]
+
+    def outlier_rows(self) -> pd.DataFrame:
+        return self.frame[self.frame["outlier"]]
+
+    def bar_heights(self, max_multiple: Optional[float] = None) -> np.ndarray:
+        """
+        Bar heights in inches for each row. `max_multiple` lets a paginated slide scale
+        against the full set rather than just its own page.
+        """
+        multiples = self.frame["ev_revenue_multiple"].to_numpy(dtype=float)
+        if max_multiple is None:
+            max_multiple = self.summary.get("max_multiple") or 0.0
+        per_x = min(BAR_INCHES_PER_X, BAR_MAX_INCHES / max_multiple) if max_multiple > 0 else BAR_INCHES_PER_X
+        heights = np.where(np.nan_to_num(multiples) > 0, np.nan_to_num(multiples) * per_x, BAR_MIN_INCHES)
+        return heights
+
+
+def _coerce_numeric(values: pd.Series) -> pd.Series:
+    """Numbers stay numbers; strings, bools and missing values become NaN."""
+    mask = values.map(lambda v: isinstance(v, (int, float)) and not isinstance(v, bool))
+    return pd.to_numeric(values.where(mask), errors="coerce").astype(float)
+
+
+def load_frame(transactions: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Build the columnar frame with the derived check columns."""
+    rows = [t if isinstance(t, dict) else {} for t in (transactions or [])]
+    df = pd.DataFrame.from_records(rows)
+    for col in TEXT_COLUMNS + NUMERIC_COLUMNS:
+        if col not in df.columns:
+            df[col] = np.nan
+    for col in NUMERIC_COLUMNS:
+        df[col] = _coerce_numeric(df[col])
+
+    ev = df["enterprise_value"].to_numpy()
+    rev = df["revenue"].to_numpy()
+    mult = df["ev_revenue_multiple"].to_numpy()
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        implied = np.where(rev != 0, ev / rev, np.nan)
+        denom = np.maximum(np.abs(implied), np.abs(mult))
+        rel_diff = np.abs(implied - mult) / denom
+    both_zero = (implied == 0) & (mult == 0)
+    one_zero = ((implied == 0) | (mult == 0)) & ~both_zero
+    consistent = np.where(
+        both_zero, True,
+        np.where(one_zero, np.abs(implied - mult) < 1e-6, rel_diff <= MULTIPLE_REL_TOLERANCE),
+    )
+    # Rows we cannot check (missing numbers or zero revenue) are not flagged here;
+    # the structural validators report those separately.
+    checkable = ~np.isnan(implied) & ~np.isnan(mult)
+    df["implied_multiple"] = implied
+    df["multiple_consistent"] = np.where(checkable, consistent, True).astype(bool)
+
+    valid = mult[~np.isnan(mult)]
+    if valid.size:
+        q1, q3 = np.percentile(valid, [25, 75])
+        iqr = q3 - q1
+        low, high = q1 - OUTLIER_IQR_FACTOR * iqr, q3 + OUTLIER_IQR_FACTOR * iqr
+        df["outlier"] = ((mult < low) | (mult > high)) & ~np.isnan(mult)
+    else:
+        df["outlier"] = False
+    df["outlier"] = df["outlier"].astype(bool)
+    return df
+
+
+def _summarize(df: pd.DataFrame) -> Dict[str, Any]:
+    mult = df["ev_revenue_multiple"].dropna()
+    if mult.empty:
+        return {"count": 0}
+    q1, median, q3 = mult.quantile([0.25, 0.5, 0.75]).tolist()
+    return {
+        "count": int(mult.size),
+        "median_multiple": float(median),
+        "mean_multiple": float(mult.mean()),
+        "min_multiple": float(mult.min()),
+        "max_multiple": float(mult.max()),
+        "q1_multiple": float(q1),
+        "q3_multiple": float(q3),
+        "outliers": int(df["outlier"].sum()),
+        "inconsistent": int((~df["multiple_consistent"]).sum()),
+    }
+
+
+def _rows_key(transactions: List[Any]) -> str:
+    payload = json.dumps(transactions, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def analyze_transactions(transactions: List[Dict[str, Any]]) -> PrecedentAnalytics:
+    """Return (cached) analytics for a transaction list."""
+    key = _rows_key(transactions or [])
+    cached = _cache.get(key)
+    if cached is not None:
+        _cache.move_to_end(key)
+        return cached
+    df = load_frame(transactions)
+    result = PrecedentAnalytics(frame=df, summary=_summarize(df))
+    _cache[key] = result
+    if len(_cache) > _CACHE_SIZE:
+        _cache.popitem(last=False)
+    return result
@@ -0,0 +1,139 @@
+"""
+render_profile.py
+Profiling hooks for the render pipeline.
+A RenderProfiler times named pipeline stages (normalize, validate, render,
+serialize) and every renderer call, recording duration, shapes added, slide XML
+bytes produced and, when memory tracing is on, the allocation delta. The result
+is a RenderReport that can be aggregated per template and shown in the app.
+"""
+from __future__ import annotations
+
+import contextlib
+import time
+import tracemalloc
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+from lxml import etree
+
+
+@dataclass
+class StageTiming:
+    name: str
+    seconds: float
+    alloc_kb: Optional[float] = None
+
+
+@dataclass
+class SlideTiming:
+    index: int                      # position in the plan (1-based)
+    template: str
+    seconds: float
+    slides_added: int
+    shapes_added: int
+    xml_bytes: int
+    alloc_kb: Optional[float] = None
+
+
+@dataclass
+class RenderReport:
+    stages: List[StageTiming] = field(default_factory=list)
+    slides: List[SlideTiming] = field(default_factory=list)
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(stage.seconds for stage in self.stages)
+
+    def by_template(self) -> List[Dict[str, Any]]:
+        """Per-template totals, slowest first."""
+        totals: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        for s in self.slides:
+            row = totals.setdefault(s.template, {"template": s.template, "calls": 0, "seconds": 0.0,
+                                                 "shapes_added": 0, "xml_bytes": 0})
+            row["calls"] += 1
+            row["seconds"] += s.seconds
+            row["shapes_added"] += s.shapes_added
+            row["xml_bytes"] += s.xml_bytes
+        rows = sorted(totals.values(), key=lambda r: r["seconds"], reverse=True)
+        for row in rows:
+            row["seconds"] = round(row["seconds"], 4)
+            row["ms_per_call"] = round(row["seconds"] * 1000 / row["calls"], 1)
+        return rows
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RenderReport":
+        """Inverse of to_dict (e.g. for a report produced in a worker process)."""
+        return cls(
+            stages=[StageTiming(**s) for s in data.get("stages", [])],
+            slides=[SlideTiming(**s) for s in data.get("slides", [])],
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total_seconds": round(self.total_seconds, 4),
+            "stages": [asdict(s) for s in self.stages],
+            "slides": [asdict(s) for s in self.slides],
+            "by_template": self.by_template(),
+        }
+
+
+def _traced_kb() -> Optional[float]:
+    return tracemalloc.get_traced_memory()[0] / 1024 if tracemalloc.is_tracing() else None
+
+
+def _delta(before: Optional[float]) -> Optional[float]:
+    after = _traced_kb()
+    return round(after - before, 1) if before is not None and after is not None else None
+
+
+class RenderProfiler:
+    """
+    Collects a RenderReport. With trace_memory=True, tracemalloc runs while the
+    profiler is open (noticeably slower, so it is off by default).
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        self.report = RenderReport()
+        self.trace_memory = trace_memory
+        self._started_tracing = False
+
+    def __enter__(self) -> "RenderProfiler":
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start, mem = time.perf_counter(), _traced_kb()
+        try:
+            yield
+        finally:
+            self.report.stages.append(StageTiming(name, round(time.perf_counter() - start, 5), _delta(mem)))
+
+    @contextlib.contextmanager
+    def renderer_call(self, index: int, template: str, prs) -> Iterator[None]:
+        """Wrap one renderer call; `prs` is inspected before and after for what it added."""
+        slides_before = len(prs.slides)
+        shapes_before = len(prs.slides[-1].shapes) if slides_before else 0
+        start, mem = time.perf_counter(), _traced_kb()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            alloc = _delta(mem)
+            slides = list(prs.slides)
+            # A renderer normally adds one slide, but it may also draw on the current one
+            touched = slides[max(slides_before - 1, 0):] if slides else []
+            shapes = sum(len(s.shapes) for s in touched) - shapes_before
+            xml_bytes = sum(len(etree.tostring(s._element)) for s in slides[slides_before:])
+            self.report.slides.append(SlideTiming(
+                index, template or "unknown", round(seconds, 5), len(slides) - slides_before,
+                shapes, xml_bytes, alloc,
+            ))
@@ -0,0 +1,479 @@
+"""
+render_service.py
+Local render service: a stdlib HTTP front end over a pool of pre-warmed render
+worker processes, so deck generation no longer runs inside the Streamlit script
+thread.
+
+Jobs wait in a bounded queue with one FIFO per client; dispatchers take jobs
+round-robin across clients, so one client submitting many decks cannot starve
+the others. When the queue (or a client's share of it) is full, submissions get
+429 with Retry-After instead of piling up.
+
+    POST   /jobs               render job JSON -> 202 {"job_id", "position"} | 429
+    GET    /jobs/<id>          job status (queued / running / done / error / cancelled)
+    GET    /jobs/<id>/result   the .pptx once done (409 while pending)
+    DELETE /jobs/<id>          cancel a queued job
+    GET    /health             queue and worker statistics
+
+The client id comes from the X-Client-Id header (falling back to the peer address).
+
+    python render_service.py --port 8765 --workers 4 --max-queue 32
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from batch_render import STATUS_OK, RenderJob, _warm_worker, render_job
+from brand_codec import brand_from_json, brand_to_json
+
+DEFAULT_PORT = 8765
+DEFAULT_MAX_QUEUE = 32
+DEFAULT_PER_CLIENT = 8
+RESULT_TTL_SECONDS = 3600
+PPTX_MIME = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+
+QUEUED, RUNNING, DONE, ERROR, CANCELLED = "queued", "running", "done", "error", "cancelled"
+
+
+class QueueFull(Exception):
+    """Raised when a job cannot be accepted; carries a suggested retry delay."""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+@dataclass
+class ServiceJob:
+    job_id: str
+    client_id: str
+    job: Dict[str, Any]                     # RenderJob fields
+    chart_workbook: Optional[str] = None
+    state: str = QUEUED
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    record: Optional[Dict[str, Any]] = None
+    last_seen: float = field(default_factory=time.time)     # last submit/status call from the client
+
+    def status(self, position: Optional[int] = None) -> Dict[str, Any]:
+        out = {"job_id": self.job_id, "state": self.state, "client_id": self.client_id,
+               "submitted_at": self.submitted_at, "started_at": self.started_at,
+               "finished_at": self.finished_at}
+        if position is not None:
+            out["position"] = position
+        if self.record:
+            out["record"] = {k: v for k, v in self.record.items() if k != "output"}
+        return out
+
+
+class FairJobQueue:
+    """Bounded queue with one FIFO per client, served round-robin."""
+
+    def __init__(self, max_size: int = DEFAULT_MAX_QUEUE, per_client: int = DEFAULT_PER_CLIENT):
+        self.max_size = max_size
+        self.per_client = per_client
+        self._queues: "OrderedDict[str, Deque[ServiceJob]]" = OrderedDict()
+        self._size = 0
+        self._cond = threading.Condition()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def put(self, job: ServiceJob, retry_after: int = 5) -> int:
+        """Enqueue and return the job's position; raises QueueFull when saturated."""
+        with self._cond:
+            client_queue = self._queues.get(job.client_id)
+            if self._size >= self.max_size:
+                raise QueueFull(f"Render queue is full ({self.max_size} jobs)", retry_after)
+            if client_queue is not None and len(client_queue) >= self.per_client:
+                raise QueueFull(f"Client already has {self.per_client} queued jobs", retry_after)
+            if client_queue is None:
+                client_queue = self._queues[job.client_id] = deque()
+            client_queue.append(job)
+            self._size += 1
+            self._cond.notify()
+            return self._position(job)
+
+    def get(self, timeout: Optional[float] = None) -> Optional[ServiceJob]:
+        """Next job from the client at the head of the rotation (None on timeout)."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._size > 0, timeout):
+                return None
+            client_id, client_queue = next(iter(self._queues.items()))
+            job = client_queue.popleft()
+            self._size -= 1
+            # The client goes to the back of the rotation (or leaves it when drained)
+            del self._queues[client_id]
+            if client_queue:
+                self._queues[client_id] = client_queue
+            return job
+
+    def cancel(self, job: ServiceJob) -> bool:
+        with self._cond:
+            client_queue = self._queues.get(job.client_id)
+            if client_queue is None or job not in client_queue:
+                return False
+            client_queue.remove(job)
+            self._size -= 1
+            if not client_queue:
+                del self._queues[job.client_id]
+            return True
+
+    def _position(self, job: ServiceJob) -> int:
+        """1-based place in the round-robin order the dispatchers will follow."""
+        queues = list(self._queues.values())
+        client_queue = self._queues.get(job.client_id)
+        if client_queue is None or job not in client_queue:
+            return 0
+        rank = client_queue.index(job)
+        ahead = sum(min(len(q), rank) for q in queues)
+        ahead += sum(1 for q in queues[:queues.index(client_queue)] if len(q) > rank)
+        return ahead + 1
+
+    def position(self, job: ServiceJob) -> Optional[int]:
+        with self._cond:
+            return self._position(job) or None
+
+
+class RenderService:
+    """Owns the worker pool, the fair queue, job bookkeeping and result files."""
+
+    def __init__(self, workers: int = 2, max_queue: int = DEFAULT_MAX_QUEUE,
+                 per_client: int = DEFAULT_PER_CLIENT, out_dir: Optional[str] = None,
+                 result_ttl: float = RESULT_TTL_SECONDS, abandon_after: Optional[float] = None):
+        self.workers = workers
+        # Queued jobs whose client stops polling for this long are cancelled
+        self.abandon_after = abandon_after
+        self.queue = FairJobQueue(max_queue, per_client)
+        # Only a directory the service created itself is removed on shutdown
+        self._owns_out_dir = out_dir is None
+        self.out_dir = out_dir or tempfile.mkdtemp(prefix="render_service_")
+        self.result_ttl = result_ttl
+        self.jobs: Dict[str, ServiceJob] = {}
+        self._lock = threading.Lock()
+        self._running = 0
+        self._durations: Deque[float] = deque(maxlen=20)
+        self._stop = threading.Event()
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=_warm_worker)
+        self._threads = [threading.Thread(target=self._dispatch, daemon=True, name=f"dispatch-{i}")
+                         for i in range(workers)]
+        for t in self._threads:
+            t.start()
+
+    def retry_after(self) -> int:
+        """Rough seconds until a slot frees up, from recent render durations."""
+        typical = sum(self._durations) / len(self._durations) if self._durations else 5.0
+        return max(1, int(typical * (len(self.queue) / max(self.workers, 1) + 1)))
+
+    def estimated_wait(self, position: int) -> float:
+        """Seconds until a job at `position` in the queue starts, from recent render durations."""
+        typical = sum(self._durations) / len(self._durations) if self._durations else 5.0
+        return typical * ((position - 1) // max(self.workers, 1) + (1 if self._running >= self.workers else 0))
+
+    def submit(self, job: Dict[str, Any], client_id: str, chart_workbook: Optional[str] = None) -> Tuple[str, int]:
+        self._expire_results()
+        self._reap_abandoned()
+        job_id = uuid.uuid4().hex
+        render = RenderJob(**{**job, "job_id": job_id})
+        service_job = ServiceJob(job_id, client_id, render.to_dict(), chart_workbook)
+        with self._lock:
+            self.jobs[job_id] = service_job
+        try:
+            position = self.queue.put(service_job, self.retry_after())
+        except QueueFull:
+            with self._lock:
+                self.jobs.pop(job_id, None)
+            raise
+        return job_id, position
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self.jobs.get(job_id)
+        if job is None:
+            return None
+        job.last_seen = time.time()
+        if job.state != QUEUED:
+            return job.status()
+        position = self.queue.position(job)
+        status = job.status(position)
+        if position:
+            status["eta_s"] = round(self.estimated_wait(position), 1)
+        return status
+
+    def cancel(self, job_id: str) -> bool:
+        job = self.jobs.get(job_id)
+        if job is None or job.state != QUEUED or not self.queue.cancel(job):
+            return False
+        job.state, job.finished_at = CANCELLED, time.time()
+        return True
+
+    def cancel_client(self, client_id: str) -> int:
+        """Cancel every queued job of a client; returns how many were cancelled."""
+        queued = [j.job_id for j in list(self.jobs.values()) if j.client_id == client_id and j.state == QUEUED]
+        return sum(self.cancel(job_id) for job_id in queued)
+
+    def _reap_abandoned(self) -> None:
+        if not self.abandon_after:
+            return
+        cutoff = time.time() - self.abandon_after
+        for job in list(self.jobs.values()):
+            if job.state == QUEUED and job.last_seen < cutoff and self.cancel(job.job_id):
+                print(f"[DEBUG] render_service: cancelled abandoned job {job.job_id} ({job.client_id})")
+
+    def result_path(self, job_id: str) -> Optional[str]:
+        job = self.jobs.get(job_id)
+        if job is None or job.state != DONE or not job.record:
+            return None
+        return job.record.get("output")
+
+    def health(self) -> Dict[str, Any]:
+        states: Dict[str, int] = {}
+        for job in list(self.jobs.values()):
+            states[job.state] = states.get(job.state, 0) + 1
+        return {"workers": self.workers, "running": self._running, "queued": len(self.queue),
+                "max_queue": self.queue.max_size, "per_client": self.queue.per_client, "jobs": states}
+
+    def _dispatch(self) -> None:
+        while not self._stop.is_set():
+            job = self.queue.get(timeout=0.5)
+            if job is None:
+                self._reap_abandoned()
+                continue
+            if self.abandon_after and job.last_seen < time.time() - self.abandon_after:
+                job.state, job.finished_at = CANCELLED, time.time()
+                continue
+            job.state, job.started_at = RUNNING, time.time()
+            with self._lock:
+                self._running += 1
+            try:
+                record = self.pool.submit(render_job, job.job, self.out_dir, job.chart_workbook, True).result()
+            except Exception as e:     # the worker process died
+                record = {"status": "error", "error": f"{type(e).__name__}: {e}"}
+            finally:
+                with self._lock:
+                    self._running -= 1
+            job.record, job.finished_at = record, time.time()
+            job.state = DONE if record.get("status") == STATUS_OK else ERROR
+            self._durations.append(job.finished_at - job.started_at)
+
+    def _expire_results(self) -> None:
+        cutoff = time.time() - self.result_ttl
+        with self._lock:
+            expired = [j for j in self.jobs.values() if j.finished_at and j.finished_at < cutoff]
+            for job in expired:
+                del self.jobs[job.job_id]
+        for job in expired:
+            output = (job.record or {}).get("output")
+            if output and os.path.exists(output):
+                os.remove(output)
+
+    def shutdown(self) -> None:
+        self._stop.set()
+        for t in self._threads:
+            t.join(timeout=2)
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        if self._owns_out_dir:
+            shutil.rmtree(self.out_dir, ignore_errors=True)
+
+
+def _make_handler(service: RenderService):
+    class Handler(BaseHTTPRequestHandler):
+        def _send_json(self, code: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _job_path(self) -> Tuple[Optional[str], Optional[str]]:
+            parts = [p for p in self.path.split("?")[0].split("/") if p]
+            if len(parts) >= 2 and parts[0] == "jobs":
+                return parts[1], (parts[2] if len(parts) > 2 else None)
+            return None, None
+
+        def do_POST(self):
+            if self.path.rstrip("/") != "/jobs":
+                return self._send_json(404, {"error": "not found"})
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                if not isinstance(payload, dict) or not isinstance(payload.get("render_plan"), dict):
+                    return self._send_json(400, {"error": "invalid job: expected an object with a render_plan object"})
+                job = {
+                    "render_plan": payload["render_plan"],
+                    "content_ir": payload.get("content_ir"),
+                    "brand_config": brand_from_json(payload.get("brand_config")),
+                    "company_name": payload.get("company_name") or "Moelis",
+                    "templates_path": payload.get("templates_path"),
+                }
+                if job["templates_path"] is not None and not isinstance(job["templates_path"], str):
+                    return self._send_json(400, {"error": "invalid job: templates_path must be a string"})
+            except (ValueError, KeyError) as e:
+                return self._send_json(400, {"error": f"invalid job: {e}"})
+            client_id = self.headers.get("X-Client-Id") or self.client_address[0]
+            try:
+                job_id, position = service.submit(job, client_id, payload.get("chart_workbook"))
+            except QueueFull as e:
+                return self._send_json(429, {"error": str(e), "retry_after": e.retry_after},
+                                       {"Retry-After": str(e.retry_after)})
+            self._send_json(202, {"job_id": job_id, "position": position})
+
+        def do_GET(self):
+            if self.path.rstrip("/") == "/health":
+                return self._send_json(200, service.health())
+            job_id, action = self._job_path()
+            status = service.status(job_id) if job_id else None
+            if status is None:
+                return self._send_json(404, {"error": "unknown job"})
+            if action is None:
+                return self._send_json(200, status)
+            if action != "result":
+                return self._send_json(404, {"error": "not found"})
+            path = service.result_path(job_id)
+            if path is None:
+                return self._send_json(409, status)
+            with open(path, "rb") as f:
+                blob = f.read()
+            self.send_response(200)
+            self.send_header("Content-Type", PPTX_MIME)
+            self.send_header("Content-Length", str(len(blob)))
+            self.end_headers()
+            self.wfile.write(blob)
+
+        def do_DELETE(self):
+            job_id, _ = self._job_path()
+            if job_id is None or service.status(job_id) is None:
+                return self._send_json(404, {"error": "unknown job"})
+            if service.cancel(job_id):
+                return self._send_json(200, service.status(job_id))
+            self._send_json(409, service.status(job_id))
+
+        def log_message(self, fmt, *args):
+            print(f"[DEBUG] render_service {self.address_string()} {fmt % args}")
+
+    return Handler
+
+
+def serve(host: str = "127.0.0.1", port: int = DEFAULT_PORT, **service_kwargs) -> None:
+    service = RenderService(**service_kwargs)
+    server = ThreadingHTTPServer((host, port), _make_handler(service))
+    print(f"[DEBUG] Render service on http://{host}:{port} with {service.workers} workers")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+
+
+class ServiceBusy(Exception):
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class RenderServiceClient:
+    """Minimal stdlib client used by the Streamlit app."""
+
+    def __init__(self, base_url: str, client_id: Optional[str] = None, timeout: float = 30):
+        self.base_url = base_url.rstrip("/")
+        self.client_id = client_id or uuid.uuid4().hex
+        self.timeout = timeout
+
+    def _request(self, method: str, path: str, payload: Optional[Dict[str, Any]] = None) -> Tuple[int, bytes, Any]:
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        request = urllib.request.Request(self.base_url + path, data=data, method=method,
+                                         headers={"Content-Type": "application/json", "X-Client-Id": self.client_id})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return response.status, response.read(), response.headers
+        except urllib.error.HTTPError as e:
+            return e.code, e.read(), e.headers
+
+    def submit(self, render_plan, content_ir=None, brand_config=None, company_name="Moelis",
+               chart_workbook: Optional[str] = None, templates_path: Optional[str] = None) -> Dict[str, Any]:
+        code, body, headers = self._request("POST", "/jobs", {
+            "render_plan": render_plan, "content_ir": content_ir, "brand_config": brand_to_json(brand_config),
+            "company_name": company_name, "chart_workbook": chart_workbook, "templates_path": templates_path,
+        })
+        payload = json.loads(body or b"{}")
+        if code == 429:
+            raise ServiceBusy(payload.get("error", "render service is busy"),
+                              int(headers.get("Retry-After") or payload.get("retry_after") or 5))
+        if code != 202:
+            raise RuntimeError(f"Render service rejected the job ({code}): {payload.get('error')}")
+        return payload
+
+    def status(self, job_id: str) -> Dict[str, Any]:
+        code, body, _ = self._request("GET", f"/jobs/{job_id}")
+        if code != 200:
+            raise RuntimeError(f"Unknown render job {job_id}")
+        return json.loads(body)
+
+    def result(self, job_id: str) -> bytes:
+        code, body, _ = self._request("GET", f"/jobs/{job_id}/result")
+        if code != 200:
+            raise RuntimeError(f"Render job {job_id} has no result ({code})")
+        return body
+
+    def cancel(self, job_id: str) -> bool:
+        code, _, _ = self._request("DELETE", f"/jobs/{job_id}")
+        return code == 200
+
+    def render(self, render_plan, content_ir=None, brand_config=None, company_name="Moelis",
+               chart_workbook: Optional[str] = None, poll: float = 0.5, timeout: float = 600,
+               on_status=None, templates_path: Optional[str] = None) -> Tuple[bytes, Dict[str, Any]]:
+        """Submit, wait for completion and return (pptx bytes, final status)."""
+        job_id = self.submit(render_plan, content_ir, brand_config, company_name, chart_workbook,
+                             templates_path)["job_id"]
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            status = self.status(job_id)
+            if on_status:
+                on_status(status)
+            if status["state"] == DONE:
+                return self.result(job_id), status
+            if status["state"] in (ERROR, CANCELLED):
+                error = (status.get("record") or {}).get("error", status["state"])
+                raise RuntimeError(f"Render job failed: {error}")
+            time.sleep(poll)
+        self.cancel(job_id)
+        raise TimeoutError(f"Render job {job_id} did not finish within {timeout}s")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Local deck render service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) - 1))
+    parser.add_argument("--max-queue", type=int, default=DEFAULT_MAX_QUEUE)
+    parser.add_argument("--per-client", type=int, default=DEFAULT_PER_CLIENT)
+    parser.add_argument("--out-dir", default=None, help="where finished decks are kept (temp dir by default)")
+    parser.add_argument("--abandon-after", type=float, default=None,
+                        help="cancel queued jobs whose client has not polled for this many seconds")
+    args = parser.parse_args(argv)
+    serve(args.host, args.port, workers=args.workers, max_queue=args.max_queue,
+          per_client=args.per_client, out_dir=args.out_dir, abandon_after=args.abandon_after)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
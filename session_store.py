@@ -0,0 +1,285 @@
+"""
+session_store.py
+Persistent store for interview sessions, so a session survives app restarts and
+can be resumed on any app worker that shares the store.
+Messages are an append-only log per session (a reset starts a new epoch rather
+than deleting rows); state values (content IR, render plan, brand config, ...)
+are JSON blobs, zlib-compressed and stored once per content hash, so the long
+system prompt and unchanged plans cost one row however often they are saved.
+Resuming reads a session's state pointers and message rows by primary key.
+
+Backends are picked by URL; SQLite ships here:
+    store = open_session_store("sqlite:///sessions.sqlite3")
+    sid = store.create_session()
+    log = store.message_log(sid, [{"role": "system", "content": prompt}])
+    log.append({"role": "user", "content": "..."})        # persisted immediately
+    store.put_state(sid, "generated_render_plan", plan_json)
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from pptx.dml.color import RGBColor
+from pptx.util import Length
+
+DEFAULT_STORE_URL = "sqlite:///sessions.sqlite3"
+_BLOB_CACHE_SIZE = 256
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    epoch INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    data BLOB NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS messages (
+    session_id TEXT NOT NULL,
+    epoch INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    blob_hash TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (session_id, epoch, seq)
+);
+CREATE TABLE IF NOT EXISTS state (
+    session_id TEXT NOT NULL,
+    key TEXT NOT NULL,
+    blob_hash TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (session_id, key)
+);
+"""
+
+
+def _encode(value: Any) -> Any:
+    """JSON-ready copy; RGBColor and Pt/Emu lengths (an int subclass) are tagged to survive the trip."""
+    if isinstance(value, RGBColor):
+        return {"__rgb__": str(value)}
+    if isinstance(value, Length):
+        return {"__emu__": int(value)}
+    if isinstance(value, dict):
+        return {str(k): _encode(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode(v) for v in value]
+    return value
+
+
+def _decode_hook(obj: Dict[str, Any]) -> Any:
+    if len(obj) == 1:
+        if "__rgb__" in obj:
+            return RGBColor.from_string(obj["__rgb__"])
+        if "__emu__" in obj:
+            return Length(obj["__emu__"])
+    return obj
+
+
+def dumps(value: Any) -> bytes:
+    return json.dumps(_encode(value), sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def loads(data: bytes) -> Any:
+    return json.loads(data, object_hook=_decode_hook)
+
+
+class MessageLog(list):
+    """The session's message list; append/extend write through to the store."""
+
+    def __init__(self, store: "SessionStore", session_id: str, messages: Iterable[Dict[str, Any]] = ()):
+        super().__init__(messages)
+        self.store = store
+        self.session_id = session_id
+
+    def append(self, message: Dict[str, Any]) -> None:
+        self.store.append_messages(self.session_id, [message], start=len(self))
+        super().append(message)
+
+    def extend(self, messages: Iterable[Dict[str, Any]]) -> None:
+        messages = list(messages)
+        self.store.append_messages(self.session_id, messages, start=len(self))
+        super().extend(messages)
+
+
+class SessionStore(ABC):
+    """Backend interface; see SQLiteSessionStore."""
+
+    @abstractmethod
+    def create_session(self) -> str: ...
+
+    @abstractmethod
+    def exists(self, session_id: str) -> bool: ...
+
+    @abstractmethod
+    def append_messages(self, session_id: str, messages: List[Dict[str, Any]], start: int) -> None: ...
+
+    @abstractmethod
+    def load_messages(self, session_id: str) -> List[Dict[str, Any]]: ...
+
+    @abstractmethod
+    def reset_messages(self, session_id: str, messages: List[Dict[str, Any]]) -> MessageLog: ...
+
+    @abstractmethod
+    def put_state(self, session_id: str, key: str, value: Any) -> bool: ...
+
+    @abstractmethod
+    def load_state(self, session_id: str) -> Dict[str, Any]: ...
+
+    def message_log(self, session_id: str, initial: Optional[List[Dict[str, Any]]] = None) -> MessageLog:
+        """The persisted messages, or a fresh log seeded with `initial` when there are none."""
+        messages = self.load_messages(session_id)
+        if not messages and initial:
+            return self.reset_messages(session_id, initial)
+        return MessageLog(self, session_id, messages)
+
+
+class SQLiteSessionStore(SessionStore):
+    """SQLite backend (WAL mode, so several app processes on one host can share the file)."""
+
+    def __init__(self, path: str = "sessions.sqlite3", busy_timeout_ms: int = 5000):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute(f"PRAGMA busy_timeout = {int(busy_timeout_ms)}")
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._blob_cache: "OrderedDict[str, bytes]" = OrderedDict()
+
+    def _tx(self, fn: Callable[[sqlite3.Connection], Any]) -> Any:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = fn(self._conn)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            return result
+
+    def _put_blob(self, conn: sqlite3.Connection, data: bytes) -> str:
+        digest = hashlib.sha1(data).hexdigest()
+        if conn.execute("SELECT 1 FROM blobs WHERE hash = ?", (digest,)).fetchone() is None:
+            conn.execute("INSERT INTO blobs (hash, data, size) VALUES (?, ?, ?)",
+                         (digest, zlib.compress(data, 6), len(data)))
+        return digest
+
+    def _remember_blob(self, digest: str, data: bytes) -> None:
+        self._blob_cache[digest] = data
+        self._blob_cache.move_to_end(digest)
+        if len(self._blob_cache) > _BLOB_CACHE_SIZE:
+            self._blob_cache.popitem(last=False)
+
+    def _get_blobs(self, hashes: List[str]) -> Dict[str, bytes]:
+        found = {h: self._blob_cache[h] for h in hashes if h in self._blob_cache}
+        missing = [h for h in hashes if h not in found]
+        for start in range(0, len(missing), 500):
+            batch = missing[start:start + 500]
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT hash, data FROM blobs WHERE hash IN ({','.join('?' * len(batch))})", batch).fetchall()
+            for digest, data in rows:
+                found[digest] = zlib.decompress(data)
+                self._remember_blob(digest, found[digest])
+        return found
+
+    def create_session(self) -> str:
+        session_id = uuid.uuid4().hex
+        now = time.time()
+        self._tx(lambda c: c.execute("INSERT INTO sessions (id, created_at, updated_at) VALUES (?, ?, ?)",
+                                     (session_id, now, now)))
+        return session_id
+
+    def exists(self, session_id: str) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM sessions WHERE id = ?", (session_id,)).fetchone() is not None
+
+    def _epoch(self, conn: sqlite3.Connection, session_id: str) -> int:
+        row = conn.execute("SELECT epoch FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"Unknown session '{session_id}'")
+        return row[0]
+
+    def append_messages(self, session_id: str, messages: List[Dict[str, Any]], start: int) -> None:
+        def write(conn: sqlite3.Connection) -> None:
+            epoch = self._epoch(conn, session_id)
+            now = time.time()
+            conn.executemany(
+                "INSERT INTO messages (session_id, epoch, seq, role, blob_hash, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                [(session_id, epoch, start + i, m.get("role", ""), self._put_blob(conn, dumps(m)), now)
+                 for i, m in enumerate(messages)])
+            conn.execute("UPDATE sessions SET updated_at = ? WHERE id = ?", (now, session_id))
+        self._tx(write)
+
+    def load_messages(self, session_id: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT m.blob_hash FROM messages m JOIN sessions s ON s.id = m.session_id AND s.epoch = m.epoch "
+                "WHERE m.session_id = ? ORDER BY m.seq", (session_id,)).fetchall()
+        hashes = [r[0] for r in rows]
+        blobs = self._get_blobs(hashes)
+        return [loads(blobs[h]) for h in hashes]
+
+    def reset_messages(self, session_id: str, messages: List[Dict[str, Any]]) -> MessageLog:
+        """Start a new epoch (earlier messages stay in the log) holding `messages`."""
+        self._tx(lambda c: c.execute("UPDATE sessions SET epoch = epoch + 1, updated_at = ? WHERE id = ?",
+                                     (time.time(), session_id)))
+        log = MessageLog(self, session_id)
+        log.extend(messages)
+        return log
+
+    def put_state(self, session_id: str, key: str, value: Any) -> bool:
+        """Store a state value; returns False when the stored row already holds it."""
+        data = dumps(value)
+        digest = hashlib.sha1(data).hexdigest()
+
+        def write(conn: sqlite3.Connection) -> bool:
+            # Compared against the row itself, since other workers may have written it since
+            row = conn.execute("SELECT blob_hash FROM state WHERE session_id = ? AND key = ?",
+                               (session_id, key)).fetchone()
+            if row is not None and row[0] == digest:
+                return False
+            self._put_blob(conn, data)
+            conn.execute("INSERT OR REPLACE INTO state (session_id, key, blob_hash, updated_at) VALUES (?, ?, ?, ?)",
+                         (session_id, key, digest, time.time()))
+            return True
+        return self._tx(write)
+
+    def load_state(self, session_id: str) -> Dict[str, Any]:
+        with self._lock:
+            rows = self._conn.execute("SELECT key, blob_hash FROM state WHERE session_id = ?", (session_id,)).fetchall()
+        blobs = self._get_blobs([h for _, h in rows])
+        return {key: loads(blobs[digest]) for key, digest in rows}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# Other backends (e.g. a network database for hosts that cannot share a file) register here
+BACKENDS: Dict[str, Callable[[str], SessionStore]] = {
+    "sqlite": lambda location: SQLiteSessionStore(location or "sessions.sqlite3"),
+    "memory": lambda location: SQLiteSessionStore(":memory:"),
+}
+
+
+def open_session_store(url: str = DEFAULT_STORE_URL) -> SessionStore:
+    """'sqlite:///path/to/file.sqlite3' or 'memory://'."""
+    scheme, _, location = url.partition("://")
+    factory = BACKENDS.get(scheme)
+    if factory is None:
+        raise ValueError(f"Unknown session store '{scheme}' (known: {', '.join(BACKENDS)})")
+    return factory(location[1:] if location.startswith("/") and scheme == "sqlite" else location)
@@ -0,0 +1,279 @@
+"""
+slide_preview.py
+Lightweight PNG thumbnails of generated slides for in-app review.
+Rasterizes what the renderers produce - filled rectangles and ovals, text boxes
+(wrapped with text_metrics), tables, pictures and bar/line charts - with Pillow.
+It is not a PowerPoint renderer: gradients, theme colors, effects and exotic
+geometry are approximated or skipped. Thumbnails are cached on a hash of the
+slide XML plus its chart and image parts, so unchanged slides are never redrawn.
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+from collections import OrderedDict
+from typing import Any, List, Optional, Tuple
+
+from lxml import etree
+from PIL import Image, ImageDraw
+from pptx.enum.chart import XL_CHART_TYPE
+from pptx.enum.shapes import MSO_SHAPE_TYPE
+
+from text_metrics import EMU_PER_PT, load_font, wrap_lines
+
+PREVIEW_WIDTH = 640
+
+_CACHE_SIZE = 256
+_preview_cache: "OrderedDict[str, bytes]" = OrderedDict()
+
+_DEFAULT_FONT = "Arial"
+_DEFAULT_SIZE_PT = 18.0
+_DEFAULT_ACCENT = "4472C4"              # Office accent1, used by styled shapes without a fill
+_CHART_PALETTE = ("4472C4", "ED7D31", "A5A5A5", "FFC000", "5B9BD5", "70AD47")
+_INSETS = (91440, 91440, 45720, 45720)  # default bodyPr lIns, rIns, tIns, bIns (EMU)
+
+_LINE_TYPES = {
+    XL_CHART_TYPE.LINE, XL_CHART_TYPE.LINE_MARKERS, XL_CHART_TYPE.LINE_STACKED,
+    XL_CHART_TYPE.LINE_MARKERS_STACKED,
+}
+_ALGN_ATTR = {"ctr": "center", "r": "right"}
+
+
+def _rgb(hex_color: Optional[str]) -> Optional[Tuple[int, int, int]]:
+    if not hex_color or len(hex_color) != 6:
+        return None
+    return tuple(int(hex_color[i:i + 2], 16) for i in (0, 2, 4))
+
+
+def _first(element, path: str) -> Optional[str]:
+    found = element.xpath(path)
+    return found[0] if found else None
+
+
+def _slide_hash(slide, width_px: int) -> str:
+    """Hash of everything that affects the picture: slide XML, chart XML and image blobs."""
+    digest = hashlib.sha1(str(width_px).encode())
+    digest.update(etree.tostring(slide._element))
+    for rel in slide.part.rels.values():
+        if rel.is_external:
+            continue
+        part = rel.target_part
+        if part.partname.startswith("/ppt/charts/") or part.partname.startswith("/ppt/media/"):
+            digest.update(part.blob)
+    return digest.hexdigest()
+
+
+class _Canvas:
+    def __init__(self, slide_width: int, slide_height: int, width_px: int):
+        self.scale = width_px / slide_width
+        self.image = Image.new("RGB", (width_px, max(1, round(slide_height * self.scale))), "white")
+        self.draw = ImageDraw.Draw(self.image)
+
+    def px(self, emu: Any) -> int:
+        return int(round(int(emu or 0) * self.scale))
+
+    def box(self, shape) -> Tuple[int, int, int, int]:
+        x, y = self.px(shape.left), self.px(shape.top)
+        return x, y, x + max(1, self.px(shape.width)), y + max(1, self.px(shape.height))
+
+
+def _draw_geometry(canvas: _Canvas, shape) -> None:
+    sp_pr = _first(shape._element, "./p:spPr")
+    if sp_pr is None:
+        return
+    fill = _first(sp_pr, "./a:solidFill/a:srgbClr/@val")
+    if fill is None and not sp_pr.xpath("./a:noFill") and shape._element.xpath("./p:style"):
+        fill = _DEFAULT_ACCENT
+    line = None
+    if not sp_pr.xpath("./a:ln/a:noFill"):
+        line = _first(sp_pr, "./a:ln/a:solidFill/a:srgbClr/@val")
+    if fill is None and line is None:
+        return
+    box = canvas.box(shape)
+    prst = _first(sp_pr, "./a:prstGeom/@prst") or "rect"
+    if prst == "ellipse":
+        canvas.draw.ellipse(box, fill=_rgb(fill), outline=_rgb(line))
+    elif prst == "roundRect":
+        canvas.draw.rounded_rectangle(box, radius=max(1, (box[3] - box[1]) // 6), fill=_rgb(fill), outline=_rgb(line))
+    else:
+        canvas.draw.rectangle(box, fill=_rgb(fill), outline=_rgb(line))
+
+
+def _run_style(paragraph_el, run_el) -> Tuple[float, bool, Optional[str], Optional[str]]:
+    """Size (pt), bold, color and typeface from the run, falling back to the paragraph defaults."""
+    size = bold = color = face = None
+    for props in (_first(run_el, "./a:rPr") if run_el is not None else None,
+                  _first(paragraph_el, "./a:pPr/a:defRPr")):
+        if props is None:
+            continue
+        if size is None and props.get("sz"):
+            size = int(props.get("sz")) / 100
+        if bold is None and props.get("b") is not None:
+            bold = props.get("b") in ("1", "true")
+        color = color or _first(props, "./a:solidFill/a:srgbClr/@val")
+        face = face or _first(props, "./a:latin/@typeface")
+    return size or _DEFAULT_SIZE_PT, bool(bold), color, face
+
+
+def _draw_text(canvas: _Canvas, tx_body, box: Tuple[int, int, int, int], wrap: bool = True,
+               default_color: str = "000000") -> None:
+    body_pr = _first(tx_body, "./a:bodyPr")
+    insets = _INSETS
+    if body_pr is not None:
+        insets = tuple(int(body_pr.get(attr, default)) for attr, default in
+                       zip(("lIns", "rIns", "tIns", "bIns"), _INSETS))
+        wrap = wrap and body_pr.get("wrap") != "none"
+    left, top = box[0] + canvas.px(insets[0]), box[1] + canvas.px(insets[2])
+    right = box[2] - canvas.px(insets[1])
+    y = top
+    for paragraph in tx_body.xpath("./a:p"):
+        runs = paragraph.xpath("./a:r")
+        text = "".join(t or "" for t in paragraph.xpath("./a:r/a:t/text()"))
+        size, bold, color, face = _run_style(paragraph, runs[0] if runs else None)
+        line_px = max(1, round(size * EMU_PER_PT * canvas.scale * 1.2))
+        if not text.strip():
+            y += line_px
+            continue
+        font_name = face or _DEFAULT_FONT
+        width_pt = max(1.0, (right - left) / canvas.scale / EMU_PER_PT)
+        lines = wrap_lines(text, font_name, size, width_pt, bold) if wrap else (text,)
+        font = load_font(font_name, bold, max(1, round(size * EMU_PER_PT * canvas.scale)))
+        align = _ALGN_ATTR.get(_first(paragraph, "./a:pPr/@algn") or "")
+        for line in lines:
+            if y >= canvas.image.height:
+                return
+            x = left
+            if align:
+                slack = (right - left) - font.getlength(line)
+                x += slack if align == "right" else slack / 2
+            canvas.draw.text((x, y), line, font=font, fill=_rgb(color or default_color))
+            y += line_px
+
+
+def _draw_table(canvas: _Canvas, shape) -> None:
+    table = shape.table
+    x0, y0 = canvas.px(shape.left), canvas.px(shape.top)
+    col_x = [x0]
+    for column in table.columns:
+        col_x.append(col_x[-1] + canvas.px(column.width))
+    y = y0
+    for row in table.rows:
+        row_h = canvas.px(row.height)
+        for c, cell in enumerate(row.cells):
+            box = (col_x[c], y, col_x[c + 1], y + row_h)
+            fill = _first(cell._tc, "./a:tcPr/a:solidFill/a:srgbClr/@val")
+            canvas.draw.rectangle(box, fill=_rgb(fill), outline=(210, 210, 210))
+            tx_body = _first(cell._tc, "./a:txBody")
+            if tx_body is not None:
+                _draw_text(canvas, tx_body, box)
+        y += row_h
+
+
+def _series_colors(ser_el, index: int) -> Tuple[Tuple[int, int, int], dict]:
+    base = (_first(ser_el, "./c:spPr/a:solidFill/a:srgbClr/@val")
+            or _first(ser_el, "./c:spPr/a:ln/a:solidFill/a:srgbClr/@val")
+            or _CHART_PALETTE[index % len(_CHART_PALETTE)])
+    points = {}
+    for d_pt in ser_el.xpath("./c:dPt"):
+        color = _first(d_pt, "./c:spPr/a:solidFill/a:srgbClr/@val")
+        if color:
+            points[int(_first(d_pt, "./c:idx/@val"))] = _rgb(color)
+    return _rgb(base), points
+
+
+def _draw_chart(canvas: _Canvas, shape) -> None:
+    chart = shape.chart
+    left, top, right, bottom = canvas.box(shape)
+    canvas.draw.rectangle((left, top, right, bottom), outline=(225, 225, 225))
+    plot = chart.plots[0] if len(chart.plots) else None
+    if plot is None:
+        return
+    series = list(plot.series)
+    values = [[v or 0 for v in s.values] for s in series]
+    n_cats = max((len(v) for v in values), default=0)
+    if not n_cats:
+        return
+    try:
+        v_max = chart.value_axis.maximum_scale
+    except ValueError:
+        v_max = None
+    v_max = v_max or max((max(v) for v in values if v), default=1) * 1.1 or 1
+    pad_x, pad_y = (right - left) * 0.06, (bottom - top) * 0.1
+    x0, x1, y0, y1 = left + pad_x, right - pad_x, top + pad_y, bottom - pad_y
+    canvas.draw.line((x0, y1, x1, y1), fill=(150, 150, 150))
+    slot = (x1 - x0) / n_cats
+
+    def y_of(value: float) -> float:
+        return y1 - (y1 - y0) * max(0.0, min(value / v_max, 1.0))
+
+    if chart.chart_type in _LINE_TYPES:
+        for s_idx, (ser, vals) in enumerate(zip(series, values)):
+            color, _ = _series_colors(ser._element, s_idx)
+            pts = [(x0 + slot * (i + 0.5), y_of(v)) for i, v in enumerate(vals)]
+            if len(pts) > 1:
+                canvas.draw.line(pts, fill=color, width=2)
+            for px, py in pts:
+                canvas.draw.ellipse((px - 2, py - 2, px + 2, py + 2), fill=color)
+        return
+    bar_w = slot * 0.7 / max(1, len(series))
+    for s_idx, (ser, vals) in enumerate(zip(series, values)):
+        color, point_colors = _series_colors(ser._element, s_idx)
+        for i, v in enumerate(vals):
+            bx = x0 + slot * i + slot * 0.15 + bar_w * s_idx
+            canvas.draw.rectangle((bx, y_of(v), bx + bar_w - 1, y1), fill=point_colors.get(i, color))
+
+
+def _draw_picture(canvas: _Canvas, shape) -> None:
+    left, top, right, bottom = canvas.box(shape)
+    try:
+        picture = Image.open(io.BytesIO(shape.image.blob)).convert("RGBA")
+    except Exception:
+        canvas.draw.rectangle((left, top, right, bottom), outline=(180, 180, 180))
+        return
+    picture = picture.resize((max(1, right - left), max(1, bottom - top)))
+    canvas.image.paste(picture, (left, top), picture)
+
+
+def _draw_shapes(canvas: _Canvas, shapes) -> None:
+    for shape in shapes:
+        try:
+            if shape.shape_type == MSO_SHAPE_TYPE.GROUP:
+                _draw_shapes(canvas, shape.shapes)
+            elif getattr(shape, "has_chart", False) and shape.has_chart:
+                _draw_chart(canvas, shape)
+            elif getattr(shape, "has_table", False) and shape.has_table:
+                _draw_table(canvas, shape)
+            elif shape.shape_type == MSO_SHAPE_TYPE.PICTURE:
+                _draw_picture(canvas, shape)
+            else:
+                _draw_geometry(canvas, shape)
+                tx_body = _first(shape._element, "./p:txBody")
+                if tx_body is not None:
+                    _draw_text(canvas, tx_body, canvas.box(shape))
+        except Exception as e:
+            print(f"[DEBUG] Preview skipped shape '{getattr(shape, 'name', '?')}': {e}")
+
+
+def render_slide_preview(slide, slide_width: int, slide_height: int, width_px: int = PREVIEW_WIDTH) -> bytes:
+    """PNG thumbnail of one slide, served from the cache when the slide content is unchanged."""
+    key = _slide_hash(slide, width_px)
+    png = _preview_cache.get(key)
+    if png is not None:
+        _preview_cache.move_to_end(key)
+        return png
+    canvas = _Canvas(slide_width, slide_height, width_px)
+    background = _first(slide._element, "./p:cSld/p:bg/p:bgPr/a:solidFill/a:srgbClr/@val")
+    if background:
+        canvas.draw.rectangle((0, 0, canvas.image.width, canvas.image.height), fill=_rgb(background))
+    _draw_shapes(canvas, slide.shapes)
+    out = io.BytesIO()
+    canvas.image.save(out, format="PNG", optimize=False)
+    png = _preview_cache[key] = out.getvalue()
+    if len(_preview_cache) > _CACHE_SIZE:
+        _preview_cache.popitem(last=False)
+    return png
+
+
+def deck_previews(prs, width_px: int = PREVIEW_WIDTH) -> List[bytes]:
+    """PNG thumbnails for every slide of a presentation, in order."""
+    return [render_slide_preview(slide, prs.slide_width, prs.slide_height, width_px) for slide in prs.slides]
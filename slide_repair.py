@@ -0,0 +1,179 @@
+"""
+slide_repair.py
+Targeted per-slide LLM repair.
+Instead of sending the whole conversation back and regenerating both JSONs, each
+slide that failed validate_individual_slides gets its own small prompt (that
+template's schema, one valid example, the slide's current JSON and its issues).
+The repairs run concurrently and every returned patch is merged back into the plan.
+"""
+from __future__ import annotations
+
+import copy
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from json_scanner import repair_json
+
+MAX_PARALLEL_REPAIRS = 4
+
+REPAIR_SYSTEM_PROMPT = (
+    "You repair single slides of an investment-banking pitch deck render plan. "
+    "Reply with ONE JSON object for the corrected slide and nothing else."
+)
+
+
+@dataclass
+class SlideRepairTask:
+    index: int                      # position in render_plan["slides"]
+    template: str
+    slide: Dict[str, Any]
+    issues: List[str] = field(default_factory=list)
+
+
+@dataclass
+class SlideRepairResult:
+    task: SlideRepairTask
+    patch: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+
+def collect_repair_tasks(validation_results: Dict[str, Any], render_plan: Dict[str, Any]) -> List[SlideRepairTask]:
+    """One task per slide that failed validation, carrying all of its reported problems."""
+    slides = render_plan.get("slides", []) if isinstance(render_plan, dict) else []
+    tasks = []
+    for slide_val in validation_results.get("slide_validations", []):
+        if slide_val.get("valid"):
+            continue
+        index = slide_val["slide_number"] - 1
+        if not 0 <= index < len(slides):
+            continue
+        issues = (slide_val.get("issues", []) + slide_val.get("missing_fields", [])
+                  + slide_val.get("empty_fields", []))
+        tasks.append(SlideRepairTask(index, slide_val.get("template", ""), slides[index], issues))
+    return tasks
+
+
+def _example_slide(template: str, example_plan: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    for slide in (example_plan or {}).get("slides", []):
+        if isinstance(slide, dict) and slide.get("template") == template:
+            return slide
+    return None
+
+
+def build_repair_messages(
+    task: SlideRepairTask,
+    templates: Optional[List[Dict[str, Any]]] = None,
+    example_plan: Optional[Dict[str, Any]] = None,
+    content_ir_keys: Optional[List[str]] = None,
+) -> List[Dict[str, str]]:
+    """Minimal prompt for one slide: its schema, a valid example, current JSON and issues."""
+    schema = next((t for t in (templates or []) if t.get("id") == task.template), None)
+    lines = [f"Template: {task.template}"]
+    if schema:
+        lines.append(f"Required data fields: {', '.join(schema.get('required', []))}")
+        if schema.get("optional"):
+            lines.append(f"Optional data fields: {', '.join(schema['optional'])}")
+    example = _example_slide(task.template, example_plan)
+    if example:
+        lines.append("Example of a valid slide of this template:")
+        lines.append(json.dumps(example, ensure_ascii=False))
+    if content_ir_keys:
+        lines.append("Content IR sections available for content_ir_key / {\"$ref\": \"#/<section>\"}: "
+                     + ", ".join(content_ir_keys))
+    lines.append("Current slide JSON:")
+    lines.append(json.dumps(task.slide, ensure_ascii=False))
+    lines.append("Validation issues to fix:")
+    lines.extend(f"- {issue}" for issue in task.issues)
+    lines.append("Return the corrected slide as one JSON object with the same template. "
+                 "Fields you leave out of \"data\" keep their current values. "
+                 "Every field must hold real content, not placeholders.")
+    return [
+        {"role": "system", "content": REPAIR_SYSTEM_PROMPT},
+        {"role": "user", "content": "\n".join(lines)},
+    ]
+
+
+def _unwrap_patch(patch: Dict[str, Any]) -> Dict[str, Any]:
+    # Models sometimes wrap the slide as {"slides": [...]} or {"slide": {...}}
+    if isinstance(patch.get("slides"), list) and patch["slides"] and isinstance(patch["slides"][0], dict):
+        return patch["slides"][0]
+    if isinstance(patch.get("slide"), dict):
+        return patch["slide"]
+    return patch
+
+
+def _known_slots(task: SlideRepairTask, templates: Optional[List[Dict[str, Any]]]) -> set:
+    data = task.slide.get("data")
+    known = set(data) if isinstance(data, dict) else set()
+    schema = next((t for t in (templates or []) if t.get("id") == task.template), None)
+    if schema:
+        known.update(schema.get("required", []), schema.get("optional", []))
+    return known
+
+
+def _parse_patch(response_text: str, task: SlideRepairTask,
+                 templates: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """The reply as a slide patch; anything that is not recognisably this slide is rejected."""
+    found = repair_json(response_text or "")
+    if found.error:
+        raise ValueError(found.error)
+    if not isinstance(found.value, dict):
+        raise ValueError("Repair response is not a JSON object")
+    patch = _unwrap_patch(found.value)
+    if isinstance(patch.get("data"), dict):
+        return patch
+    # A bare data object (slot keys at the top level) patches the slide's data
+    slots = _known_slots(task, templates) & set(patch)
+    if not slots:
+        raise ValueError(f"Repair response is not a slide patch (keys: {', '.join(sorted(patch)) or 'none'})")
+    return {"data": {key: value for key, value in patch.items() if key != "template"}}
+
+
+def repair_slides(
+    tasks: List[SlideRepairTask],
+    call_model: Callable[[List[Dict[str, str]]], str],
+    templates: Optional[List[Dict[str, Any]]] = None,
+    example_plan: Optional[Dict[str, Any]] = None,
+    content_ir_keys: Optional[List[str]] = None,
+    max_workers: int = MAX_PARALLEL_REPAIRS,
+) -> List[SlideRepairResult]:
+    """Run one small model call per task concurrently and parse each reply into a patch."""
+
+    def run(task: SlideRepairTask) -> SlideRepairResult:
+        try:
+            reply = call_model(build_repair_messages(task, templates, example_plan, content_ir_keys))
+            return SlideRepairResult(task, patch=_parse_patch(reply, task, templates))
+        except Exception as e:
+            return SlideRepairResult(task, error=str(e))
+
+    if not tasks:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(tasks))) as pool:
+        return list(pool.map(run, tasks))
+
+
+def _merge(base: Any, patch: Any) -> Any:
+    """Dicts merge key by key (patch wins); anything else is replaced by the patch."""
+    if isinstance(base, dict) and isinstance(patch, dict):
+        merged = dict(base)
+        for key, value in patch.items():
+            merged[key] = _merge(base.get(key), value)
+        return merged
+    return copy.deepcopy(patch)
+
+
+def merge_repairs(render_plan: Dict[str, Any], results: List[SlideRepairResult]) -> Dict[str, Any]:
+    """Return a copy of the plan with every successful patch merged into its slide."""
+    plan = copy.deepcopy(render_plan)
+    slides = plan.get("slides", [])
+    for result in results:
+        if result.patch is None:
+            continue
+        index = result.task.index
+        patch = _unwrap_patch(result.patch)
+        merged = _merge(slides[index], patch)
+        merged["template"] = slides[index].get("template")
+        slides[index] = merged
+    return plan
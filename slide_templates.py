@@ -8,9 +8,21 @@ from pptx.util import Inches, Pt
 from pptx.dml.color import RGBColor
 from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
 from pptx.enum.shapes import MSO_SHAPE
-from pptx.chart.data import ChartData
-from pptx.enum.chart import XL_CHART_TYPE, XL_LEGEND_POSITION
+from chart_cache import CachedChartData, add_chart
+from chart_styles import apply_chart_style
+from pptx.enum.chart import XL_CHART_TYPE
 from datetime import datetime
+from dataclasses import replace
+
+from table_builder import CellStyle, TableSpec, add_table_block
+from pagination import PAGE_CAPACITY, transaction_summary
+from precedent_analytics import analyze_transactions
+from text_metrics import fit_font_size
+from media_registry import add_picture
+from layout_engine import layout_for
+
+# Standard cell padding used by the bulk-built tables (left, right, top, bottom)
+_CELL_MARGINS = (Inches(0.05), Inches(0.05), Inches(0.05), Inches(0.05))
 
 # Removed circular import - _apply_standard_header_and_title is now defined locally
 
@@ -162,6 +174,12 @@ def _apply_standard_header_and_title(slide, title_text, brand_config=None, compa
     underline_shape.fill.fore_color.rgb = colors["primary"]
     underline_shape.line.fill.background()
 
+    # Brand logo top right (path or bytes); the media registry keeps one copy per deck
+    logo = (brand_config or {}).get("logo")
+    if logo:
+        picture = add_picture(slide.shapes, logo, 0, title_top, height=Inches(0.45))
+        picture.left = Inches(13.333) - Inches(0.5) - picture.width
+
 
 def get_brand_styling(brand_config=None, color_scheme=None, typography=None):
     """Extract brand styling or use defaults - reusable across all functions"""
@@ -368,9 +386,15 @@ def render_investor_considerations_slide(data=None, color_scheme=None, typograph
     title_text = (data or {}).get('title', 'Investor Considerations & Mitigating Factors')
     _apply_standard_header_and_title(slide, title_text, brand_config, company_name)
     
+    considerations = (data or {}).get('considerations', [])
+    mitigants = (data or {}).get('mitigants', [])
+    
+    # Geometry comes from layout_specs in templates.json: one row per consideration/mitigant pair
+    layout = layout_for("investor_considerations", prs, rows=max(len(considerations), len(mitigants)))
+    
     # Add column headers
     # Considerations header
-    cons_header = slide.shapes.add_textbox(Inches(1), Inches(1.4), Inches(5.5), Inches(0.5))
+    cons_header = slide.shapes.add_textbox(*layout.frame("considerations_header").box)
     cons_frame = cons_header.text_frame
     cons_frame.clear()
     p = cons_frame.paragraphs[0]
@@ -382,7 +406,7 @@ def render_investor_considerations_slide(data=None, color_scheme=None, typograph
     p.alignment = PP_ALIGN.CENTER
     
     # Mitigants header
-    mit_header = slide.shapes.add_textbox(Inches(7), Inches(1.4), Inches(5.5), Inches(0.5))
+    mit_header = slide.shapes.add_textbox(*layout.frame("mitigants_header").box)
     mit_frame = mit_header.text_frame
     mit_frame.clear()
     p = mit_frame.paragraphs[0]
@@ -393,29 +417,18 @@ def render_investor_considerations_slide(data=None, color_scheme=None, typograph
     p.font.bold = True
     p.alignment = PP_ALIGN.CENTER
     
-    # Content positioning
-    y_start = 2.0
-    row_height = 1.1
-    
     # Add considerations and mitigants
-    considerations = (data or {}).get('considerations', [])
-    mitigants = (data or {}).get('mitigants', [])
-    
-    max_items = max(len(considerations), len(mitigants))
-    
-    for i in range(max_items):
-        y_pos = y_start + (i * row_height)
-        
+    for i, row in enumerate(layout.items("rows")):
         # Add consideration if exists
         if i < len(considerations):
             # Question mark circle
-            circle = slide.shapes.add_shape(MSO_SHAPE.OVAL, Inches(0.7), Inches(y_pos), Inches(0.3), Inches(0.3))
+            circle = slide.shapes.add_shape(MSO_SHAPE.OVAL, *row.part("consideration_icon").box)
             circle.fill.solid()
             circle.fill.fore_color.rgb = colors["primary"]
             circle.line.fill.background()
             
             # Question mark text
-            q_text = slide.shapes.add_textbox(Inches(0.7), Inches(y_pos), Inches(0.3), Inches(0.3))
+            q_text = slide.shapes.add_textbox(*row.part("consideration_icon").box)
             q_frame = q_text.text_frame
             q_frame.clear()
             p = q_frame.paragraphs[0]
@@ -428,7 +441,7 @@ def render_investor_considerations_slide(data=None, color_scheme=None, typograph
             q_frame.vertical_anchor = MSO_ANCHOR.MIDDLE
             
             # Consideration text
-            cons_text = slide.shapes.add_textbox(Inches(1.1), Inches(y_pos - 0.1), Inches(5.2), Inches(1.0))
+            cons_text = slide.shapes.add_textbox(*row.part("consideration_text").box)
             cons_text_frame = cons_text.text_frame
             cons_text_frame.clear()
             p = cons_text_frame.paragraphs[0]
@@ -443,13 +456,13 @@ def render_investor_considerations_slide(data=None, color_scheme=None, typograph
         # Add mitigant if exists
         if i < len(mitigants):
             # Info circle
-            circle2 = slide.shapes.add_shape(MSO_SHAPE.OVAL, Inches(6.7), Inches(y_pos), Inches(0.3), Inches(0.3))
+            circle2 = slide.shapes.add_shape(MSO_SHAPE.OVAL, *row.part("mitigant_icon").box)
             circle2.fill.solid()
             circle2.fill.fore_color.rgb = colors["secondary"]
             circle2.line.fill.background()
             
             # Info icon text
-            bulb_text = slide.shapes.add_textbox(Inches(6.7), Inches(y_pos), Inches(0.3), Inches(0.3))
+            bulb_text = slide.shapes.add_textbox(*row.part("mitigant_icon").box)
             bulb_frame = bulb_text.text_frame
             bulb_frame.clear()
             p = bulb_frame.paragraphs[0]
@@ -462,7 +475,7 @@ def render_investor_considerations_slide(data=None, color_scheme=None, typograph
             bulb_frame.vertical_anchor = MSO_ANCHOR.MIDDLE
             
             # Mitigant text
-            mit_text = slide.shapes.add_textbox(Inches(7.1), Inches(y_pos - 0.1), Inches(5.7), Inches(1.0))
+            mit_text = slide.shapes.add_textbox(*row.part("mitigant_text").box)
             mit_text_frame = mit_text.text_frame
             mit_text_frame.clear()
             p = mit_text_frame.paragraphs[0]
@@ -478,7 +491,7 @@ def render_investor_considerations_slide(data=None, color_scheme=None, typograph
     today = datetime.now().strftime("%B %d, %Y")
     
     # Add footer - "Confidential | [today's date]" on LEFT
-    footer_left = slide.shapes.add_textbox(Inches(0.5), Inches(7.0), Inches(6), Inches(0.4))
+    footer_left = slide.shapes.add_textbox(*layout.frame("footer_left").box)
     footer_left_frame = footer_left.text_frame
     footer_left_frame.clear()
     p = footer_left_frame.paragraphs[0]
@@ -490,7 +503,7 @@ def render_investor_considerations_slide(data=None, color_scheme=None, typograph
     footer_left_frame.vertical_anchor = MSO_ANCHOR.MIDDLE
     
     # Add footer - Company name on RIGHT
-    footer_right = slide.shapes.add_textbox(Inches(10), Inches(7.0), Inches(3), Inches(0.4))
+    footer_right = slide.shapes.add_textbox(*layout.frame("footer_right").box)
     footer_right_frame = footer_right.text_frame
     footer_right_frame.clear()
     p = footer_right_frame.paragraphs[0]
@@ -543,6 +556,8 @@ def render_product_service_footprint_slide(data=None, color_scheme=None, typogra
         if color is None:
             color = colors["text"]
             
+        # Shrink text that would overflow its box (never below text_metrics' floor)
+        font_size = fit_font_size(text, fonts["primary_font"], font_size, width, height, bold)
         textbox = slide.shapes.add_textbox(left, top, width, height)
         text_frame = textbox.text_frame
         text_frame.text = str(text)  # Convert to string to avoid issues
@@ -606,46 +621,20 @@ def render_product_service_footprint_slide(data=None, color_scheme=None, typogra
         table_top = Inches(1.8)
         table_height = Inches(2.8)
         
-        table = slide.shapes.add_table(rows, cols, table_left, table_top, table_width, table_height).table
-        
-        # Style table
-        for i, row_data in enumerate(table_data):
-            for j, cell_text in enumerate(row_data):
-                cell = table.cell(i, j)
-                cell.text = str(cell_text)
-                cell.margin_left = Inches(0.05)
-                cell.margin_right = Inches(0.05)
-                cell.margin_top = Inches(0.05)
-                cell.margin_bottom = Inches(0.05)
-                
-                # Style cell text
-                for paragraph in cell.text_frame.paragraphs:
-                    paragraph.alignment = PP_ALIGN.CENTER
-                    for run in paragraph.runs:
-                        run.font.name = fonts["primary_font"]
-                        run.font.size = Pt(9)
-                        
-                        if i == 0:  # Header row
-                            run.font.bold = True
-                            run.font.color.rgb = colors["background"]
-                            cell.fill.solid()
-                            cell.fill.fore_color.rgb = colors["primary"]
-                        else:
-                            run.font.color.rgb = colors["text"]
-                            if i % 2 == 0:  # Alternate row colors
-                                cell.fill.solid()
-                                cell.fill.fore_color.rgb = colors["light_grey"]
-                            else:
-                                cell.fill.solid()
-                                cell.fill.fore_color.rgb = colors["background"]
-        
-        # Adjust column widths dynamically based on number of columns
-        if cols > 0:
-            for i in range(cols):
-                if i == 0:  # First column wider for location names
-                    table.columns[i].width = Inches(1.2)
-                else:
-                    table.columns[i].width = Inches(0.8)
+        # Style table: header row, then alternating light grey / background rows
+        body_style = CellStyle(font_name=fonts["primary_font"], size=Pt(9), color=colors["text"],
+                               fill=colors["background"], align=PP_ALIGN.CENTER, margins=_CELL_MARGINS)
+        table_spec = TableSpec(
+            body=body_style,
+            header=replace(body_style, bold=True, color=colors["background"], fill=colors["primary"]),
+            band=replace(body_style, fill=colors["light_grey"]),
+        )
+        
+        # First column wider for location names
+        col_widths = [Inches(1.2)] + [Inches(0.8)] * (cols - 1)
+        
+        add_table_block(slide, table_data, table_left, table_top, table_width, table_height,
+                        table_spec, col_widths=col_widths)
     
     # Key Operational Metrics (ALL FROM DATA)
     metrics_title_top = Inches(4.8)
@@ -762,6 +751,8 @@ def render_competitive_positioning_slide(data=None, color_scheme=None, typograph
         if color is None:
             color = colors["text"]
             
+        # Shrink text that would overflow its box (never below text_metrics' floor)
+        font_size = fit_font_size(text, fonts["primary_font"], font_size, width, height, bold)
         textbox = slide.shapes.add_textbox(left, top, width, height)
         text_frame = textbox.text_frame
         text_frame.text = text
@@ -808,7 +799,7 @@ def render_competitive_positioning_slide(data=None, color_scheme=None, typograph
         {'name': 'Union Hospital', 'revenue': 220}
     ])
     
-    chart_data = ChartData()
+    chart_data = CachedChartData()
     chart_data.categories = [comp['name'] for comp in competitors_data]
     chart_data.add_series('Revenue (HK$ M)', [comp['revenue'] for comp in competitors_data])
     
@@ -818,39 +809,15 @@ def render_competitive_positioning_slide(data=None, color_scheme=None, typograph
     chart_width = Inches(6)
     chart_height = Inches(2.5)
     
-    chart_shape = slide.shapes.add_chart(
-        XL_CHART_TYPE.COLUMN_CLUSTERED, chart_left, chart_top, chart_width, chart_height, chart_data
+    chart_shape = add_chart(
+        slide.shapes, XL_CHART_TYPE.COLUMN_CLUSTERED, chart_left, chart_top, chart_width, chart_height, chart_data
     )
     
     chart = chart_shape.chart
     
-    # Style the chart
-    chart.has_legend = False
-    chart.chart_title.has_text_frame = True
-    chart.chart_title.text_frame.clear()
-    
-    # Style chart elements
-    category_axis = chart.category_axis
-    category_axis.has_major_gridlines = False
-    category_axis.tick_labels.font.size = Pt(9)
-    category_axis.tick_labels.font.name = fonts["primary_font"]
-    
-    value_axis = chart.value_axis
-    value_axis.has_major_gridlines = True
-    value_axis.tick_labels.font.size = Pt(9)
-    value_axis.tick_labels.font.name = fonts["primary_font"]
-    value_axis.maximum_scale = 500
-    
-    # Highlight specific bar in gold/secondary color
-    series = chart.series[0]
-    points = series.points
-    for i, point in enumerate(points):
-        if competitors_data[i]['name'] == 'OT&P Healthcare':  # Find target company
-            point.format.fill.solid()
-            point.format.fill.fore_color.rgb = colors["secondary"]
-        else:
-            point.format.fill.solid()
-            point.format.fill.fore_color.rgb = colors["primary"]
+    # Style the chart; only the target company's bar gets its own point format
+    highlight = [i for i, comp in enumerate(competitors_data) if comp['name'] == 'OT&P Healthcare']
+    apply_chart_style(chart, "highlight_bar", colors, fonts, highlight_points=highlight, value_max=500)
     
     # Right side - Competitive Assessment Table
     add_clean_text(slide, Inches(7.5), Inches(1.3), Inches(5.5), Inches(0.3), 
@@ -871,44 +838,23 @@ def render_competitive_positioning_slide(data=None, color_scheme=None, typograph
     table_width = Inches(5.5)
     table_height = Inches(1.5)
     
-    rows, cols = len(assessment_data), len(assessment_data[0])
-    table = slide.shapes.add_table(rows, cols, table_left, table_top, table_width, table_height).table
-    
-    # Style assessment table
-    for i, row_data in enumerate(assessment_data):
-        for j, cell_text in enumerate(row_data):
-            cell = table.cell(i, j)
-            cell.text = cell_text
-            cell.margin_left = Inches(0.05)
-            cell.margin_right = Inches(0.05)
-            cell.margin_top = Inches(0.05)
-            cell.margin_bottom = Inches(0.05)
-            
-            for paragraph in cell.text_frame.paragraphs:
-                paragraph.alignment = PP_ALIGN.CENTER
-                for run in paragraph.runs:
-                    run.font.name = fonts["primary_font"]
-                    run.font.size = Pt(8)
-                    
-                    if i == 0:  # Header row
-                        run.font.bold = True
-                        run.font.color.rgb = colors["background"]
-                        cell.fill.solid()
-                        cell.fill.fore_color.rgb = colors["primary"]
-                    elif i == 1:  # Target company row (highlighted)
-                        run.font.color.rgb = colors["primary"]
-                        cell.fill.solid()
-                        cell.fill.fore_color.rgb = colors["light_grey"]
-                    else:
-                        run.font.color.rgb = colors["text"]
-                        if i % 2 == 0:
-                            cell.fill.solid()
-                            cell.fill.fore_color.rgb = colors["light_grey"]
+    # Style assessment table: header, highlighted target company row, banded rows
+    body_style = CellStyle(font_name=fonts["primary_font"], size=Pt(8), color=colors["text"],
+                           align=PP_ALIGN.CENTER, margins=_CELL_MARGINS)
+    table_spec = TableSpec(
+        body=body_style,
+        header=replace(body_style, bold=True, color=colors["background"], fill=colors["primary"]),
+        band=replace(body_style, fill=colors["light_grey"]),
+        rows={1: replace(body_style, color=colors["primary"], fill=colors["light_grey"])},
+    )
     
-    # Adjust table column widths
+    # Table column widths (only when the table has the standard five columns)
     col_widths = [Inches(1.5), Inches(0.8), Inches(0.7), Inches(0.9), Inches(0.8)]
-    for i, width in enumerate(col_widths):
-        table.columns[i].width = width
+    if len(assessment_data[0]) != len(col_widths):
+        col_widths = None
+    
+    add_table_block(slide, assessment_data, table_left, table_top, table_width, table_height,
+                    table_spec, col_widths=col_widths)
     
     # Source note for assessment
     add_clean_text(slide, Inches(7.5), Inches(3.3), Inches(5.5), Inches(0.2), 
@@ -1033,6 +979,8 @@ def render_investor_process_overview_slide(data=None, color_scheme=None, typogra
     # Helper function to add clean text with better wrapping
     def add_clean_text(slide, left, top, width, height, text, font_size=10, 
                        color=colors["text"], bold=False, align=PP_ALIGN.LEFT):
+        # Shrink text that would overflow its box (never below text_metrics' floor)
+        font_size = fit_font_size(text, fonts["primary_font"], font_size, width, height, bold)
         textbox = slide.shapes.add_textbox(left, top, width, height)
         text_frame = textbox.text_frame
         text_frame.text = text
@@ -1264,6 +1212,8 @@ def render_margin_cost_resilience_slide(data=None, color_scheme=None, typography
     # Helper function to add clean text
     def add_clean_text(slide, left, top, width, height, text, font_size=10, 
                        color=colors["text"], bold=False, align=PP_ALIGN.LEFT, bg_color=None):
+        # Shrink text that would overflow its box (never below text_metrics' floor)
+        font_size = fit_font_size(text, fonts["primary_font"], font_size, width, height, bold)
         textbox = slide.shapes.add_textbox(left, top, width, height)
         text_frame = textbox.text_frame
         text_frame.text = text
@@ -1312,7 +1262,7 @@ def render_margin_cost_resilience_slide(data=None, color_scheme=None, typography
     # Create chart if we have data
     if chart_data_info:
         try:
-            chart_data = ChartData()
+            chart_data = CachedChartData()
             
             categories = chart_data_info.get('categories', ['2020', '2021', '2022', '2023', '2024E'])
             values = chart_data_info.get('values', [15.0, 16.6, 17.2, 19.0, 19.6])
@@ -1329,40 +1279,15 @@ def render_margin_cost_resilience_slide(data=None, color_scheme=None, typography
             chart_width = Inches(6)
             chart_height = Inches(2.2)
             
-            chart_shape = slide.shapes.add_chart(
-                XL_CHART_TYPE.LINE_MARKERS, chart_left, chart_top, chart_width, chart_height, chart_data
+            chart_shape = add_chart(
+                slide.shapes, XL_CHART_TYPE.LINE_MARKERS, chart_left, chart_top, chart_width, chart_height, chart_data
             )
             
             chart = chart_shape.chart
             
-            # Style the chart
-            chart.has_legend = False
-            chart.chart_title.has_text_frame = True
-            chart.chart_title.text_frame.clear()
-            
-            # Style chart elements
+            # Style the chart: line and markers are set once at series level
             try:
-                category_axis = chart.category_axis
-                category_axis.has_major_gridlines = False
-                category_axis.tick_labels.font.size = Pt(10)
-                category_axis.tick_labels.font.name = fonts["primary_font"]
-                
-                value_axis = chart.value_axis
-                value_axis.has_major_gridlines = True
-                value_axis.tick_labels.font.size = Pt(10)
-                value_axis.tick_labels.font.name = fonts["primary_font"]
-                value_axis.maximum_scale = 500
-                
-                # Style the line series (secondary color)
-                series = chart.series[0]
-                series.format.line.color.rgb = colors["secondary"]
-                series.format.line.width = Pt(3)
-                
-                # Style the markers
-                for point in series.points:
-                    point.format.fill.solid()
-                    point.format.fill.fore_color.rgb = colors["secondary"]
-                    point.format.line.color.rgb = colors["secondary"]
+                apply_chart_style(chart, "margin_line", colors, fonts, value_max=500)
             except Exception as e:
                 print(f"[DEBUG] Chart styling error: {e}")
                 
@@ -1525,6 +1450,35 @@ def render_margin_cost_resilience_slide(data=None, color_scheme=None, typography
     return prs
 
 
+# Key metrics shown when a historical performance slide provides none
+DEFAULT_HISTORICAL_METRICS = [
+    {
+        'title': 'Patient Growth (CAGR)',
+        'value': '12.4%',
+        'period': '(2020-2024)',
+        'note': '✓ Consistent growth despite pandemic disruptions'
+    },
+    {
+        'title': 'Patient Retention Rate',
+        'value': '87%',
+        'period': '(2024)',
+        'note': '✓ Premium market segment leading indicator'
+    },
+    {
+        'title': 'Avg. Revenue Per Patient',
+        'value': '$980',
+        'period': 'USD (2024)',
+        'note': '↗ +8.2% increase from 2023'
+    },
+    {
+        'title': 'Corporate Contracts',
+        'value': '35+',
+        'period': '(2024)',
+        'note': '● Major financial institutions & MNCs'
+    }
+]
+
+
 def render_historical_financial_performance_slide(data=None, color_scheme=None, typography=None, company_name="Moelis", prs=None, brand_config=None, **kwargs):
     """
     Renders a historical financial performance slide with chart and metrics
@@ -1548,6 +1502,8 @@ def render_historical_financial_performance_slide(data=None, color_scheme=None,
     # Helper function to add clean text
     def add_clean_text(slide, left, top, width, height, text, font_size=10, 
                        color=colors["text"], bold=False, align=PP_ALIGN.LEFT, bg_color=None):
+        # Shrink text that would overflow its box (never below text_metrics' floor)
+        font_size = fit_font_size(text, fonts["primary_font"], font_size, width, height, bold)
         textbox = slide.shapes.add_textbox(left, top, width, height)
         text_frame = textbox.text_frame
         text_frame.text = text
@@ -1585,14 +1541,28 @@ def render_historical_financial_performance_slide(data=None, color_scheme=None,
     title_text = (data or {}).get('title', 'Historical Financial Performance (I)')
     _apply_standard_header_and_title(slide, title_text, brand_config, company_name)
     
+    # Key metrics and revenue growth bullets, resolved up front to size the layout
+    metrics_section = (data or {}).get('key_metrics', {})
+    metrics = metrics_section.get('metrics', [])
+    
+    # If no metrics provided, create default ones
+    if not metrics:
+        metrics = DEFAULT_HISTORICAL_METRICS
+    revenue_section = (data or {}).get('revenue_growth', {})
+    revenue_points = revenue_section.get('points', [])
+    
+    # Geometry comes from layout_specs in templates.json (max 4 metrics, max 5 points)
+    layout = layout_for("historical_financial_performance", prs,
+                        metrics=len(metrics), revenue_points=len(revenue_points))
+    
     # Main chart title
     chart_info = (data or {}).get('chart', {})
     chart_title = chart_info.get('title', 'Company - 5-Year Financial Performance')
-    add_clean_text(slide, Inches(1), Inches(1.3), Inches(11), Inches(0.3), 
+    add_clean_text(slide, *layout.frame("chart_title").box, 
                    chart_title, 16, colors["primary"], True, PP_ALIGN.CENTER)
     
     # Create combination chart
-    chart_data = ChartData()
+    chart_data = CachedChartData()
     categories = chart_info.get('categories', ['2020', '2021', '2022', '2023', '2024'])
     revenue_data = chart_info.get('revenue', [26, 24, 33, 40, 42])
     ebitda_data = chart_info.get('ebitda', [6.5, 5.8, 8.2, 10.0, 11.2])
@@ -1602,152 +1572,70 @@ def render_historical_financial_performance_slide(data=None, color_scheme=None,
     chart_data.add_series('EBITDA (USD millions)', ebitda_data)
     
     # Add chart
-    chart_left = Inches(2)
-    chart_top = Inches(1.7)
-    chart_width = Inches(9)
-    chart_height = Inches(2.3)
-    
-    chart_shape = slide.shapes.add_chart(
-        XL_CHART_TYPE.COLUMN_CLUSTERED, chart_left, chart_top, chart_width, chart_height, chart_data
+    chart_shape = add_chart(
+        slide.shapes, XL_CHART_TYPE.COLUMN_CLUSTERED, *layout.frame("chart").box, chart_data
     )
     
     chart = chart_shape.chart
     
-    # Style the chart
-    chart.has_legend = True
-    chart.legend.position = XL_LEGEND_POSITION.TOP
-    chart.legend.font.size = Pt(10)
-    
-    # Style chart elements
-    category_axis = chart.category_axis
-    category_axis.has_major_gridlines = False
-    category_axis.tick_labels.font.size = Pt(10)
-    category_axis.tick_labels.font.name = fonts["primary_font"]
-    
-    value_axis = chart.value_axis
-    value_axis.has_major_gridlines = True
-    value_axis.tick_labels.font.size = Pt(10)
-    value_axis.tick_labels.font.name = fonts["primary_font"]
-    value_axis.maximum_scale = 45
-    
-    # Color the series
-    series = chart.series
-    
-    # Revenue series (primary color)
-    revenue_series = series[0]
-    revenue_series.format.fill.solid()
-    revenue_series.format.fill.fore_color.rgb = colors["primary"]
-    for point in revenue_series.points:
-        point.format.fill.solid()
-        point.format.fill.fore_color.rgb = colors["primary"]
-    
-    # EBITDA series (secondary color)
-    ebitda_series = series[1]
-    ebitda_series.format.fill.solid()
-    ebitda_series.format.fill.fore_color.rgb = colors["secondary"]
-    for point in ebitda_series.points:
-        point.format.fill.solid()
-        point.format.fill.fore_color.rgb = colors["secondary"]
+    # Style the chart; the series fills cover every point
+    apply_chart_style(chart, "revenue_ebitda", colors, fonts, value_max=45)
     
     # Chart footnote
     chart_footnote = chart_info.get('footnote', '*Historical figures represent estimated performance based on market trends.')
-    add_clean_text(slide, Inches(2), Inches(4.1), Inches(9), Inches(0.2), 
+    add_clean_text(slide, *layout.frame("chart_footnote").box, 
                    chart_footnote, 8, colors["text"], False, PP_ALIGN.CENTER)
     
-    # Key metrics section (removed shadows from boxes)
-    metrics_section = (data or {}).get('key_metrics', {})
-    metrics_y = Inches(4.4)
-    metrics = metrics_section.get('metrics', [])
-    
-    # If no metrics provided, create default ones
-    if not metrics:
-        metrics = [
-            {
-                'title': 'Patient Growth (CAGR)',
-                'value': '12.4%',
-                'period': '(2020-2024)',
-                'note': '✓ Consistent growth despite pandemic disruptions'
-            },
-            {
-                'title': 'Patient Retention Rate',
-                'value': '87%',
-                'period': '(2024)',
-                'note': '✓ Premium market segment leading indicator'
-            },
-            {
-                'title': 'Avg. Revenue Per Patient',
-                'value': '$980',
-                'period': 'USD (2024)',
-                'note': '↗ +8.2% increase from 2023'
-            },
-            {
-                'title': 'Corporate Contracts',
-                'value': '35+',
-                'period': '(2024)',
-                'note': '● Major financial institutions & MNCs'
-            }
-        ]
-    
-    # Calculate positions to fit exactly 4 boxes across slide width
-    slide_content_width = Inches(12.5)  # Total usable width
-    box_width = Inches(2.8)             # Width of each box
-    total_boxes_width = box_width * 4   # Total width of all boxes
-    spacing_width = slide_content_width - total_boxes_width  # Remaining space
-    box_spacing = spacing_width / 5     # Space between boxes (5 gaps: before, between 3, after)
-    
-    for i, metric in enumerate(metrics[:4]):  # Max 4 metrics
-        x_pos = Inches(0.5) + box_spacing + i * (box_width + box_spacing)
-        
+    # Key metrics section (removed shadows from boxes): 4 evenly spaced boxes across the slide
+    for box, metric in zip(layout.items("metrics"), metrics):
         # Metric box (NO SHADOW)
-        metric_bg = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, x_pos, metrics_y, box_width, Inches(1.1))
+        metric_bg = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, *box.box)
         metric_bg.fill.solid()
         metric_bg.fill.fore_color.rgb = colors["light_grey"]
         metric_bg.line.fill.background()
         metric_bg.shadow.inherit = False  # Remove shadow
         
-        add_clean_text(slide, x_pos + Inches(0.1), metrics_y + Inches(0.1), box_width - Inches(0.2), Inches(0.2), 
+        add_clean_text(slide, *box.part("title").box, 
                        metric.get('title', ''), 10, colors["text"], True)
-        add_clean_text(slide, x_pos + Inches(0.1), metrics_y + Inches(0.3), box_width - Inches(0.2), Inches(0.25), 
+        add_clean_text(slide, *box.part("value").box, 
                        metric.get('value', ''), 18, colors["primary"], True)
-        add_clean_text(slide, x_pos + Inches(0.1), metrics_y + Inches(0.55), box_width - Inches(0.2), Inches(0.15), 
+        add_clean_text(slide, *box.part("period").box, 
                        metric.get('period', ''), 9, colors["text"])
-        add_clean_text(slide, x_pos + Inches(0.1), metrics_y + Inches(0.75), box_width - Inches(0.2), Inches(0.25), 
+        add_clean_text(slide, *box.part("note").box, 
                        metric.get('note', ''), 8, RGBColor(34, 139, 34))
     
     # Revenue Growth section
-    revenue_section = (data or {}).get('revenue_growth', {})
-    covid_y = Inches(5.7)
     section_title = revenue_section.get('title', 'Revenue Growth')
-    add_clean_text(slide, Inches(1), covid_y, Inches(7), Inches(0.2), 
+    add_clean_text(slide, *layout.frame("revenue_title").box, 
                    section_title, 12, colors["primary"], True)
     
     # Five bullet points for revenue growth
-    revenue_points = revenue_section.get('points', [])
-    for i, point in enumerate(revenue_points[:5]):  # Max 5 points
-        add_clean_text(slide, Inches(1), covid_y + Inches(0.25 + i * 0.18), Inches(7), Inches(0.16), 
+    for point_frame, point in zip(layout.items("revenue_points"), revenue_points):
+        add_clean_text(slide, *point_frame.box, 
                        f"● {point}", 9, colors["text"])
     
     # Banker's view section (NO SHADOW)
     banker_view = (data or {}).get('banker_view', {})
-    banker_box = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, Inches(8.5), covid_y, Inches(4.3), Inches(0.7))
+    banker_frame = layout.frame("banker_view")
+    banker_box = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, *banker_frame.box)
     banker_box.fill.solid()
     banker_box.fill.fore_color.rgb = RGBColor(240, 255, 240)  # Light green
     banker_box.line.fill.background()  # Remove outline
     banker_box.shadow.inherit = False  # Remove shadow
     
-    add_clean_text(slide, Inches(8.7), covid_y + Inches(0.05), Inches(3.9), Inches(0.15), 
+    add_clean_text(slide, *banker_frame.part("title").box, 
                    banker_view.get('title', "BANKER'S VIEW"), 10, RGBColor(34, 139, 34), True)
-    add_clean_text(slide, Inches(8.7), covid_y + Inches(0.2), Inches(3.9), Inches(0.45), 
+    add_clean_text(slide, *banker_frame.part("text").box, 
                    banker_view.get('text', ''), 9, colors["text"])
     
     # Get today's date
     today = datetime.now().strftime("%B %d, %Y")
     
     # Footer
-    add_clean_text(slide, Inches(0.5), Inches(6.9), Inches(4), Inches(0.2), 
+    add_clean_text(slide, *layout.frame("footer_left").box, 
                    f"Confidential | {today}", 9, colors["footer_grey"])
     
-    add_clean_text(slide, Inches(9.5), Inches(6.9), Inches(3.5), Inches(0.2), 
+    add_clean_text(slide, *layout.frame("footer_right").box, 
                    f"{company_name} Investment Opportunity    6", 9, colors["footer_grey"], False, PP_ALIGN.RIGHT)
     
     return prs
@@ -1785,6 +1673,8 @@ def render_business_overview_slide(data=None, color_scheme=None, typography=None
         if color is None:
             color = colors["text"]
             
+        # Shrink text that would overflow its box (never below text_metrics' floor)
+        font_size = fit_font_size(text, fonts["primary_font"], font_size, width, height, bold)
         textbox = slide.shapes.add_textbox(left, top, width, height)
         text_frame = textbox.text_frame
         text_frame.text = text
@@ -2059,6 +1949,19 @@ def render_precedent_transactions_slide(data=None, color_scheme=None, typography
     chart_title_para.font.bold = True
     chart_title_para.alignment = PP_ALIGN.CENTER
     
+    # Summary statistics are computed once across the full set by the pagination stage
+    summary = slide_data.get('__summary') or transaction_summary(transactions)
+    if summary.get('count'):
+        summary_box = slide.shapes.add_textbox(Inches(2.0), Inches(1.85), Inches(9.0), Inches(0.3))
+        summary_frame = summary_box.text_frame
+        summary_frame.text = (f"Median: {summary['median_multiple']:.1f}x  |  Mean: {summary['mean_multiple']:.1f}x"
+                              f"  |  n = {summary['count']}")
+        summary_para = summary_frame.paragraphs[0]
+        summary_para.font.name = fonts["primary_font"]
+        summary_para.font.size = Pt(10)
+        summary_para.font.color.rgb = colors["text"]
+        summary_para.alignment = PP_ALIGN.CENTER
+    
     # Simple bar representation using rectangles
     num_transactions = len(transactions)
     bar_area_left = Inches(2.0)
@@ -2066,10 +1969,14 @@ def render_precedent_transactions_slide(data=None, color_scheme=None, typography
     bar_width = bar_area_width / num_transactions
     bar_top = Inches(2.2)
     
+    # 0.6" per 1.0x, shrunk so the largest multiple in the full set fits under the summary line
+    analytics = analyze_transactions(transactions)
+    multiples = analytics.frame['ev_revenue_multiple'].fillna(0).tolist()
+    bar_heights = analytics.bar_heights(summary.get('max_multiple'))
+    
     for i, transaction in enumerate(transactions):
-        multiple = transaction.get('ev_revenue_multiple', 0)
-        # Scale bar height (max 2 inches for 3.0x multiple)
-        bar_height = Inches(multiple * 0.6) if multiple > 0 else Inches(0.1)
+        multiple = multiples[i]
+        bar_height = Inches(float(bar_heights[i]))
         
         bar_left = bar_area_left + (bar_width * i) + Inches(0.05)  # Small margin
         bar_actual_width = bar_width - Inches(0.1)  # Space between bars
@@ -2120,37 +2027,9 @@ def render_precedent_transactions_slide(data=None, color_scheme=None, typography
     table_width = Inches(9.0)  # Same as bar area
     row_height = Inches(0.35)
     
-    # Create row labels table
-    labels_table = slide.shapes.add_table(
-        num_rows, 1, 
-        labels_left, table_top, 
-        labels_width, row_height * num_rows
-    ).table
-    
-    # Create data table
-    data_table = slide.shapes.add_table(
-        num_rows, num_transactions, 
-        table_left, table_top, 
-        table_width, row_height * num_rows
-    ).table
-    
-    # Format row labels
-    for i, label in enumerate(row_labels):
-        cell = labels_table.cell(i, 0)
-        cell.text = label
-        cell.fill.solid()
-        cell.fill.fore_color.rgb = colors["light_grey"]
-        
-        para = cell.text_frame.paragraphs[0]
-        para.font.name = fonts["primary_font"]
-        para.font.size = Pt(12)
-        para.font.color.rgb = colors["text"]
-        para.font.bold = True
-        para.alignment = PP_ALIGN.RIGHT
-        cell.vertical_anchor = MSO_ANCHOR.MIDDLE
-    
-    # Format data table
-    for col_idx, transaction in enumerate(transactions):
+    # Build one column of values per transaction
+    columns = []
+    for transaction in transactions:
         target = transaction.get('target', 'N/A')
         acquirer = transaction.get('acquirer', 'N/A')
         
@@ -2160,7 +2039,7 @@ def render_precedent_transactions_slide(data=None, color_scheme=None, typography
         if len(acquirer) > 15:
             acquirer = acquirer[:15] + '...'
             
-        data_values = [
+        columns.append([
             transaction.get('date', 'N/A'),
             target,
             acquirer,
@@ -2168,21 +2047,24 @@ def render_precedent_transactions_slide(data=None, color_scheme=None, typography
             f"${transaction.get('enterprise_value', 0):,.0f}" if transaction.get('enterprise_value') else 'N/A',
             f"${transaction.get('revenue', 0):,.0f}" if transaction.get('revenue') else 'N/A',
             f"{transaction.get('ev_revenue_multiple', 0):.1f}x" if transaction.get('ev_revenue_multiple') else 'N/A'
-        ]
-        
-        for row_idx, value in enumerate(data_values):
-            cell = data_table.cell(row_idx, col_idx)
-            cell.text = str(value)
-            
-            cell.fill.solid()
-            cell.fill.fore_color.rgb = colors["background"]
-            
-            para = cell.text_frame.paragraphs[0]
-            para.font.name = fonts["primary_font"]
-            para.font.size = Pt(9)
-            para.font.color.rgb = colors["text"]
-            para.alignment = PP_ALIGN.CENTER
-            cell.vertical_anchor = MSO_ANCHOR.MIDDLE
+        ])
+    
+    # Create row labels table
+    labels_spec = TableSpec(body=CellStyle(
+        font_name=fonts["primary_font"], size=Pt(12), bold=True, color=colors["text"],
+        fill=colors["light_grey"], align=PP_ALIGN.RIGHT, anchor=MSO_ANCHOR.MIDDLE,
+    ))
+    add_table_block(slide, [[label] for label in row_labels], labels_left, table_top,
+                    labels_width, row_height * num_rows, labels_spec)
+    
+    # Create data table (rows are fields, columns are transactions)
+    data_spec = TableSpec(body=CellStyle(
+        font_name=fonts["primary_font"], size=Pt(9), color=colors["text"],
+        fill=colors["background"], align=PP_ALIGN.CENTER, anchor=MSO_ANCHOR.MIDDLE,
+    ))
+    data_rows = [list(row) for row in zip(*columns)]
+    add_table_block(slide, data_rows, table_left, table_top,
+                    table_width, row_height * num_rows, data_spec)
     
     # Add footer
     footer_left = slide.shapes.add_textbox(Inches(0.5), Inches(7.0), Inches(6), Inches(0.4))
@@ -2564,6 +2446,8 @@ def render_growth_strategy_slide(data=None, color_scheme=None, typography=None,
     # Helper function
     def add_clean_text(slide, left, top, width, height, text, font_size=10, 
                        color=colors["text"], bold=False, align=PP_ALIGN.LEFT, bg_color=None):
+        # Shrink text that would overflow its box (never below text_metrics' floor)
+        font_size = fit_font_size(text, fonts["primary_font"], font_size, width, height, bold)
         textbox = slide.shapes.add_textbox(left, top, width, height)
         text_frame = textbox.text_frame
         text_frame.text = text
@@ -2636,7 +2520,7 @@ def render_growth_strategy_slide(data=None, color_scheme=None, typography=None,
         
         if categories and revenue_data and ebitda_data:
             try:
-                chart_data = ChartData()
+                chart_data = CachedChartData()
                 chart_data.categories = categories
                 chart_data.add_series('Revenue (USD millions)', revenue_data)
                 chart_data.add_series('EBITDA (USD millions)', ebitda_data)
@@ -2647,23 +2531,12 @@ def render_growth_strategy_slide(data=None, color_scheme=None, typography=None,
                 chart_width = Inches(5.5)
                 chart_height = Inches(2.5)
                 
-                chart_shape = slide.shapes.add_chart(
-                    XL_CHART_TYPE.COLUMN_CLUSTERED, chart_left, chart_top, chart_width, chart_height, chart_data
+                chart_shape = add_chart(
+                    slide.shapes, XL_CHART_TYPE.COLUMN_CLUSTERED, chart_left, chart_top, chart_width, chart_height, chart_data
                 )
                 
                 chart = chart_shape.chart
-                chart.has_legend = True
-                chart.legend.position = XL_LEGEND_POSITION.BOTTOM
-                
-                # Style chart
-                series = chart.series
-                # Revenue series (primary color)
-                series[0].format.fill.solid()
-                series[0].format.fill.fore_color.rgb = colors["primary"]
-                
-                # EBITDA series (secondary color)
-                series[1].format.fill.solid() 
-                series[1].format.fill.fore_color.rgb = colors["secondary"]
+                apply_chart_style(chart, "projection_bars", colors, fonts)
                 
             except Exception as e:
                 print(f"[DEBUG] Chart creation error: {e}")
@@ -2756,6 +2629,8 @@ def render_buyer_profiles_slide(data=None, color_scheme=None, typography=None, c
     # Helper function
     def add_clean_text(slide, left, top, width, height, text, font_size=10, 
                        color=colors["text"], bold=False, align=PP_ALIGN.LEFT, bg_color=None):
+        # Shrink text that would overflow its box (never below text_metrics' floor)
+        font_size = fit_font_size(text, fonts["primary_font"], font_size, width, height, bold)
         textbox = slide.shapes.add_textbox(left, top, width, height)
         text_frame = textbox.text_frame
         text_frame.text = text
@@ -2812,10 +2687,6 @@ def render_buyer_profiles_slide(data=None, color_scheme=None, typography=None, c
         row_height = Inches(0.8) if len(table_rows) <= 3 else Inches(0.6)
         table_height = row_height * num_rows
         
-        # Create table
-        table_shape = slide.shapes.add_table(num_rows, num_cols, table_left, table_top, table_width, table_height)
-        table = table_shape.table
-        
         # Set column widths
         if num_cols == 5:
             col_widths = [Inches(2.8), Inches(2.5), Inches(2.5), Inches(2.2), Inches(1.5)]
@@ -2824,34 +2695,21 @@ def render_buyer_profiles_slide(data=None, color_scheme=None, typography=None, c
             col_width = table_width / num_cols
             col_widths = [col_width] * num_cols
         
-        for i, width in enumerate(col_widths):
-            table.columns[i].width = width
-        
-        # Format header row
-        for j, header in enumerate(table_headers):
-            cell = table.cell(0, j)
-            cell.text = header
-            cell.margin_left = Inches(0.05)
-            cell.margin_right = Inches(0.05)
-            cell.margin_top = Inches(0.05)
-            cell.margin_bottom = Inches(0.05)
-            
-            # Header styling
-            cell.fill.solid()
-            cell.fill.fore_color.rgb = colors["primary"]
-            
-            for paragraph in cell.text_frame.paragraphs:
-                paragraph.alignment = PP_ALIGN.CENTER
-                for run in paragraph.runs:
-                    run.font.name = fonts["primary_font"]
-                    run.font.size = fonts["body_size"]
-                    run.font.bold = True
-                    run.font.color.rgb = colors["background"]
-        
-        # Format data rows
-        for i, row_data in enumerate(table_rows):
-            row_idx = i + 1
-            
+        # Header row, then alternating background / light grey rows with bold buyer names
+        body_style = CellStyle(font_name=fonts["primary_font"], size=Pt(9), color=colors["text"],
+                               fill=colors["background"], align=PP_ALIGN.LEFT,
+                               margins=_CELL_MARGINS, word_wrap=True)
+        table_spec = TableSpec(
+            body=body_style,
+            header=CellStyle(font_name=fonts["primary_font"], size=fonts["body_size"], bold=True,
+                             color=colors["background"], fill=colors["primary"],
+                             align=PP_ALIGN.CENTER, margins=_CELL_MARGINS),
+            band=replace(body_style, fill=colors["light_grey"]),
+            columns={0: {"bold": True}},
+        )
+        
+        table_data = [list(table_headers)]
+        for row_data in table_rows:
             # Handle different data formats
             if isinstance(row_data, dict):
                 # Convert dict to list based on expected fields
@@ -2865,36 +2723,11 @@ def render_buyer_profiles_slide(data=None, color_scheme=None, typography=None, c
             elif isinstance(row_data, list):
                 cell_data = row_data
             else:
-                continue
-            
-            for j, cell_text in enumerate(cell_data):
-                if j < num_cols:
-                    cell = table.cell(row_idx, j)
-                    cell.text = str(cell_text)
-                    cell.margin_left = Inches(0.05)
-                    cell.margin_right = Inches(0.05)
-                    cell.margin_top = Inches(0.05)
-                    cell.margin_bottom = Inches(0.05)
-                    
-                    # Alternate row colors
-                    if row_idx % 2 == 0:
-                        cell.fill.solid()
-                        cell.fill.fore_color.rgb = colors["light_grey"]
-                    else:
-                        cell.fill.solid()
-                        cell.fill.fore_color.rgb = colors["background"]
-                    
-                    # Text styling
-                    cell.text_frame.word_wrap = True
-                    for paragraph in cell.text_frame.paragraphs:
-                        paragraph.alignment = PP_ALIGN.LEFT
-                        for run in paragraph.runs:
-                            run.font.name = fonts["primary_font"]
-                            run.font.size = Pt(9)
-                            run.font.color.rgb = colors["text"]
-                            # Make first column (buyer name) bold
-                            if j == 0:
-                                run.font.bold = True
+                cell_data = []
+            table_data.append(cell_data[:num_cols])
+        
+        add_table_block(slide, table_data, table_left, table_top, table_width, table_height,
+                        table_spec, col_widths=col_widths)
     
     else:
         # No data - add placeholder
@@ -2945,6 +2778,9 @@ def render_sea_conglomerates_slide(data=None, color_scheme=None, typography=None
     else:
         slide_data = []
     
+    # Paginated plans carry the page title (with "(cont'd)") in dict form
+    base_title = data.get('title') if isinstance(data, dict) else None
+    
     print(f"[DEBUG] SEA conglomerates: Found {len(slide_data)} companies")
     print(f"[DEBUG] First company data: {slide_data[0] if slide_data else 'No data'}")
     
@@ -2996,8 +2832,8 @@ def render_sea_conglomerates_slide(data=None, color_scheme=None, typography=None
     # Get brand styling
     colors, fonts = get_brand_styling(brand_config, color_scheme, typography)
     
-    # Pagination: Split data into chunks of 4
-    max_entries_per_slide = 4
+    # Pagination: Split data into chunks (normally already done by pagination.paginate_plan)
+    max_entries_per_slide = PAGE_CAPACITY["sea_conglomerates"]
     slide_chunks = []
     
     for i in range(0, len(slide_data), max_entries_per_slide):
@@ -3011,7 +2847,7 @@ def render_sea_conglomerates_slide(data=None, color_scheme=None, typography=None
         slide = prs.slides.add_slide(slide_layout)
         
         # Title with pagination info
-        title_text = "SEA Conglomerate Strategic Buyers"
+        title_text = base_title or "SEA Conglomerate Strategic Buyers"
         if len(slide_chunks) > 1:
             title_text += f" (cont'd)" if slide_index > 0 else ""
         
@@ -3024,91 +2860,40 @@ def render_sea_conglomerates_slide(data=None, color_scheme=None, typography=None
         table_width = Inches(12.333)
         table_height = Inches(5.0)
         
-        # Calculate number of rows (header + data rows)
-        num_rows = len(chunk_data) + 1
-        num_cols = 6
-        
-        # Create table
-        table_shape = slide.shapes.add_table(num_rows, num_cols, table_left, table_top, table_width, table_height)
-        table = table_shape.table
-        
         # Column headers
         headers = ["Name", "Country", "Description", "Key shareholders", "Key financials (US$m)", "Moelis contact"]
         
         # Set column widths to match original
         col_widths = [Inches(1.8), Inches(1.0), Inches(4.2), Inches(2.2), Inches(1.8), Inches(1.333)]
-        for i, width in enumerate(col_widths):
-            table.columns[i].width = width
-        
-        # Format header row - DARK BLUE BACKGROUND
-        for col_idx, header in enumerate(headers):
-            cell = table.cell(0, col_idx)
-            # DARK BLUE BACKGROUND
-            cell.fill.solid()
-            cell.fill.fore_color.rgb = colors["primary"]
-            
-            # Header text
-            cell.text = header
-            cell.text_frame.margin_left = Inches(0.1)
-            cell.text_frame.margin_right = Inches(0.1)
-            cell.text_frame.margin_top = Inches(0.05)
-            cell.text_frame.margin_bottom = Inches(0.05)
-            
-            # Header formatting - WHITE TEXT on dark blue background
-            for paragraph in cell.text_frame.paragraphs:
-                paragraph.font.name = fonts["primary_font"]
-                paragraph.font.size = fonts["header_size"]
-                paragraph.font.bold = True
-                paragraph.font.color.rgb = colors["background"]  # WHITE text on dark blue
-                paragraph.alignment = PP_ALIGN.CENTER
-        
-        # Populate data rows - WHITE BACKGROUND
-        for row_idx, company in enumerate(chunk_data, 1):
+        
+        # Header row white on dark blue, data rows on white background
+        cell_margins = (Inches(0.1), Inches(0.1), Inches(0.05), Inches(0.05))
+        table_spec = TableSpec(
+            header=CellStyle(font_name=fonts["primary_font"], size=fonts["header_size"], bold=True,
+                             color=colors["background"], fill=colors["primary"],
+                             align=PP_ALIGN.CENTER, margins=cell_margins),
+            body=CellStyle(font_name=fonts["primary_font"], size=fonts["body_size"], bold=False,
+                           color=colors["text"], fill=colors["background"],
+                           align=PP_ALIGN.LEFT, margins=cell_margins, word_wrap=True),
+        )
+        
+        table_data = [headers]
+        for company in chunk_data:
             # Define the data for each column - handle different data structures
-            row_data = [
+            table_data.append([
                 company.get('name', ''),
                 company.get('country', ''),
                 company.get('description', company.get('healthcare_focus', '')),  # Fallback to healthcare_focus
                 company.get('key_shareholders', 'N/A'),
                 company.get('key_financials', company.get('revenue', '')),  # Fallback to revenue
                 company.get('moelis_contact', 'To be assigned')
-            ]
-            
-            for col_idx, data in enumerate(row_data):
-                cell = table.cell(row_idx, col_idx)
-                cell.text = str(data)
-                
-                # WHITE BACKGROUND
-                cell.fill.solid()
-                cell.fill.fore_color.rgb = colors["background"]
-                
-                # Cell margins
-                cell.text_frame.margin_left = Inches(0.1)
-                cell.text_frame.margin_right = Inches(0.1)
-                cell.text_frame.margin_top = Inches(0.05)
-                cell.text_frame.margin_bottom = Inches(0.05)
-                
-                # Text wrapping
-                cell.text_frame.word_wrap = True
-                
-                # Text formatting - BLACK TEXT
-                for paragraph in cell.text_frame.paragraphs:
-                    paragraph.font.name = fonts["primary_font"]
-                    paragraph.font.size = fonts["body_size"]
-                    paragraph.font.bold = False
-                    paragraph.font.color.rgb = colors["text"]
-                    paragraph.alignment = PP_ALIGN.LEFT
-        
-        # Set row heights
-        header_row_height = Inches(0.6)
-        data_row_height = Inches(1.1)
-        
-        # Set header row height
-        table.rows[0].height = header_row_height
-        
-        # Set data row heights
-        for i in range(1, num_rows):
-            table.rows[i].height = data_row_height
+            ])
+        
+        # Header row 0.6", data rows 1.1"
+        row_heights = [Inches(0.6)] + [Inches(1.1)] * len(chunk_data)
+        
+        add_table_block(slide, table_data, table_left, table_top, table_width, table_height,
+                        table_spec, col_widths=col_widths, row_heights=row_heights)
         
         # Get today's date
         today = datetime.now().strftime("%B %d, %Y")
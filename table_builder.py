@@ -0,0 +1,216 @@
+"""
+table_builder.py
+Bulk table builder for the slide renderers.
+Takes a 2-D block of cell values plus row/column style specs and emits the whole
+`a:tbl` element in one pass, instead of styling every cell, paragraph and run
+through python-pptx proxies. Each distinct CellStyle is compiled to its XML
+fragments once and shared by reference across every cell that uses it.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from xml.sax.saxutils import escape
+
+from pptx.enum.text import MSO_ANCHOR, PP_ALIGN
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls
+from pptx.util import Pt
+
+_ALIGN_ATTR = {
+    PP_ALIGN.LEFT: "l",
+    PP_ALIGN.CENTER: "ctr",
+    PP_ALIGN.RIGHT: "r",
+    PP_ALIGN.JUSTIFY: "just",
+}
+
+_ANCHOR_ATTR = {
+    MSO_ANCHOR.TOP: "t",
+    MSO_ANCHOR.MIDDLE: "ctr",
+    MSO_ANCHOR.BOTTOM: "b",
+}
+
+# Characters that are not legal in XML 1.0 text (tab is kept)
+_ILLEGAL_XML_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+@dataclass(frozen=True)
+class CellStyle:
+    """Formatting for one table cell. None means 'leave to the table style'."""
+    font_name: Optional[str] = "Arial"
+    size: Any = Pt(9)                     # Pt/Length or a plain number of points
+    bold: Optional[bool] = None
+    color: Any = None                     # RGBColor, (r, g, b) or "#RRGGBB"
+    fill: Any = None
+    align: Any = PP_ALIGN.LEFT
+    anchor: Any = None                    # MSO_ANCHOR
+    margins: Optional[Tuple[int, int, int, int]] = None  # left, right, top, bottom (EMU)
+    word_wrap: Optional[bool] = None
+
+
+@dataclass
+class TableSpec:
+    """
+    Row and column style specs for a table.
+    Row 0 uses `header` when given; other rows use `rows[i]`, then `band` for
+    even rows, then `body`. `columns` holds per-column field overrides that are
+    applied on top of the row style for non-header rows.
+    """
+    body: CellStyle = field(default_factory=CellStyle)
+    header: Optional[CellStyle] = None
+    band: Optional[CellStyle] = None
+    rows: Dict[int, CellStyle] = field(default_factory=dict)
+    columns: Dict[int, Dict[str, Any]] = field(default_factory=dict)
+
+    def row_style(self, row_idx: int) -> CellStyle:
+        if row_idx == 0 and self.header is not None:
+            return self.header
+        if row_idx in self.rows:
+            return self.rows[row_idx]
+        if self.band is not None and row_idx % 2 == 0:
+            return self.band
+        return self.body
+
+
+def _hex(color: Any) -> Optional[str]:
+    if color is None:
+        return None
+    if isinstance(color, str):
+        return color.lstrip("#").upper()[:6]
+    if isinstance(color, tuple) and len(color) == 3:
+        # RGBColor is a tuple subclass, so this covers both
+        return "%02X%02X%02X" % tuple(int(c) for c in color)
+    if hasattr(color, "r"):
+        return "%02X%02X%02X" % (color.r, color.g, color.b)
+    return None
+
+
+def _centipoints(size: Any) -> Optional[int]:
+    if size is None:
+        return None
+    if hasattr(size, "pt"):
+        return int(round(size.pt * 100))
+    return int(round(float(size) * 100))
+
+
+@lru_cache(maxsize=256)
+def _compile_style(style: CellStyle) -> Tuple[str, str, str, str]:
+    """
+    Compile a CellStyle into the XML fragments wrapped around each cell's text:
+    (cell_open, para_open, empty_para, cell_close).
+    """
+    wrap = ""
+    if style.word_wrap is True:
+        wrap = ' wrap="square"'
+    elif style.word_wrap is False:
+        wrap = ' wrap="none"'
+    cell_open = f"<a:tc><a:txBody><a:bodyPr{wrap}/><a:lstStyle/>"
+
+    algn = _ALIGN_ATTR.get(style.align)
+    ppr = f'<a:pPr algn="{algn}"/>' if algn else ""
+
+    rpr_attrs = ""
+    sz = _centipoints(style.size)
+    if sz is not None:
+        rpr_attrs += f' sz="{sz}"'
+    if style.bold is not None:
+        rpr_attrs += ' b="1"' if style.bold else ' b="0"'
+    rpr_children = ""
+    color = _hex(style.color)
+    if color:
+        rpr_children += f'<a:solidFill><a:srgbClr val="{color}"/></a:solidFill>'
+    if style.font_name:
+        rpr_children += f'<a:latin typeface="{escape(style.font_name, {chr(34): "&quot;"})}"/>'
+
+    para_open = f"<a:p>{ppr}<a:r><a:rPr{rpr_attrs}>{rpr_children}</a:rPr><a:t>"
+    empty_para = f"<a:p>{ppr}<a:endParaRPr{rpr_attrs}>{rpr_children}</a:endParaRPr></a:p>"
+
+    tcpr_attrs = ""
+    if style.margins is not None:
+        mar_l, mar_r, mar_t, mar_b = style.margins
+        tcpr_attrs += f' marL="{int(mar_l)}" marR="{int(mar_r)}" marT="{int(mar_t)}" marB="{int(mar_b)}"'
+    anchor = _ANCHOR_ATTR.get(style.anchor)
+    if anchor:
+        tcpr_attrs += f' anchor="{anchor}"'
+    fill = _hex(style.fill)
+    tcpr_children = f'<a:solidFill><a:srgbClr val="{fill}"/></a:solidFill>' if fill else ""
+    cell_close = f"</a:txBody><a:tcPr{tcpr_attrs}>{tcpr_children}</a:tcPr></a:tc>"
+
+    return cell_open, para_open, empty_para, cell_close
+
+
+def _even_split(total: int, count: int) -> List[int]:
+    """Split `total` EMU across `count` slots, last slot absorbing rounding (as python-pptx does)."""
+    each = total // count
+    return [each] * (count - 1) + [total - each * (count - 1)]
+
+
+def add_table_block(
+    slide,
+    data: Sequence[Sequence[Any]],
+    left,
+    top,
+    width,
+    height,
+    spec: Optional[TableSpec] = None,
+    col_widths: Optional[Sequence[int]] = None,
+    row_heights: Optional[Sequence[int]] = None,
+):
+    """
+    Add a table holding `data` (a list of rows) to `slide` and return its GraphicFrame.
+    Short rows are padded with empty cells. `col_widths`/`row_heights` default to an
+    even split of `width`/`height`.
+    """
+    spec = spec or TableSpec()
+    num_rows = len(data)
+    num_cols = max((len(r) for r in data), default=0)
+    if num_rows == 0 or num_cols == 0:
+        raise ValueError("Table data must have at least one row and one column")
+
+    col_widths = list(col_widths) if col_widths else _even_split(int(width), num_cols)
+    col_widths += [col_widths[-1]] * (num_cols - len(col_widths))
+    row_heights = list(row_heights) if row_heights else _even_split(int(height), num_rows)
+    row_heights += [row_heights[-1]] * (num_rows - len(row_heights))
+
+    parts: List[str] = [f"<a:tbl {nsdecls('a')}><a:tblGrid>"]
+    parts.extend(f'<a:gridCol w="{int(w)}"/>' for w in col_widths[:num_cols])
+    parts.append("</a:tblGrid>")
+
+    resolved: Dict[Tuple[int, int], CellStyle] = {}
+    for row_idx, row in enumerate(data):
+        base = spec.row_style(row_idx)
+        parts.append(f'<a:tr h="{int(row_heights[row_idx])}">')
+        for col_idx in range(num_cols):
+            style = base
+            if row_idx > 0 or spec.header is None:
+                overrides = spec.columns.get(col_idx)
+                if overrides:
+                    key = (id(base), col_idx)
+                    style = resolved.get(key)
+                    if style is None:
+                        style = resolved[key] = replace(base, **overrides)
+            cell_open, para_open, empty_para, cell_close = _compile_style(style)
+
+            value = row[col_idx] if col_idx < len(row) else ""
+            text = _ILLEGAL_XML_CHARS.sub("", "" if value is None else str(value))
+            parts.append(cell_open)
+            for line in text.split("\n"):
+                if line:
+                    parts.append(para_open)
+                    parts.append(escape(line))
+                    parts.append("</a:t></a:r></a:p>")
+                else:
+                    parts.append(empty_para)
+            parts.append(cell_close)
+        parts.append("</a:tr>")
+    parts.append("</a:tbl>")
+
+    frame = slide.shapes.add_table(1, 1, left, top, width, height)
+    old_tbl = frame._element.graphic.graphicData.tbl
+    new_tbl = parse_xml("".join(parts))
+    # Keep python-pptx's tblPr (firstRow/bandRow and default table style id)
+    new_tbl.insert(0, old_tbl.tblPr)
+    old_tbl.getparent().replace(old_tbl, new_tbl)
+    return frame
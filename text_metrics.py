@@ -0,0 +1,338 @@
+"""
+text_metrics.py
+Font-metric text measurement for overflow prediction.
+Each font (name, bold) gets a glyph advance table built once with Pillow's
+ImageFont; string widths are then sums of cached advances, so wrapping a whole
+deck's worth of text needs no rasterization. The same measurements drive:
+  - fit_font_size(): the renderers shrink text that would not fit its box
+  - text_overflow_warnings(): validation flags slots whose text overflows even
+    at the smallest allowed size, before anything is rendered
+
+Fonts are looked up by name in SLIDE_FONT_DIRS (os.pathsep separated) and the
+usual system font folders, with metric-compatible substitutes (Liberation,
+Carlito) when the Microsoft fonts are not installed. If nothing matches,
+Pillow's built-in scalable font is used, which is close enough to flag overflow.
+"""
+from __future__ import annotations
+
+import math
+import os
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from PIL import ImageFont
+
+from layout_engine import layout_for
+
+EMU_PER_INCH = 914400
+EMU_PER_PT = 12700
+
+# Text box insets used by every add_clean_text helper (inches)
+MARGIN_X = 0.1
+MARGIN_Y = 0.05
+LINE_SPACING = 1.2
+
+MIN_FONT_PT = 7.0
+MIN_SHRINK = 0.75           # never shrink below 75% of the requested size
+_SIZE_STEP = 0.5
+
+_REF_SIZE = 100             # advances are measured at this size and scaled linearly
+_PRELOADED = [chr(c) for c in range(32, 256)] + list("\u2013\u2014\u2018\u2019\u201c\u201d\u2022\u2026\u25cf\u20ac")
+
+_FONT_DIRS = [
+    "/usr/share/fonts", "/usr/local/share/fonts", os.path.expanduser("~/.fonts"),
+    os.path.expanduser("~/.local/share/fonts"), "/Library/Fonts", "/System/Library/Fonts",
+    os.path.expanduser("~/Library/Fonts"), os.path.join(os.environ.get("WINDIR", "C:\\Windows"), "Fonts"),
+]
+
+# Metric-compatible stand-ins, tried after the font itself
+_SUBSTITUTES = {
+    "arial": ["liberationsans", "arimo"],
+    "helvetica": ["liberationsans", "arimo"],
+    "calibri": ["carlito"],
+    "cambria": ["caladea"],
+    "timesnewroman": ["liberationserif", "tinos"],
+    "couriernew": ["liberationmono", "cousine"],
+}
+_FALLBACKS = ["liberationsans", "dejavusans"]
+_BOLD_SUFFIXES = ("bold", "bd", "b")
+_REGULAR_SUFFIXES = ("", "regular", "r")
+
+
+def _normalize(name: str) -> str:
+    return re.sub(r"[^a-z0-9]", "", name.lower())
+
+
+@lru_cache(maxsize=1)
+def _font_files() -> Dict[str, str]:
+    """Normalized file stem -> path for every TrueType/OpenType font we can see."""
+    dirs = [d for d in os.environ.get("SLIDE_FONT_DIRS", "").split(os.pathsep) if d] + _FONT_DIRS
+    files: Dict[str, str] = {}
+    for root_dir in dirs:
+        if not os.path.isdir(root_dir):
+            continue
+        for root, _, names in os.walk(root_dir):
+            for name in names:
+                stem, ext = os.path.splitext(name)
+                if ext.lower() in (".ttf", ".otf", ".ttc"):
+                    files.setdefault(_normalize(stem), os.path.join(root, name))
+    return files
+
+
+def _font_path(font_name: str, bold: bool) -> Optional[str]:
+    files = _font_files()
+    base = _normalize(font_name or "")
+    suffixes = _BOLD_SUFFIXES if bold else _REGULAR_SUFFIXES
+    for family in [base] + _SUBSTITUTES.get(base, []) + _FALLBACKS:
+        for suffix in suffixes:
+            path = files.get(family + suffix)
+            if path:
+                return path
+    return None
+
+
+@lru_cache(maxsize=64)
+def load_font(font_name: str, bold: bool = False, size: int = _REF_SIZE):
+    """Pillow font for drawing text at `size` pixels, resolved like the advance tables."""
+    path = _font_path(font_name, bold)
+    try:
+        return ImageFont.truetype(path, size) if path else ImageFont.load_default(size)
+    except (OSError, TypeError):
+        return ImageFont.load_default()
+
+
+class _AdvanceTable:
+    """Advance widths of one font at _REF_SIZE, filled lazily for characters outside Latin-1."""
+
+    def __init__(self, font_name: str, bold: bool):
+        path = _font_path(font_name, bold)
+        self.font = load_font(font_name, bold, _REF_SIZE)
+        self.source = path or "pillow-default"
+        self.advances: Dict[str, float] = {ch: self.font.getlength(ch) for ch in _PRELOADED}
+
+    def width(self, text: str) -> float:
+        """Width of `text` in units of _REF_SIZE (divide by _REF_SIZE for ems)."""
+        advances = self.advances
+        total = 0.0
+        for ch in text:
+            adv = advances.get(ch)
+            if adv is None:
+                adv = advances[ch] = self.font.getlength(ch)
+            total += adv
+        return total
+
+
+@lru_cache(maxsize=16)
+def advance_table(font_name: str, bold: bool = False) -> _AdvanceTable:
+    table = _AdvanceTable(font_name, bold)
+    print(f"[DEBUG] Text metrics for '{font_name}'{' bold' if bold else ''}: {table.source}")
+    return table
+
+
+def text_width(text: str, font_name: str, size_pt: float, bold: bool = False) -> float:
+    """Width of a single line of text in points."""
+    return advance_table(font_name, bold).width(text) * size_pt / _REF_SIZE
+
+
+@lru_cache(maxsize=4096)
+def wrap_lines(text: str, font_name: str, size_pt: float, width_pt: float, bold: bool = False) -> Tuple[str, ...]:
+    """Greedy word wrap as PowerPoint does it; explicit newlines start new paragraphs."""
+    table = advance_table(font_name, bold)
+    limit = width_pt * _REF_SIZE / size_pt
+    space = table.width(" ")
+    lines: List[str] = []
+    for paragraph in str(text).split("\n"):
+        line, line_width = "", 0.0
+        for word in paragraph.split():
+            word_width = table.width(word)
+            if line and line_width + space + word_width <= limit:
+                line, line_width = f"{line} {word}", line_width + space + word_width
+                continue
+            if line:
+                lines.append(line)
+            # A word wider than the box is broken between characters
+            while word_width > limit and len(word) > 1:
+                cut = 1
+                while cut < len(word) and table.width(word[:cut + 1]) <= limit:
+                    cut += 1
+                lines.append(word[:cut])
+                word = word[cut:]
+                word_width = table.width(word)
+            line, line_width = word, word_width
+        lines.append(line)
+    return tuple(lines)
+
+
+@dataclass(frozen=True)
+class TextFit:
+    lines: int              # wrapped line count at `size`
+    max_lines: int          # lines the box was drawn to hold
+    size: float             # font size in points
+
+    @property
+    def fits(self) -> bool:
+        return self.lines <= self.max_lines
+
+
+def _to_pt(length: Any) -> float:
+    """python-pptx Length (EMU int) -> points."""
+    return int(length) / EMU_PER_PT
+
+
+def _box_pt(width: Any, height: Any) -> Tuple[float, float]:
+    return (max(_to_pt(width) - 2 * MARGIN_X * 72, 1.0),
+            max(_to_pt(height) - 2 * MARGIN_Y * 72, 0.0))
+
+
+def measure_text(text: Any, font_name: str, size_pt: float, width: Any, height: Any, bold: bool = False) -> TextFit:
+    """Wrap `text` into a text box of `width` x `height` (EMU) and compare with its line capacity."""
+    width_pt, height_pt = _box_pt(width, height)
+    lines = len(wrap_lines(str(text), font_name, float(size_pt), width_pt, bold))
+    # Boxes sized for a single line are often shorter than one line height; they still hold one line
+    max_lines = max(1, math.floor(height_pt / (size_pt * LINE_SPACING) + 0.25))
+    return TextFit(lines, max_lines, float(size_pt))
+
+
+@lru_cache(maxsize=4096)
+def _fit(text: str, font_name: str, size_pt: float, width: int, height: int, bold: bool) -> TextFit:
+    floor = max(MIN_FONT_PT, size_pt * MIN_SHRINK)
+    size = size_pt
+    fit = measure_text(text, font_name, size, width, height, bold)
+    while not fit.fits and size - _SIZE_STEP >= floor:
+        size -= _SIZE_STEP
+        fit = measure_text(text, font_name, size, width, height, bold)
+    return fit
+
+
+def fit_font_size(text: Any, font_name: str, size_pt: float, width: Any, height: Any, bold: bool = False) -> float:
+    """Largest size <= size_pt (down to the shrink floor) at which `text` fits the box."""
+    if not text or size_pt <= MIN_FONT_PT:
+        return size_pt
+    return _fit(str(text), font_name or "Arial", float(size_pt), int(width), int(height), bool(bold)).size
+
+
+@dataclass(frozen=True)
+class TextSlot:
+    """
+    A text box a renderer draws for a data field (geometry in inches, size in points).
+    Templates laid out from layout_specs name the frame instead ("banker_view.text",
+    or a repeated frame's name for one of its items), so the box follows the catalog.
+    """
+    path: str                   # dotted path, "[]" iterates a list: "services[].desc"
+    width: float = 0.0
+    height: float = 0.0
+    size: float = 10.0
+    bold: bool = False
+    fmt: str = "{text}"         # how the renderer composes dict items, e.g. "{title}: {description}"
+    frame: Optional[str] = None
+
+
+TEXT_SLOTS: Dict[str, List[TextSlot]] = {
+    "business_overview": [
+        TextSlot("description", 12, 1.2, 14),
+        TextSlot("highlights[]", 3.8, 0.35, 10),
+        TextSlot("services[]", 2.8, 0.25, 10),
+        TextSlot("positioning_desc", 11.5, 0.6, 11),
+    ],
+    "product_service_footprint": [
+        TextSlot("services[].title", 5.5, 0.25, 12, bold=True),
+        TextSlot("services[].desc", 5.5, 0.55, 10),
+    ],
+    "competitive_positioning": [
+        TextSlot("barriers[]", 5.5, 0.3, 9, fmt="{title} {desc}"),
+        TextSlot("advantages[]", 5, 0.3, 9, fmt="{title} {desc}"),
+    ],
+    "investor_process_overview": [
+        TextSlot("diligence_topics[]", 5.6, 0.28, 9, fmt="{title}: {description}"),
+        TextSlot("risk_factors[]", 2.6, 0.22, 8),
+        TextSlot("mitigants[]", 2.8, 0.22, 8),
+        TextSlot("synergy_opportunities[]", 5.5, 0.28, 9),
+    ],
+    "margin_cost_resilience": [
+        TextSlot("cost_management.items[].title", 5.5, 0.15, 10, bold=True),
+        TextSlot("cost_management.items[].description", 5.5, 0.28, 9),
+        TextSlot("risk_mitigation.banker_view.text", 4.6, 0.5, 9),
+    ],
+    "historical_financial_performance": [
+        TextSlot("revenue_growth.points[]", size=9, fmt="\u25cf {text}", frame="revenue_points"),
+        TextSlot("banker_view.text", size=9, frame="banker_view.text"),
+    ],
+    "investor_considerations": [
+        TextSlot("considerations[]", size=11, frame="rows.consideration_text"),
+        TextSlot("mitigants[]", size=11, frame="rows.mitigant_text"),
+    ],
+    "growth_strategy_projections": [
+        TextSlot("growth_strategy.strategies[]", 5.5, 0.3, 9),
+        TextSlot("key_assumptions.assumptions[]", 5.8, 0.25, 9),
+    ],
+}
+
+
+# The 16:9 deck ensure_prs sets up, for laying out slots without a presentation
+_DECK = SimpleNamespace(slide_width=int(13.333 * EMU_PER_INCH), slide_height=int(7.5 * EMU_PER_INCH))
+
+
+def _slot_box(template: str, slot: TextSlot) -> Tuple[int, int]:
+    """(width, height) of the slot's box in EMU."""
+    if slot.frame is None:
+        return int(slot.width * EMU_PER_INCH), int(slot.height * EMU_PER_INCH)
+    name, *parts = slot.frame.split(".")
+    layout = layout_for(template, _DECK, **{name: 1})
+    frame = layout.items(name)[0] if name in layout.groups else layout.frame(name)
+    for part in parts:
+        frame = frame.part(part)
+    return int(frame.width), int(frame.height)
+
+
+class _Fields(dict):
+    def __missing__(self, key):
+        return ""
+
+
+def _slot_values(node: Any, parts: List[str], label: str) -> Iterator[Tuple[str, Any]]:
+    if not parts:
+        yield label, node
+        return
+    part, rest = parts[0], parts[1:]
+    if part.endswith("[]"):
+        items = node.get(part[:-2]) if isinstance(node, dict) else None
+        if isinstance(items, list):
+            for i, item in enumerate(items):
+                yield from _slot_values(item, rest, f"{label}.{part[:-2]}[{i}]")
+    elif isinstance(node, dict) and part in node:
+        yield from _slot_values(node[part], rest, f"{label}.{part}")
+
+
+def _compose(slot: TextSlot, value: Any) -> Optional[str]:
+    if isinstance(value, dict):
+        return slot.fmt.format_map(_Fields(value)) if slot.fmt != "{text}" else None
+    if isinstance(value, (str, int, float)):
+        return slot.fmt.format_map(_Fields(text=value))
+    return None
+
+
+def text_overflow_warnings(template: str, data: Any, font_name: str = "Arial") -> List[str]:
+    """One message per slot whose text still overflows its box at the smallest allowed size."""
+    slots = TEXT_SLOTS.get(template)
+    if not slots or not isinstance(data, dict):
+        return []
+    if isinstance(data.get("slide_data"), dict):
+        data = data["slide_data"]
+    warnings = []
+    for slot in slots:
+        width, height = _slot_box(template, slot)
+        for label, value in _slot_values(data, slot.path.split("."), "data"):
+            text = _compose(slot, value)
+            if not text or not text.strip():
+                continue
+            size = fit_font_size(text, font_name, slot.size, width, height, slot.bold)
+            fit = measure_text(text, font_name, size, width, height, slot.bold)
+            if not fit.fits:
+                warnings.append(
+                    f"{label}: text overflows its box ({fit.lines} lines for {fit.max_lines} "
+                    f"even at {size:g}pt, {len(text)} chars) - shorten it"
+                )
+    return warnings
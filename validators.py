@@ -82,36 +82,41 @@ def validate_render_plan_against_catalog(
     all_issues: List[PlanIssue] = []
     by_template: Dict[str, List[Dict[str, str]]] = {}
 
-    plan_items = render_plan.get("render_plan", [])
+    # Two plan shapes: {"render_plan": [{"template_id", "slots"}]} and the renderer's {"slides": [{"template", "data"}]}
+    if "render_plan" in render_plan or "slides" not in render_plan:
+        plan_items = render_plan.get("render_plan", [])
+        id_key, slots_key, shape = "template_id", "slots", "render_plan"
+    else:
+        plan_items = render_plan.get("slides", [])
+        id_key, slots_key, shape = "template", "data", "slides"
     if not isinstance(plan_items, list):
-        _add_issue(all_issues, "error", "render_plan", "render_plan must be a list")
+        _add_issue(all_issues, "error", shape, f"{shape} must be a list")
         return ValidationReport(False, all_issues, {}, _summarize(all_issues))
 
     for item in plan_items:
-        tpl_id = item.get("template_id")
-        slots = item.get("slots", {})
+        tpl_id = item.get(id_key)
+        slots = item.get(slots_key, {})
+        if not isinstance(slots, dict):
+            # A list payload (e.g. sea_conglomerates) fills the template's single "data" slot
+            slots = {"data": slots}
         tpl_obj = catalog.get(tpl_id) if tpl_id else None
         local_issues: List[PlanIssue] = []
 
         if not tpl_id:
-            _add_issue(local_issues, "error", "template_id", "Missing template_id")
+            _add_issue(all_issues, "error", id_key, f"Missing {id_key}")
             continue
         if tpl_obj is None:
-            _add_issue(local_issues, "error", "template_id", f"Unknown template '{tpl_id}'")
-            by_template[tpl_id] = [vars(i) for i in local_issues]
+            _add_issue(local_issues, "error", id_key, f"Unknown template '{tpl_id}'")
+            by_template.setdefault(tpl_id, []).extend(vars(i) for i in local_issues)
             all_issues.extend(local_issues)
             continue
 
         # Required slots check (with chart_ref awareness)
-        required = (tpl_obj.required_slots or {}).keys()
-        for slot in required:
-            if slot in slots:
-                continue
-            # Allow chart_ref to satisfy "chart" or "chart_data" if resolvable
-            if slot in {"chart", "chart_data"} and "chart_ref" in slots:
-                ch = _chart_by_id(content_ir, slots["chart_ref"])
-                if ch is not None:
-                    continue
+        missing = tpl_obj.missing(slots.keys())
+        # Allow chart_ref to satisfy the chart slots if resolvable
+        if missing & tpl_obj.chart_slots and "chart_ref" in slots and _chart_by_id(content_ir, slots["chart_ref"]):
+            missing -= tpl_obj.chart_slots
+        for slot in sorted(missing):
             _add_issue(local_issues, "missing", slot, f"Missing required slot '{slot}'")
 
         # If chart_ref provided, validate its type and point count when possible
@@ -135,8 +140,8 @@ def validate_render_plan_against_catalog(
                     if not ok:
                         _add_issue(local_issues, "warning", "chart", f"chart should have {mn}–{mx} data points")
 
-        # Record and accumulate
-        by_template[tpl_id] = [vars(i) for i in local_issues]
+        # Record and accumulate (a template can appear on several slides)
+        by_template.setdefault(tpl_id, []).extend(vars(i) for i in local_issues)
         all_issues.extend(local_issues)
 
     ok = all(i.severity not in {"error", "missing"} for i in all_issues)